@@ -5,3 +5,9 @@ class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dashboards"
     verbose_name = "Django Dashboards"
+
+    def ready(self):
+        from dashboards.config import get_config
+
+        # resolve settings & import the default permission classes up front
+        get_config().permission_classes
@@ -0,0 +1,40 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from django.core.cache import BaseCache, caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from dashboards import config
+
+
+CACHE_KEY_PREFIX = "dashboards"
+
+# returned by cache.get on a miss, so cached None values are still a hit
+MISSING = object()
+
+
+def get_cache() -> BaseCache:
+    """
+    Returns the django cache used to store dashboard values.
+    """
+    return caches[config.get_config().DASHBOARDS_CACHE]
+
+
+def hash_filters(filters: Optional[Dict[str, Any]]) -> str:
+    """
+    Returns a stable hash for a dict of filters, so any GET/POST params
+    produce the same cache key regardless of their order.
+    """
+    encoded = json.dumps(filters or {}, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.md5(encoded.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Joins the provided parts into a single cache key, ignoring any parts which
+    are None.
+    """
+    return ":".join(
+        [CACHE_KEY_PREFIX, *[str(part) for part in parts if part is not None]]
+    )
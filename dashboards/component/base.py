@@ -1,20 +1,36 @@
+import asyncio
+import copy
 from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.template import Context
 from django.template.loader import render_to_string
-from django.urls import reverse, reverse_lazy
 from django.utils.functional import lazy
-from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
-from django.utils.text import slugify
 
 import asset_definitions
+from asgiref.sync import async_to_sync, sync_to_async
 
 from dashboards import config
+from dashboards.cache import MISSING, get_cache, hash_filters, make_cache_key
+from dashboards.instrumentation import instrument
+from dashboards.utils import cached_import_string, cached_reverse, cached_slugify
 
 from ..types import ValueData
 
@@ -33,15 +49,15 @@ class CTA:
         Get CTA, first trying a dashboard by module path if not here as a str or callable.
         """
         if self.dashboard:
-            dashboard_class = import_string(self.dashboard)
+            dashboard_class = cached_import_string(self.dashboard)
             if obj:
                 lookup = getattr(obj, dashboard_class._meta.lookup_field)
-                return reverse_lazy(
+                return cached_reverse(
                     f"dashboards:{dashboard_class.get_slug()}_detail",
                     args=(lookup,),
                 )
             else:
-                return reverse_lazy(f"dashboards:{dashboard_class.get_slug()}")
+                return cached_reverse(f"dashboards:{dashboard_class.get_slug()}")
         elif callable(self.href):
             return self.href(obj)
 
@@ -61,7 +77,7 @@ class Component:
     # attrs below can be set, but are inferred when fetching components from the dashboard class.
     key: Optional[str] = None
     verbose_name: Optional[str] = None
-    dashboard: Optional["Dashboard"] = None
+    dashboard: Optional[Type["Dashboard"]] = None
     object: Optional[Any] = None
     render_type: Optional[str] = None
     serializable: bool = True
@@ -69,16 +85,26 @@ class Component:
     # replicated on LayoutBase TODO need to handle this better
     icon: Optional[str] = None  # html string .e.g <i class="fa-up"></i>
     css_classes: Optional[Union[str, Dict[str, str]]] = None
-    grid_css_classes: Optional[str] = config.Config().DASHBOARDS_DEFAULT_GRID_CSS
+    grid_css_classes: Optional[str] = config.get_config().DASHBOARDS_DEFAULT_GRID_CSS
     poll_rate: Optional[int] = None  # In seconds, TODO make default a setting
     trigger_on: Optional[str] = None
+    live: bool = False  # updated by published events rather than polling
+    cache_timeout: Optional[int] = None  # In seconds, defaults to the dashboard Meta
+    cache_key: Optional[Callable[..., str]] = None
+    cache_rendered: bool = False
+    cache_shared: bool = False  # share cached values & html between users
+    etag: Optional[Callable[..., str]] = None
+    last_modified: Optional[Callable[..., datetime]] = None
 
     # attrs below should not be changed
     dependent_components: Optional[list["Component"]] = None
 
     def __post_init__(self):
-        default_css_classes = config.Config().DASHBOARDS_COMPONENT_CLASSES.get(
-            self.__class__.__name__, None
+        # copied as the shared defaults are updated with any css passed in
+        default_css_classes = copy.copy(
+            config.get_config().DASHBOARDS_COMPONENT_CLASSES.get(
+                self.__class__.__name__, None
+            )
         )
 
         # if nothing passed in set to default
@@ -99,6 +125,21 @@ class Component:
     def is_deferred(self) -> bool:
         return True if self.defer or self.defer_url else False
 
+    @property
+    def is_batched(self) -> bool:
+        """
+        Deferred components are fetched together in one request when the dashboard
+        has batch_deferred set, unless they poll, have a custom trigger or url.
+        """
+        return bool(
+            self.defer
+            and self.dashboard
+            and getattr(self.dashboard._meta, "batch_deferred", False)
+            and not self.defer_url
+            and not self.poll_rate
+            and not self.trigger_on
+        )
+
     @property
     def dashboard_class(self):
         if self.dashboard:
@@ -106,7 +147,7 @@ class Component:
         return None
 
     def htmx_poll_rate(self):
-        if self.poll_rate:
+        if self.poll_rate and not self.live:
             return f"every {self.poll_rate}s"
 
     def htmx_trigger_on(self):
@@ -115,58 +156,251 @@ class Component:
 
         return ""
 
+    def get_etag(
+        self, request: HttpRequest = None, filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Validator for the component value, allowing an unchanged component to be
+        responded to without fetching its value.
+        """
+        if self.etag:
+            return self.etag(request=request, object=self.object, filters=filters)
+
+        return None
+
+    def get_last_modified(
+        self, request: HttpRequest = None, filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[datetime]:
+        if self.last_modified:
+            return self.last_modified(
+                request=request, object=self.object, filters=filters
+            )
+
+        return None
+
+    def get_cache_timeout(self) -> Optional[int]:
+        """
+        Seconds to cache the component value for, falling back to the
+        dashboard Meta when not set on the component.
+        """
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+
+        if self.dashboard:
+            return getattr(self.dashboard._meta, "cache_timeout", None)
+
+        return None
+
+    def get_cache_key(
+        self,
+        request: HttpRequest = None,
+        call_deferred=False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build the key the component value is cached under, covering the dashboard,
+        component key, object lookup & filters.
+        """
+        return self.make_cache_key(
+            "defer" if self.is_deferred and call_deferred else "value",
+            request=request,
+            filters=filters,
+        )
+
+    def get_render_cache_key(
+        self, request: HttpRequest = None, *variant, lookup: Optional[Any] = None
+    ) -> str:
+        """
+        Build the key the rendered html is cached under, which also varies on
+        the appearance mode as charts render differently in dark mode.
+        """
+        appearance_mode = request.COOKIES.get("appearanceMode") if request else None
+
+        return self.make_cache_key(
+            "html",
+            *variant,
+            appearance_mode,
+            request=request,
+            filters=self.get_filters(request),
+            lookup=lookup,
+        )
+
+    def make_cache_key(
+        self,
+        *variant,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+        lookup: Optional[Any] = None,
+    ) -> str:
+        """
+        Cache keys are made up of the dashboard, component key, object lookup,
+        variant, filters & user, unless ``cache_shared``. ``cache_key`` can be
+        used to vary the key further.
+        """
+        if lookup is None and self.object is not None:
+            lookup_field = self.dashboard._meta.lookup_field if self.dashboard else "pk"
+            lookup = getattr(self.object, lookup_field, None)
+
+        parts = [
+            self.dashboard.get_slug() if self.dashboard else None,
+            self.key,
+            lookup,
+            *variant,
+            hash_filters(filters),
+        ]
+
+        if not self.cache_shared:
+            # values may depend on the user or their permissions
+            parts.append(getattr(getattr(request, "user", None), "pk", None))
+
+        if self.cache_key:
+            parts.append(
+                self.cache_key(request=request, lookup=lookup, filters=filters)
+            )
+
+        return make_cache_key(*parts)
+
     def get_value(
         self,
         request: HttpRequest = None,
         call_deferred=False,
         filters: Optional[Dict[str, Any]] = None,
     ) -> ValueData:
+        with instrument(self.key, "value") as timing:
+            cache_timeout = self.get_cache_timeout()
+            if not cache_timeout:
+                return self._get_value(
+                    request=request, call_deferred=call_deferred, filters=filters
+                )
+
+            cache = get_cache()
+            cache_key = self.get_cache_key(
+                request=request, call_deferred=call_deferred, filters=filters
+            )
+            value = cache.get(cache_key, MISSING)
+            if timing:
+                timing.cache = "miss" if value is MISSING else "hit"
+
+            if value is MISSING:
+                value = self._get_value(
+                    request=request, call_deferred=call_deferred, filters=filters
+                )
+                cache.set(cache_key, value, cache_timeout)
+
+            return value
+
+    async def aget_value(
+        self,
+        request: HttpRequest = None,
+        call_deferred=False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> ValueData:
+        """
+        Async version of get_value, awaiting async value/defer callables or
+        serializers with an aserialize method. Anything else is called via
+        get_value in a thread.
+        """
+        value_or_defer: Any = self.value
         if self.is_deferred and self.defer and call_deferred:
-            serializable = getattr(self.defer, "serialize", None)
-            if serializable:
-                self.defer = serializable
+            value_or_defer = self.defer
 
-            if callable(self.defer):
-                value = self.defer(request=request, object=self.object, filters=filters)
-            else:
-                value = self.defer
+        if not asyncio.iscoroutinefunction(
+            getattr(value_or_defer, "aserialize", value_or_defer)
+        ):
+            return await sync_to_async(self.get_value)(
+                request=request, call_deferred=call_deferred, filters=filters
+            )
+
+        with instrument(self.key, "value") as timing:
+            cache_timeout = self.get_cache_timeout()
+            if not cache_timeout:
+                return await self._aget_value(
+                    value_or_defer, request=request, filters=filters
+                )
+
+            cache = get_cache()
+            cache_key = self.get_cache_key(
+                request=request, call_deferred=call_deferred, filters=filters
+            )
+            value = await sync_to_async(cache.get)(cache_key, MISSING)
+            if timing:
+                timing.cache = "miss" if value is MISSING else "hit"
+
+            if value is MISSING:
+                value = await self._aget_value(
+                    value_or_defer, request=request, filters=filters
+                )
+                await sync_to_async(cache.set)(cache_key, value, cache_timeout)
+
+            return value
+
+    async def _aget_value(
+        self,
+        value_or_defer: Callable[..., Awaitable[ValueData]],
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> ValueData:
+        value_or_defer = getattr(value_or_defer, "aserialize", value_or_defer)
+        value = await value_or_defer(
+            request=request, object=self.object, filters=filters
+        )
+
+        return value_asdict(value)
 
+    def _get_value(
+        self,
+        request: HttpRequest = None,
+        call_deferred=False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> ValueData:
+        value_or_defer: Any = self.value
+        if self.is_deferred and self.defer and call_deferred:
+            value_or_defer = self.defer
+
+        # call serializers via serialize, without replacing value/defer on the
+        # component as it may be shared.
+        serialize = getattr(value_or_defer, "serialize", None)
+        if serialize:
+            with instrument(self.key, "serialize"):
+                value = self._call_value(serialize, request=request, filters=filters)
         else:
-            serializable = getattr(self.value, "serialize", None)
-            if serializable:
-                self.value = serializable
+            value = self._call_value(value_or_defer, request=request, filters=filters)
 
-            if callable(self.value):
-                value = self.value(request=request, object=self.object, filters=filters)
-            else:
-                value = self.value
+        return value_asdict(value)
 
-        if is_dataclass(value):
-            value = asdict(value, dict_factory=value_render_encoder)
+    def _call_value(
+        self,
+        value_or_defer: Any,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> ValueData:
+        if asyncio.iscoroutinefunction(value_or_defer):
+            return async_to_sync(value_or_defer)(
+                request=request, object=self.object, filters=filters
+            )
+        elif callable(value_or_defer):
+            return value_or_defer(request=request, object=self.object, filters=filters)
 
-        return value
+        return value_or_defer
 
     @property
     def media(self):
         return self.get_media()
 
-    def _get_media_from_definition(self) -> Optional[asset_definitions.Media]:
-        definition = getattr(self.__class__, "Media", None)
-        if definition:
-            return asset_definitions.Media(media=definition)
-
-        return None
-
-    def get_media(self) -> asset_definitions.Media:
-        # component level media
-        media = self._get_media_from_definition() or asset_definitions.Media()
+    def get_media_key(self) -> Tuple[type, Any]:
+        """
+        Media is static per component class and serializer, so is cached on this.
+        """
         # serializers may have media, if so use that instead of component media
         if callable(self.value) and hasattr(self.value, "get_media"):
-            media = self.value().get_media()
+            return self.__class__, self.value
         elif callable(self.defer) and hasattr(self.defer, "get_media"):
-            media = self.defer().get_media()
+            return self.__class__, self.defer
 
-        return media
+        return self.__class__, None
+
+    def get_media(self) -> asset_definitions.Media:
+        return get_component_media(*self.get_media_key())
 
     def get_filters(self, request: HttpRequest) -> Dict[str, Any]:
         if request:
@@ -185,6 +419,8 @@ class Component:
 
         request = context.get("request")
         filters = self.get_filters(request)
+        # values already resolved for this request, i.e. by the async views
+        component_values = context.get("component_values") or {}
 
         if self.is_deferred and self.defer and call_deferred:
             render = getattr(self.defer, "render", None)
@@ -192,22 +428,31 @@ class Component:
             render = getattr(self.value, "render", None)
 
         if callable(render):
+            defer_url = self.get_absolute_url()
+            render_kwargs = {}
+            if self.key in component_values:
+                render_kwargs["value"] = component_values[self.key]
+
             lazy_render = lazy(render)
             rendered_value = lazy_render(
-                template_id=self.template_id,
+                template_id=cached_slugify(defer_url),
                 request=request,
                 filters=filters,
                 object=self.object,
                 icon=self.icon,
                 css_classes=self.css_classes,
                 is_deferred=self.is_deferred,
-                defer_url=self.get_absolute_url(),
+                defer_url=defer_url,
+                **render_kwargs,
             )
             return rendered_value
 
-        value = self.get_value(
-            request=request, call_deferred=call_deferred, filters=filters
-        )
+        if self.key in component_values:
+            value = component_values[self.key]
+        else:
+            value = self.get_value(
+                request=request, call_deferred=call_deferred, filters=filters
+            )
 
         template_context = {
             "request": request,
@@ -219,25 +464,50 @@ class Component:
     def render(
         self, context: Context, htmx: Optional[bool] = None, call_deferred: bool = False
     ) -> str:
-        template_context = {
-            "template_id": self.template_id,
-            "object": self.object,
-            "media": self.media,
-            "cta": self.cta,
-            "is_deferred": self.is_deferred,
-            "htmx": self.is_deferred if htmx is None else htmx,
-            "defer_url": self.get_absolute_url(),
-            "trigger_on": self.htmx_trigger_on(),
-            "poll_rate": self.htmx_poll_rate(),
-            "defer_loading_template_name": self.defer_loading_template_name,
-            "rendered_value": self.render_value(
-                context=context, call_deferred=call_deferred
-            ),
-        }
-
-        return mark_safe(
-            render_to_string("dashboards/components/component.html", template_context)
+        cache_timeout = self.get_cache_timeout()
+        if not self.cache_rendered or not cache_timeout:
+            return self._render(context=context, htmx=htmx, call_deferred=call_deferred)
+
+        cache = get_cache()
+        cache_key = self.get_render_cache_key(
+            context.get("request"),
+            "component",
+            htmx,
+            call_deferred,
         )
+        html = cache.get(cache_key)
+        if html is None:
+            html = self._render(context=context, htmx=htmx, call_deferred=call_deferred)
+            cache.set(cache_key, html, cache_timeout)
+
+        return html
+
+    def _render(
+        self, context: Context, htmx: Optional[bool] = None, call_deferred: bool = False
+    ) -> str:
+        with instrument(self.key, "render"):
+            defer_url = self.get_absolute_url()
+            template_context = {
+                "template_id": cached_slugify(defer_url),
+                "object": self.object,
+                "cta": self.cta,
+                "is_deferred": self.is_deferred,
+                "is_batched": self.is_batched,
+                "htmx": self.is_deferred if htmx is None else htmx,
+                "defer_url": defer_url,
+                "trigger_on": self.htmx_trigger_on(),
+                "poll_rate": self.htmx_poll_rate(),
+                "defer_loading_template_name": self.defer_loading_template_name,
+                "rendered_value": self.render_value(
+                    context=context, call_deferred=call_deferred
+                ),
+            }
+
+            return mark_safe(
+                render_to_string(
+                    "dashboards/components/component.html", template_context
+                )
+            )
 
     def get_absolute_url(self):
         """
@@ -261,13 +531,13 @@ class Component:
         if self.defer_url:
             url = self.defer_url(reverse_args=args)
         else:
-            url = reverse("dashboards:dashboard_component", args=args)
+            url = cached_reverse("dashboards:dashboard_component", args=args)
 
         return url
 
     @property
     def template_id(self):
-        return slugify(self.get_absolute_url())
+        return cached_slugify(self.get_absolute_url())
 
     def __str__(self):
         return self.render(context=Context({}))
@@ -276,6 +546,38 @@ class Component:
         return f"{self.key}={self.value}"
 
 
+@lru_cache(maxsize=None)
+def get_component_media(
+    component_class: type, serializer: Optional[Any] = None
+) -> asset_definitions.Media:
+    """
+    Media for a component class, or its serializer if it has media, cached so
+    serializers are not instantiated to get their media on every render.
+    """
+    if serializer is not None:
+        return serializer().get_media()
+
+    definition = getattr(component_class, "Media", None)
+    if definition:
+        return asset_definitions.Media(media=definition)
+
+    return asset_definitions.Media()
+
+
+def value_asdict(value: Any) -> Any:
+    """
+    Dataclass values as dicts for rendering, converting nested dataclasses,
+    Enums and QuerySets, or using the value's own asdict if it has one.
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        if callable(getattr(value, "asdict", None)):
+            return value.asdict()
+
+        return asdict(value, dict_factory=value_render_encoder)
+
+    return value
+
+
 def value_render_encoder(data) -> dict:
     def encode(o):
         if is_dataclass(o):
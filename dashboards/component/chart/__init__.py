@@ -1,5 +1,15 @@
 from .chart import Chart
+from .downsample import Downsample, LTTBDownsample, MeanDownsample, MinMaxDownsample
+from .figure import FigureSpec
 from .serializers import ChartSerializer
 
 
-__all__ = ["Chart", "ChartSerializer"]
+__all__ = [
+    "Chart",
+    "ChartSerializer",
+    "FigureSpec",
+    "Downsample",
+    "LTTBDownsample",
+    "MinMaxDownsample",
+    "MeanDownsample",
+]
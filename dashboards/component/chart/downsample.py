@@ -0,0 +1,188 @@
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+def to_float(values: pd.Series) -> np.ndarray:
+    """
+    Values as floats to compare distances between points, datetimes as their
+    timestamp and anything else which isn't numeric by its position.
+    """
+    if is_datetime64_any_dtype(values):
+        return pd.DatetimeIndex(values).asi8.astype(float)
+    elif is_numeric_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+
+    return np.arange(len(values), dtype=float)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Positions of the threshold points chosen by Largest-Triangle-Three-Buckets,
+    which keeps the first and last points and from each bucket in between, the
+    point making the largest triangle with the point chosen from the previous
+    bucket and the average of the next.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # the edges of threshold - 2 buckets, between the first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    counts = np.diff(edges)
+    valid = ~np.isnan(y)
+
+    avg_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(np.where(valid, y, 0)[: n - 1], edges[:-1]) / np.maximum(
+        np.add.reduceat(valid[: n - 1], edges[:-1]), 1
+    )
+    # each bucket's triangle ends at the next bucket's average, the last's at the last point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1)))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Positions of the first & last points, plus the lowest and highest point in
+    each of threshold / 2 buckets.
+    """
+    n = len(y)
+    buckets = max(threshold // 2, 1)
+    if threshold >= n:
+        return np.arange(n)
+
+    starts = np.arange(buckets) * n // buckets
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    nan = np.isnan(y)
+
+    selected = [np.array([0, n - 1])]
+    reducers: List[Tuple[float, np.ufunc]] = [
+        (np.inf, np.minimum),
+        (-np.inf, np.maximum),
+    ]
+    for fill, reduce in reducers:
+        filled = np.where(nan, fill, y)
+        extremes = reduce.reduceat(filled, starts)
+        hits = np.flatnonzero(filled == extremes[bucket])
+        # the first point in each bucket at its min/max
+        _, first = np.unique(bucket[hits], return_index=True)
+        selected.append(hits[first])
+
+    return np.unique(np.concatenate(selected))
+
+
+class Downsample:
+    """
+    Reduces the points of each trace of a chart's data to around threshold, for
+    a DataFrame of x and y columns, with a trace for each group_by value if set.
+    The base class keeps every nth point.
+    """
+
+    def __init__(
+        self,
+        x: str,
+        y: Union[str, List[str]],
+        threshold: int = 1000,
+        group_by: Optional[Union[str, List[str]]] = None,
+    ):
+        self.x = x
+        self.y = [y] if isinstance(y, str) else list(y)
+        self.threshold = threshold
+        self.group_by = group_by
+
+    def downsample(self, data: pd.DataFrame) -> pd.DataFrame:
+        if not isinstance(data, pd.DataFrame) or len(data) <= self.threshold:
+            return data
+
+        if not data[self.x].is_monotonic_increasing:
+            data = data.sort_values(self.x, kind="stable")
+
+        if self.group_by is None:
+            return self.downsample_trace(data)
+
+        return pd.concat(
+            [
+                self.downsample_trace(trace)
+                for _, trace in data.groupby(self.group_by, sort=False)
+            ]
+        )
+
+    def downsample_trace(self, data: pd.DataFrame) -> pd.DataFrame:
+        if len(data) <= self.threshold:
+            return data
+
+        return data.iloc[self.select(data)]
+
+    def select(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Positions of the rows kept in a trace sorted by x.
+        """
+        return np.unique(np.linspace(0, len(data) - 1, self.threshold).astype(int))
+
+
+class LTTBDownsample(Downsample):
+    """
+    Keeps the points which best preserve the shape of the line, using
+    Largest-Triangle-Three-Buckets. With more than one y the points chosen for
+    each are kept.
+    """
+
+    def select(self, data: pd.DataFrame) -> np.ndarray:
+        x = to_float(data[self.x])
+        return np.unique(
+            np.concatenate([lttb(x, to_float(data[y]), self.threshold) for y in self.y])
+        )
+
+
+class MinMaxDownsample(Downsample):
+    """
+    Keeps the lowest and highest point in each bucket, so spikes are always
+    shown. With more than one y the points chosen for each are kept.
+    """
+
+    def select(self, data: pd.DataFrame) -> np.ndarray:
+        return np.unique(
+            np.concatenate([minmax(to_float(data[y]), self.threshold) for y in self.y])
+        )
+
+
+class MeanDownsample(Downsample):
+    """
+    Replaces each bucket of points with their mean x and y, smoothing the line.
+    Other columns take their first value in the bucket, as does the index.
+    """
+
+    def downsample_trace(self, data: pd.DataFrame) -> pd.DataFrame:
+        if len(data) <= self.threshold:
+            return data
+
+        n = len(data)
+        bucket = np.arange(n) * self.threshold // n
+        averaged = set(self.y)
+        x = data[self.x]
+        if is_numeric_dtype(x) or is_datetime64_any_dtype(x):
+            averaged.add(self.x)
+
+        starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+
+        return (
+            data.groupby(bucket, sort=False)
+            .agg({c: "mean" if c in averaged else "first" for c in data.columns})
+            .set_axis(data.index[starts])
+        )
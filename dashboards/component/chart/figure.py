@@ -0,0 +1,101 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import plotly.io as pio
+
+
+# plotly properties with an underscore in their name, which aren't split into a path
+UNDERSCORE_PROPS = {"paper_bgcolor", "plot_bgcolor", "error_x", "error_y", "error_z"}
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Dict[str, Any]:
+    return pio.templates[name].to_plotly_json()
+
+
+def split_key(key: str) -> List[str]:
+    """
+    Split a plotly "magic underscore" key, i.e. xaxis_title_text, into its path.
+    """
+    if "_" not in key or key in UNDERSCORE_PROPS:
+        return [key]
+
+    path: List[str] = []
+    for part in key.split("_"):
+        if path and f"{path[-1]}_{part}" in UNDERSCORE_PROPS:
+            path[-1] = f"{path[-1]}_{part}"
+        else:
+            path.append(part)
+
+    return path
+
+
+def merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge updates into a copy of base the way plotly's update does, following
+    magic underscores, setting string titles as their text and removing values
+    updated to None. Neither dict is changed, values are copied only where merged.
+    """
+    merged = dict(base)
+
+    for key, value in updates.items():
+        path = split_key(key)
+        for part in reversed(path[1:]):
+            value = {part: value}
+        key = path[0]
+
+        if key == "template" and isinstance(value, str):
+            merged[key] = get_template(value)
+        elif key == "title" and isinstance(value, str):
+            merged[key] = {"text": value}
+        elif value is None:
+            # compound properties are emptied, anything else is unset
+            if key == "title" or isinstance(merged.get(key), dict):
+                merged[key] = {}
+            else:
+                merged.pop(key, None)
+        elif isinstance(value, dict):
+            current = merged.get(key)
+            merged[key] = merge(current if isinstance(current, dict) else {}, value)
+        else:
+            merged[key] = value
+
+    return merged
+
+
+class FigureSpec:
+    """
+    A plotly figure as plain dicts, returned from to_fig in place of a
+    graph_objs.Figure, which validates every value as it is set. Nothing is
+    validated, the traces and layout are encoded as they are given.
+    """
+
+    def __init__(
+        self,
+        data: Optional[List[Dict[str, Any]]] = None,
+        layout: Optional[Dict[str, Any]] = None,
+    ):
+        self.data: List[Dict[str, Any]] = []
+        self.layout: Dict[str, Any] = {"template": get_template(pio.templates.default)}
+
+        for trace in data or []:
+            self.add_trace(**trace)
+
+        self.update_layout(layout)
+
+    @classmethod
+    def from_dict(cls, figure: Dict[str, Any]) -> "FigureSpec":
+        return cls(data=figure.get("data"), layout=figure.get("layout"))
+
+    def add_trace(self, type: str = "scatter", **trace) -> "FigureSpec":
+        self.data.append(merge({}, {**trace, "type": type}))
+        return self
+
+    def update_layout(
+        self, dict1: Optional[Dict[str, Any]] = None, **layout
+    ) -> "FigureSpec":
+        self.layout = merge(merge(self.layout, dict1 or {}), layout)
+        return self
+
+    def to_plotly_json(self) -> Dict[str, Any]:
+        return {"data": self.data, "layout": self.layout}
@@ -1,5 +1,4 @@
-import json
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type, Union
 
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Model
@@ -11,6 +10,12 @@ import plotly.graph_objs as go
 
 from dashboards.meta import ClassWithMeta
 
+from .downsample import Downsample
+from .figure import FigureSpec
+
+
+Figure = Union[go.Figure, FigureSpec]
+
 
 class ModelDataMixin:
     """
@@ -66,27 +71,26 @@ class PlotlyChartSerializerMixin:
         displayModeBar: Optional[bool] = True
         staticPlot: Optional[bool] = False
         responsive: Optional[bool] = True
-
-    def empty_chart(self) -> str:
-        return json.dumps(
-            {
-                "layout": {
-                    "xaxis": {"visible": False},
-                    "yaxis": {"visible": False},
-                    "annotations": [
-                        {
-                            "text": f"{self._meta.verbose_name} - No data",
-                            "xref": "paper",
-                            "yref": "paper",
-                            "showarrow": False,
-                            "font": {"size": 28},
-                        }
-                    ],
-                }
+        downsample: Optional[Downsample] = None
+
+    def empty_chart(self) -> Dict[str, Any]:
+        return {
+            "layout": {
+                "xaxis": {"visible": False},
+                "yaxis": {"visible": False},
+                "annotations": [
+                    {
+                        "text": f"{self._meta.verbose_name} - No data",
+                        "xref": "paper",
+                        "yref": "paper",
+                        "showarrow": False,
+                        "font": {"size": 28},
+                    }
+                ],
             }
-        )
+        }
 
-    def apply_layout(self, fig: go.Figure, dark=False) -> go.Figure:
+    def apply_layout(self, fig: Figure, dark=False) -> Figure:
         layout = self.layout or {}
 
         for attr in self.meta_layout_attrs:
@@ -104,11 +108,27 @@ class PlotlyChartSerializerMixin:
     def get_data(self, *args, **kwargs) -> pd.DataFrame:
         raise NotImplementedError
 
-    def to_fig(self, data: Any) -> go.Figure:
+    def downsample(self, data: Any) -> Any:
+        """
+        Reduce the points in each trace with the Meta.downsample strategy, if set.
+        """
+        if self._meta.downsample is None:
+            return data
+
+        return self._meta.downsample.downsample(data)
+
+    def to_fig(self, data: Any) -> Union[Figure, Dict[str, Any]]:
+        """
+        The chart as a plotly Figure, or a FigureSpec or dict of its data and
+        layout which is encoded without plotly validating it.
+        """
         raise NotImplementedError
 
     @classmethod
-    def serialize(cls, **kwargs) -> str:
+    def serialize(cls, **kwargs) -> Dict[str, Any]:
+        """
+        The chart's data and layout, encoded once with the component's value.
+        """
         self = cls()
         request = kwargs.get("request")
         df = self.get_data(**kwargs)
@@ -116,17 +136,23 @@ class PlotlyChartSerializerMixin:
         if isinstance(df, pd.DataFrame) and df.empty:
             return self.empty_chart()
 
-        fig = self.to_fig(df)
+        fig = self.to_fig(self.downsample(df))
+        if isinstance(fig, dict):
+            fig = FigureSpec.from_dict(fig)
+
         fig = self.apply_layout(
             fig, dark=request and request.COOKIES.get("appearanceMode") == "dark"
         )
 
-        return fig.to_json()
+        return fig.to_plotly_json()
 
     @classmethod
     def render(cls, template_id, **kwargs) -> str:
         self = cls()
-        value = cls.serialize(**kwargs)
+        value = kwargs.pop("value", None)
+        if value is None:
+            value = cls.serialize(**kwargs)
+
         context = {
             "template_id": template_id,
             "value": value,
@@ -165,7 +191,7 @@ class BaseChartSerializer(ClassWithMeta, asset_definitions.MediaDefiningClass):
         return resolved_meta_class
 
     @classmethod
-    def serialize(cls, **kwargs) -> str:
+    def serialize(cls, **kwargs) -> Dict[str, Any]:
         raise NotImplementedError
 
 
@@ -1,12 +1,13 @@
+import copy
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, Literal, Optional, Type
 
 from django.http import HttpRequest
-from django.urls import reverse
 
 from .. import config
 from ..forms import DashboardForm
 from ..types import ValueData
+from ..utils import cached_reverse
 from .base import Component, value_render_encoder
 
 
@@ -27,7 +28,9 @@ class Form(Component):
     submit_url: Optional[str] = None
 
     def __post_init__(self):
-        default_css_classes = config.Config().DASHBOARDS_COMPONENT_CLASSES["Form"]
+        default_css_classes = copy.copy(
+            config.get_config().DASHBOARDS_COMPONENT_CLASSES["Form"]
+        )
         # make sure css_classes is a dict as this is what form template requires
         if self.css_classes and isinstance(self.css_classes, str):
             # if sting assume this is form class
@@ -60,7 +63,7 @@ class Form(Component):
             # <str:app_label>/<str:dashboard>/<str:lookup>/<str:component>/
             args.insert(2, getattr(self.object, self.dashboard._meta.lookup_field))
 
-        return reverse("dashboards:form_component", args=args)
+        return cached_reverse("dashboards:form_component", args=args)
 
     def get_form(self, request: HttpRequest = None) -> DashboardForm:
         if not self.form:
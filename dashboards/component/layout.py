@@ -7,6 +7,7 @@ from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
 
 from .. import config
+from ..instrumentation import instrument
 from . import CTA
 
 
@@ -65,7 +66,7 @@ class LayoutBase:
         if grid_css_classes:
             self.grid_css_classes = grid_css_classes
         else:
-            self.grid_css_classes = config.Config().DASHBOARDS_DEFAULT_GRID_CSS
+            self.grid_css_classes = config.get_config().DASHBOARDS_DEFAULT_GRID_CSS
 
         self.component_context = {}
         for k, v in kwargs.items():
@@ -89,6 +90,20 @@ class LayoutBase:
 
         return component_css
 
+    def get_component_keys(self) -> List[str]:
+        """
+        Keys of all the dashboard components in this layout, including any nested
+        layout components.
+        """
+        keys = []
+        for layout_component in self.layout_components:
+            if isinstance(layout_component, str):
+                keys.append(layout_component)
+            elif isinstance(layout_component, LayoutBase):
+                keys += layout_component.get_component_keys()
+
+        return keys
+
     def get_components_rendered(self, dashboard, context: Context) -> str:
         html = ""
         dashboard_components = dict([(x.key, x) for x in dashboard.get_components()])
@@ -103,7 +118,11 @@ class LayoutBase:
             if hasattr(layout_component, "render"):
                 html += layout_component.render(dashboard=dashboard, context=context)
             elif dashboard_component:
-                html += dashboard_component.render(context=context)
+                # use the html if the dashboard has already rendered it in parallel
+                rendered = dashboard.rendered_components.get(layout_component)
+                if rendered is None:
+                    rendered = dashboard_component.render(context=context)
+                html += rendered
 
         return mark_safe(html)
 
@@ -116,7 +135,8 @@ class ComponentLayout(LayoutBase):
     """
 
     def render(self, dashboard, context: Context):
-        return self.get_components_rendered(dashboard=dashboard, context=context)
+        with instrument("layout", "render"):
+            return self.get_components_rendered(dashboard=dashboard, context=context)
 
 
 class HTMLComponentLayout(ComponentLayout):
@@ -154,7 +174,7 @@ class Card(HTMLComponentLayout):
     template_name: str = "dashboards/layout/components/card.html"
     css_classes: Optional[
         Dict[str, str]
-    ] = config.Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Card"]
+    ] = config.get_config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Card"]
 
     def __init__(
         self,
@@ -196,14 +216,14 @@ class Div(HTMLComponentLayout):
     template_name: str = "dashboards/layout/components/div.html"
     css_classes: Optional[
         Dict[str, str]
-    ] = config.Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Div"]
+    ] = config.get_config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Div"]
 
 
 class TabContainer(HTMLComponentLayout):
     template_name: str = "dashboards/layout/components/tabs/container.html"
     css_classes: Optional[
         Dict[str, str]
-    ] = config.Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["TabContainer"]
+    ] = config.get_config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["TabContainer"]
 
     def render(self, dashboard, context: Context, **kwargs) -> str:
         tab_panels = self.get_components_rendered(dashboard, context)
@@ -230,7 +250,7 @@ class Tab(HTMLComponentLayout):
     template_name: str = "dashboards/layout/components/tabs/content.html"
     css_classes: Optional[
         Dict[str, str]
-    ] = config.Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Tab"]
+    ] = config.get_config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Tab"]
 
     def __init__(self, tab_label, *layout_components, **kwargs):
         self.tab_label = tab_label
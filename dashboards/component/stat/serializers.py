@@ -119,7 +119,10 @@ class StatSerializer(BaseStatSerializer, asset_definitions.MediaDefiningClass):
 
     @classmethod
     def render(cls, **kwargs) -> str:
-        value = cls.serialize(**kwargs)
+        value = kwargs.pop("value", None)
+        if value is None:
+            value = cls.serialize(**kwargs)
+
         context = {
             "rendered_value": value,
             **kwargs,
@@ -1,5 +1,20 @@
+from .columnar import ColumnarTable
+from .counts import CappedCount, Count, EstimatedCount
+from .search import PostgresSearch, SearchBackend, SQLiteFTSSearch
 from .serializers import SerializedTable, TableSerializer
 from .table import BasicTable, Table
 
 
-__all__ = ["BasicTable", "Table", "TableSerializer", "SerializedTable"]
+__all__ = [
+    "BasicTable",
+    "Table",
+    "TableSerializer",
+    "SerializedTable",
+    "ColumnarTable",
+    "Count",
+    "CappedCount",
+    "EstimatedCount",
+    "SearchBackend",
+    "SQLiteFTSSearch",
+    "PostgresSearch",
+]
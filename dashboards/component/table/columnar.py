@@ -0,0 +1,142 @@
+from functools import reduce
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarTable:
+    """
+    Column oriented view of in memory table data, a list of dicts or a DataFrame,
+    so searching and sorting are vectorised.
+
+    Filtering and sorting only select and reorder row positions, sharing the
+    lowered columns worked out for searches and sorts between every view of the
+    same data. Return the same ColumnarTable from get_data to keep them between
+    requests.
+    """
+
+    # joins the columns searched, so a search can't match across two columns
+    separator = "\x1f"
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        records: Optional[List[Dict[str, Any]]] = None,
+        positions: Optional[np.ndarray] = None,
+        cache: Optional[Dict[str, Any]] = None,
+    ):
+        self.frame = frame
+        self.records = records
+        self.positions = np.arange(len(frame)) if positions is None else positions
+        self.cache = {} if cache is None else cache
+
+    @classmethod
+    def from_data(
+        cls, data: Union["ColumnarTable", pd.DataFrame, List[Dict[str, Any]]]
+    ) -> "ColumnarTable":
+        if isinstance(data, ColumnarTable):
+            return data
+        elif isinstance(data, pd.DataFrame):
+            return cls(data.reset_index(drop=True))
+
+        # the original records are returned, so values aren't changed by pandas
+        records = list(data)
+        return cls(pd.DataFrame.from_records(records), records=records)
+
+    def view(self, positions: np.ndarray) -> "ColumnarTable":
+        return ColumnarTable(self.frame, self.records, positions, self.cache)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.get_records(self.positions))
+
+    def __getitem__(self, item: Union[int, slice]) -> Any:
+        if isinstance(item, slice):
+            return self.get_records(self.positions[item])
+
+        return self.get_records(self.positions[[item]])[0]
+
+    def get_records(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        if self.records is not None:
+            return [self.records[i] for i in positions]
+
+        rows = self.frame.iloc[positions].astype(object)
+        return rows.where(rows.notna(), None).to_dict("records")
+
+    def get_column(self, field: str) -> pd.Series:
+        if field in self.frame:
+            return self.frame[field]
+
+        return pd.Series([None] * len(self.frame), dtype=object)
+
+    def get_search_text(self) -> np.ndarray:
+        """
+        Every column as lowered text joined into one, so a search of all columns
+        is a single vectorised contains.
+        """
+        if "search" not in self.cache:
+            columns = [
+                column.where(column.notna(), "").astype(str).str.lower()
+                for _, column in self.frame.items()
+            ]
+            text = reduce(lambda a, b: a + self.separator + b, columns)
+            self.cache["search"] = np.asarray(text, dtype=object)
+
+        return self.cache["search"]
+
+    def get_sort_key(self, field: str, force_lower: bool) -> Tuple[np.ndarray, int]:
+        """
+        The rank of each row's value in the column, so sorts compare integers
+        rather than the values, and the rank given to nulls so they're last.
+        """
+        key = f"rank:{field}:{force_lower}"
+        if key not in self.cache:
+            column = self.get_column(field)
+            if force_lower and column.dtype == object:
+                # only strings are lowered, any other values are sorted as they are
+                lowered = column.str.lower()
+                column = lowered.where(lowered.notna(), column)
+
+            codes, uniques = pd.factorize(column, sort=True)
+            self.cache[key] = np.where(codes < 0, len(uniques), codes), len(uniques)
+
+        return self.cache[key]
+
+    def search(self, value: str) -> "ColumnarTable":
+        text = pd.Series(self.get_search_text()[self.positions], dtype=object)
+        mask = text.str.contains(value.lower(), regex=False).to_numpy(dtype=bool)
+        return self.view(self.positions[mask])
+
+    def filter_equal(self, values: Dict[str, Any]) -> "ColumnarTable":
+        mask = np.ones(len(self.positions), dtype=bool)
+        for field, value in values.items():
+            column = self.get_column(field).iloc[self.positions]
+            mask &= column.eq(value).to_numpy(dtype=bool)
+
+        return self.view(self.positions[mask])
+
+    def sort(
+        self, orders: List[Tuple[str, bool]], force_lower: bool
+    ) -> "ColumnarTable":
+        """
+        Sort by every (field, descending) in orders in one stable sort, the first
+        taking precedence. Nulls are sorted last.
+        """
+        if not orders or not len(self.positions):
+            return self
+
+        keys = []
+        for field, descending in orders:
+            ranks, nulls = self.get_sort_key(field, force_lower)
+            if descending:
+                # reverse the ranks, keeping nulls last
+                ranks = np.where(ranks == nulls, nulls, nulls - 1 - ranks)
+            keys.append(ranks[self.positions])
+
+        # lexsort is stable and sorts by the last key first
+        order = np.lexsort(keys[::-1])
+
+        return self.view(self.positions[order])
@@ -0,0 +1,76 @@
+from typing import List, Optional, Union
+
+from django.db import connections
+from django.db.models import QuerySet
+
+
+class Count:
+    """
+    Counts the rows in a table's data, the default exact count.
+    """
+
+    def count(self, data: Union[QuerySet, List]) -> int:
+        if isinstance(data, QuerySet):
+            return data.count()
+
+        return len(data)
+
+
+class CappedCount(Count):
+    """
+    Counts at most limit rows, so the database can stop once it has found them.
+    Tables larger than the limit report limit rows, and their pages beyond it
+    can't be reached.
+    """
+
+    def __init__(self, limit: int = 10_000):
+        self.limit = limit
+
+    def count(self, data: Union[QuerySet, List]) -> int:
+        if isinstance(data, QuerySet):
+            return data[: self.limit].count()
+
+        return min(len(data), self.limit)
+
+
+class EstimatedCount(Count):
+    """
+    Uses the row estimate from the PostgreSQL table statistics for unfiltered
+    querysets over threshold rows. Smaller tables, filtered querysets and any
+    other database are counted exactly.
+    """
+
+    def __init__(self, threshold: int = 100_000):
+        self.threshold = threshold
+
+    def count(self, data: Union[QuerySet, List]) -> int:
+        estimate = self.estimate(data)
+        if estimate is not None and estimate >= self.threshold:
+            return estimate
+
+        return super().count(data)
+
+    def estimate(self, data: Union[QuerySet, List]) -> Optional[int]:
+        if not isinstance(data, QuerySet):
+            return None
+
+        query = data.query
+        if query.where or query.distinct or query.is_sliced or query.combinator:
+            return None
+
+        connection = connections[data.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [data.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 for tables which have never been analyzed
+        if row is None or row[0] < 0:
+            return None
+
+        return int(row[0])
@@ -0,0 +1,103 @@
+import csv
+import io
+import re
+from itertools import count, islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+import django
+from django.db.models import QuerySet
+
+from dashboards import encoders
+
+from .columnar import ColumnarTable
+
+
+# cells spreadsheets would run as a formula, other than plain numbers
+FORMULA_RE = re.compile(r"^[=+\-@\t\r]")
+NUMBER_RE = re.compile(r"^[+-]?\d+(\.\d+)?([eE][+-]?\d+)?$")
+
+# QuerySet.iterator prefetches in chunks from django 4.1
+ITERATOR_PREFETCHES = django.VERSION >= (4, 1)
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_chunks(data: Any, size: int) -> Iterator[List[Any]]:
+    """
+    Yields the rows of table data size rows at a time, querysets are fetched
+    with a server side cursor where supported, so only a chunk is ever in memory.
+    """
+    if isinstance(data, ColumnarTable):
+        # slicing only builds records for the rows sliced
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
+
+        return
+
+    if (
+        isinstance(data, QuerySet)
+        and data._prefetch_related_lookups
+        and not ITERATOR_PREFETCHES
+    ):
+        # iterator ignores prefetch_related, so fetch a slice at a time instead
+        for start in count(0, size):
+            chunk = list(data[start : start + size])
+            if not chunk:
+                return
+
+            yield chunk
+
+    rows: Iterable[Any] = (
+        data.iterator(chunk_size=size) if isinstance(data, QuerySet) else data
+    )
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def escape_cell(value: Any) -> Any:
+    """
+    Quote text a spreadsheet would run as a formula, i.e. =HYPERLINK(...).
+    """
+    if (
+        isinstance(value, str)
+        and FORMULA_RE.match(value)
+        and not NUMBER_RE.match(value)
+    ):
+        return "'" + value
+
+    return value
+
+
+def write_csv(rows: List[List[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[escape_cell(v) for v in row] for row in rows])
+    return buffer.getvalue()
+
+
+def export_csv(
+    columns: Dict[str, str], chunks: Iterator[List[Dict[str, Any]]]
+) -> Iterator[str]:
+    yield write_csv([list(columns.values())])
+    for chunk in chunks:
+        yield write_csv([[row[field] for field in columns] for row in chunk])
+
+
+def export_ndjson(
+    columns: Dict[str, str], chunks: Iterator[List[Dict[str, Any]]]
+) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(encoders.dumps(row) + "\n" for row in chunk)
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "ndjson": export_ndjson,
+}
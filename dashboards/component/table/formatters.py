@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import (
+    BooleanField,
+    CharField,
+    DateField,
+    DateTimeField,
+    DecimalField,
+    Field,
+    FloatField,
+    IntegerField,
+    Model,
+    TextField,
+    TimeField,
+    UUIDField,
+)
+
+from dashboards.log import logger
+
+
+# model fields whose values are never a datetime or bool, so only None is converted
+PLAIN_FIELDS = (
+    CharField,
+    TextField,
+    IntegerField,
+    FloatField,
+    DecimalField,
+    DateField,
+    TimeField,
+    UUIDField,
+)
+
+
+def convert_value(value: Any) -> Any:
+    if value and isinstance(value, datetime):
+        return naturaltime(value)
+
+    elif isinstance(value, bool):
+        return "Yes" if value else "No"
+
+    elif value is None:
+        return "-"
+
+    return value
+
+
+def convert_datetime(value: Any) -> Any:
+    return "-" if value is None else naturaltime(value)
+
+
+def convert_bool(value: Any) -> Any:
+    if value is None:
+        return "-"
+
+    return "Yes" if value else "No"
+
+
+def convert_none(value: Any) -> Any:
+    return "-" if value is None else value
+
+
+def get_model_field(model: Optional[Type[Model]], field: str) -> Optional[Field]:
+    """
+    Returns the concrete model field at the end of a column, following any
+    relations, or None if the column isn't a model field.
+    """
+    if model is None:
+        return None
+
+    current: Any = model
+    model_field = None
+    for name in field.split("__"):
+        if current is None:
+            return None
+
+        try:
+            model_field = current._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+        current = model_field.related_model
+
+    if model_field is None or model_field.is_relation:
+        return None
+
+    return model_field
+
+
+def get_converter(model_field: Optional[Field]) -> Callable[[Any], Any]:
+    if isinstance(model_field, DateTimeField):
+        return convert_datetime
+    elif isinstance(model_field, BooleanField):
+        return convert_bool
+    elif isinstance(model_field, PLAIN_FIELDS):
+        return convert_none
+
+    return convert_value
+
+
+def get_object_getter(field: str) -> Callable[[Any], Any]:
+    # attrgetter traverses relations the same as reduce(getattr, ...)
+    get = attrgetter(field.replace("__", "."))
+
+    def getter(obj):
+        try:
+            return get(obj)
+        except AttributeError:
+            logger.warn(f"{field} is not a attribute for this object.")
+            return None
+
+    return getter
+
+
+def get_dict_getter(field: str) -> Callable[[Any], Any]:
+    def getter(row: Dict[str, Any]) -> Any:
+        return row.get(field)
+
+    return getter
+
+
+@dataclass
+class Column:
+    field: str
+    converter: Callable[[Any], Any]
+    hook: Optional[str]  # name of the serializers get_FOO_value method
+
+
+@dataclass
+class RowFormatter:
+    """
+    Formats the rows of a table page, with the work of deciding how to get and
+    convert each column done once per serializer and model.
+    """
+
+    columns: List[Column]
+
+    def format(
+        self,
+        rows: List[Any],
+        serializer: Any,
+        first_as_absolute_url: bool,
+        compact: bool = False,
+    ) -> List[Any]:
+        """
+        Format rows as dicts of field to value, or if compact as lists of values
+        in column order.
+        """
+        if not rows:
+            return []
+
+        hooks = {c.hook: getattr(serializer, c.hook) for c in self.columns if c.hook}
+        first = self.columns[0]
+        link = first_as_absolute_url and first.hook is None
+
+        getters: List[Callable[[Any], Any]]
+        if isinstance(rows[0], tuple):
+            # values_list rows, with any keyset annotations after the columns
+            getters = [itemgetter(i) for i in range(len(self.columns))]
+        elif isinstance(rows[0], dict):
+            getters = [get_dict_getter(c.field) for c in self.columns]
+        else:
+            getters = [get_object_getter(c.field) for c in self.columns]
+
+        compiled = [
+            (c.field, hooks.get(c.hook) if c.hook else None, getter, c.converter)
+            for c, getter in zip(self.columns, getters)
+        ]
+
+        processed_data: List[Any] = []
+        for row in rows:
+            if compact:
+                values: Any = [
+                    hook(row) if hook else converter(getter(row))
+                    for _, hook, getter, converter in compiled
+                ]
+                key: Any = 0
+            else:
+                values = {}
+                for field, hook, getter, converter in compiled:
+                    values[field] = hook(row) if hook else converter(getter(row))
+                key = first.field
+
+            if link and hasattr(row, "get_absolute_url"):
+                values[key] = f'<a href="{row.get_absolute_url()}">{values[key]}</a>'
+
+            processed_data.append(values)
+
+        return processed_data
+
+
+@lru_cache(maxsize=None)
+def get_row_formatter(
+    serializer_class: Type[Any], model: Optional[Type[Model]]
+) -> RowFormatter:
+    return RowFormatter(
+        columns=[
+            Column(
+                field=field,
+                converter=get_converter(get_model_field(model, field)),
+                hook=(
+                    f"get_{field}_value"
+                    if hasattr(serializer_class, f"get_{field}_value")
+                    else None
+                ),
+            )
+            for field in serializer_class._meta.columns
+        ]
+    )
@@ -1,29 +1,59 @@
 from collections.abc import Iterable
-from typing import Any, Dict, List, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
 
 from django.core.exceptions import FieldDoesNotExist
 from django.core.paginator import Page, Paginator
-from django.db.models import CharField, F, Q, QuerySet
+from django.db.models import CharField, F, Model, OrderBy, Q, QuerySet
 from django.db.models.functions import Lower
+from django.db.models.query import ModelIterable
+from django.http import HttpRequest
+
+import pandas as pd
+
+from dashboards.cache import get_cache, hash_filters, make_cache_key
+
+from .columnar import ColumnarTable
+from .search import SearchBackend
+
+
+ColumnarData = Union[pd.DataFrame, ColumnarTable]
+
+
+# filters which move between pages of the same table, ignored in cursor keys
+PAGE_FILTERS = ["start", "length", "draw"]
+
+# datatables filters searching and sorting the table, ignored in total count keys
+TABLE_FILTER_PREFIXES = ("search[", "columns[", "order[")
 
 
 class TableQuerysetProcessor:
     @staticmethod
-    def filter(qs: QuerySet, fields: List[str], filters: Dict[str, Any]) -> QuerySet:
+    def filter(
+        qs: QuerySet,
+        fields: List[str],
+        filters: Dict[str, Any],
+        search_backend: Optional[SearchBackend] = None,
+    ) -> QuerySet:
         """
         Apply filtering on a queryset based on the search[value] and
         columns[{field}][search][value] column request params.
+
+        The search[value] search across all fields uses search_backend, or
+        icontains if not set.
         """
 
         global_search_value = filters.get("search[value]")
         # used to filter out non model fields
         model_fields = [f.name for f in qs.model._meta.get_fields()]
 
+        if global_search_value:
+            qs = (search_backend or SearchBackend()).search(
+                qs,
+                [field for field in fields if field in model_fields],
+                global_search_value,
+            )
+
         q_list = Q()
-        # Search all fields by adding a Q for each.
-        for field in fields:
-            if field in model_fields and global_search_value:
-                q_list |= Q(**{f"{field}__icontains": global_search_value})
 
         # Search in individual fields by checking for a request value at index.
         for o, field in enumerate(fields):
@@ -72,24 +102,188 @@ class TableQuerysetProcessor:
     def count(qs: QuerySet) -> QuerySet:
         return qs.count()
 
+    @staticmethod
+    def get_related(
+        model: Type[Model], fields: List[str]
+    ) -> Tuple[Set[str], Set[str], Optional[List[str]]]:
+        """
+        Walk the fields through the model's relations, returning the relations to
+        select_related, those to prefetch_related and the fields to load with only(),
+        which is None if any field isn't a concrete field so everything is loaded.
+        """
+        select, prefetch = set(), set()
+        only: Optional[List[str]] = []
+
+        for field in fields:
+            current, path = model, []
+            for name in field.split("__"):
+                try:
+                    model_field = current._meta.get_field(name)
+                except FieldDoesNotExist:
+                    # a property or method, which could use any field
+                    only = None
+                    break
+
+                path.append(name)
+                if not model_field.is_relation:
+                    if only is not None:
+                        only.append(field)
+                    break
+
+                if model_field.related_model is None:
+                    # generic foreign keys can only be prefetched
+                    prefetch.add("__".join(path))
+                    only = None
+                    break
+                elif model_field.many_to_many or model_field.one_to_many:
+                    prefetch.add("__".join(path))
+                    break
+                else:
+                    select.add("__".join(path))
+                    current = model_field.related_model
+            else:
+                # the related object itself is displayed, its str could use any field
+                only = None
+
+        return select, prefetch, only
+
+    @staticmethod
+    def optimize(qs: QuerySet, fields: List[str], only: bool) -> QuerySet:
+        """
+        Apply select_related and prefetch_related for the relations traversed by
+        fields, so rows don't each query their relations, and only() load the
+        fields displayed when only is True.
+
+        If only and every field is a model field, with no relations to prefetch,
+        rows are fetched with values_list() as no instances are needed.
+        """
+        if not issubclass(qs._iterable_class, ModelIterable):
+            return qs
+
+        select, prefetch, only_fields = TableQuerysetProcessor.get_related(
+            qs.model, fields
+        )
+        if only and only_fields is not None and not prefetch:
+            return qs.values_list(*only_fields)
+
+        # deferring fields the queryset already selects related would be an error
+        only = (
+            only
+            and only_fields is not None
+            and qs.query.select_related is False
+            and qs.query.deferred_loading == (frozenset(), True)
+        )
+
+        if select and qs.query.select_related is not True:
+            qs = qs.select_related(*select)
+
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+
+        if only:
+            qs = qs.only(*only_fields)
+
+        return qs
+
+    @staticmethod
+    def keyset(qs: QuerySet) -> Optional[Tuple[QuerySet, List[bool]]]:
+        """
+        Annotates the queryset with each expression it is ordered by plus the pk,
+        so every row has a unique position, and orders by those annotations.
+        Returns the queryset and whether each annotation is descending, or None
+        if the ordering can't be used as a keyset.
+        """
+        ordering = list(qs.query.order_by)
+        if not ordering and qs.query.default_ordering:
+            ordering = list(qs.model._meta.ordering)
+
+        annotations = {}
+        descending = []
+
+        for i, order in enumerate(ordering + ["pk"]):
+            if isinstance(order, str):
+                if order == "?" or "." in order:
+                    return None
+
+                desc, expression = order.startswith("-"), F(order.lstrip("-"))
+            elif isinstance(order, OrderBy):
+                desc, expression = order.descending, order.expression
+            else:
+                desc, expression = False, order
+
+            annotations[f"_keyset_{i}"] = expression
+            descending.append(desc)
+
+        qs = qs.annotate(**annotations).order_by(
+            *[
+                F(alias).desc(nulls_last=True)
+                if desc
+                else F(alias).asc(nulls_last=True)
+                for alias, desc in zip(annotations, descending)
+            ]
+        )
+
+        return qs, descending
+
+    @staticmethod
+    def seek(qs: QuerySet, cursor: List[Any], descending: List[bool]) -> QuerySet:
+        """
+        Filter a keyset queryset to the rows after cursor, the keyset values of
+        the last row on the previous page. Nulls are always sorted last.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+
+        for i, (value, desc) in enumerate(zip(cursor, descending)):
+            alias = f"_keyset_{i}"
+            if value is None:
+                # only rows also null in this column can follow a null
+                equal &= Q(**{f"{alias}__isnull": True})
+                continue
+
+            after = Q(**{f"{alias}__{'lt' if desc else 'gt'}": value}) | Q(
+                **{f"{alias}__isnull": True}
+            )
+            condition |= equal & after
+            equal &= Q(**{alias: value})
+
+        return qs.filter(condition)
+
+    @staticmethod
+    def get_cursor(obj: Any, size: int) -> List[Any]:
+        aliases = [f"_keyset_{i}" for i in range(size)]
+        if isinstance(obj, dict):
+            return [obj[alias] for alias in aliases]
+        elif isinstance(obj, tuple):
+            # values_list rows, with the annotations after the columns
+            return list(obj[-size:])
+
+        return [getattr(obj, alias) for alias in aliases]
+
 
 class TableListProcessor:
     @staticmethod
-    def filter(data: List, fields: List[str], filters: Dict[str, Any]) -> List:
+    def filter(
+        data: List,
+        fields: List[str],
+        filters: Dict[str, Any],
+        search_backend: Optional[SearchBackend] = None,
+    ) -> List:
         """
         Apply filtering to a list based on the search[value] request params and
         columns[{field}][search][value] column request params.
+
+        search_backend only applies to querysets, so is ignored.
         """
 
         global_search_value = filters.get("search[value]")
 
         if global_search_value:
+            global_search_value = global_search_value.lower()
             data = [
                 d
                 for d in data
-                if any(
-                    [global_search_value.lower() in str(x).lower() for x in d.values()]
-                )
+                if any(global_search_value in str(x).lower() for x in d.values())
             ]
         else:
             fields_to_search = {}
@@ -104,8 +298,9 @@ class TableListProcessor:
                 data = [
                     d
                     for d in data
-                    for field, value in fields_to_search.items()
-                    if d[field] == value
+                    if all(
+                        d[field] == value for field, value in fields_to_search.items()
+                    )
                 ]
         return data
 
@@ -122,16 +317,25 @@ class TableListProcessor:
                 return v.lower()
             return v
 
+        def get_key(field, descending):
+            # nulls are sorted last in either direction
+            return lambda x: (
+                (x[field] is None) != descending,
+                conditionally_apply_lower(x[field]),
+            )
+
+        orders = []
         for o in range(len(fields)):
             order_index = filters.get(f"order[{o}][column]")
             if order_index is not None:
                 field = fields[int(order_index)]
-                direction = filters.get(f"order[{o}][dir]")
-                data = sorted(
-                    data,
-                    key=lambda x: conditionally_apply_lower(x[field]),
-                    reverse=direction == "desc",
-                )
+                orders.append((field, filters.get(f"order[{o}][dir]") == "desc"))
+
+        # sorts are stable, so sorting by the last order first leaves the first
+        # order taking precedence
+        data = list(data)
+        for field, descending in reversed(orders):
+            data.sort(key=get_key(field, descending), reverse=descending)
 
         return data
 
@@ -139,6 +343,76 @@ class TableListProcessor:
     def count(data: List) -> int:
         return len(data)
 
+    @staticmethod
+    def optimize(data: List, fields: List[str], only: bool) -> List:
+        return data
+
+
+class TableColumnarProcessor:
+    """
+    Processes a DataFrame or ColumnarTable, searching and sorting the columns
+    with vectorised operations.
+    """
+
+    @staticmethod
+    def filter(
+        data: ColumnarData,
+        fields: List[str],
+        filters: Dict[str, Any],
+        search_backend: Optional[SearchBackend] = None,
+    ) -> ColumnarTable:
+        """
+        Apply filtering based on the search[value] request params and
+        columns[{field}][search][value] column request params, the same as
+        TableListProcessor.
+        """
+        table = ColumnarTable.from_data(data)
+        global_search_value = filters.get("search[value]")
+
+        if global_search_value:
+            return table.search(global_search_value)
+
+        fields_to_search = {}
+
+        # Search in individual fields by checking for a request value at index.
+        for o, field in enumerate(fields):
+            field_search_value = filters.get(f"columns[{o}][search][value]")
+            if field_search_value:
+                fields_to_search[field] = field_search_value
+
+        if fields_to_search:
+            return table.filter_equal(fields_to_search)
+
+        return table
+
+    @staticmethod
+    def sort(
+        data: ColumnarData,
+        fields: List[str],
+        filters: Dict[str, Any],
+        force_lower: bool,
+    ) -> ColumnarTable:
+        """
+        Apply ordering based on the order[{field}][column] column request params.
+        """
+        orders = []
+
+        for o in range(len(fields)):
+            order_index = filters.get(f"order[{o}][column]")
+            if order_index is not None:
+                field = fields[int(order_index)]
+                orders.append((field, filters.get(f"order[{o}][dir]") == "desc"))
+
+        return ColumnarTable.from_data(data).sort(orders, force_lower)
+
+    @staticmethod
+    def count(data: ColumnarData) -> int:
+        return len(data)
+
+    @staticmethod
+    def optimize(data: ColumnarData, fields: List[str], only: bool) -> ColumnarData:
+        return data
+
 
 class TableDataProcessorMixin:
     _meta: Type[Any]
@@ -147,6 +421,8 @@ class TableDataProcessorMixin:
     def get_data_processor(cls, data):
         if isinstance(data, QuerySet):
             return TableQuerysetProcessor
+        elif isinstance(data, (pd.DataFrame, ColumnarTable)):
+            return TableColumnarProcessor
         elif isinstance(data, Iterable):
             return TableListProcessor
 
@@ -157,7 +433,9 @@ class TableDataProcessorMixin:
         cls, data: Union[QuerySet, List], filters: Dict[str, Any]
     ) -> Union[List, QuerySet]:
         fields = list(cls._meta.columns)
-        return cls.get_data_processor(data).filter(data, fields, filters)
+        return cls.get_data_processor(data).filter(
+            data, fields, filters, search_backend=cls._meta.search_backend
+        )
 
     @classmethod
     def sort(
@@ -173,10 +451,148 @@ class TableDataProcessorMixin:
     def count(cls, data: Union[QuerySet, List]):
         return cls.get_data_processor(data).count(data)
 
+    @classmethod
+    def optimize(cls, data: Union[QuerySet, List]) -> Union[List, QuerySet]:
+        if not cls._meta.optimize_queryset:
+            return data
+
+        fields = list(cls._meta.columns)
+        # get_absolute_url and value hooks could use fields which aren't displayed
+        only = not cls._meta.first_as_absolute_url and not any(
+            hasattr(cls, f"get_{field}_value") for field in fields
+        )
+        return cls.get_data_processor(data).optimize(data, fields, only)
+
     @staticmethod
     def apply_paginator(
-        data: Union[QuerySet, List], start: int, length: int
+        data: Union[QuerySet, List],
+        start: int,
+        length: int,
+        count: Optional[int] = None,
     ) -> Tuple[Page, int]:
         paginator = Paginator(data, length)
+        if count is not None:
+            # already counted, so the paginator doesn't count again
+            paginator.count = count  # type: ignore
         page_number = (int(start) / int(length)) + 1
         return paginator.get_page(page_number), paginator.count
+
+    @staticmethod
+    def is_filtered(filters: Dict[str, Any]) -> bool:
+        """
+        Whether the filters search the table, if not the filtered count is the total.
+        """
+        return any(
+            value
+            for key, value in (filters or {}).items()
+            if key == "search[value]" or key.endswith("[search][value]")
+        )
+
+    @classmethod
+    def get_table_key(
+        cls,
+        prefix: str,
+        request: Optional[HttpRequest],
+        filters: Dict[str, Any],
+        object: Optional[Any] = None,
+    ) -> str:
+        """
+        Key for data cached about this table, varied by the user and the
+        dashboard object as either can change the rows.
+        """
+        user = getattr(getattr(request, "user", None), "pk", None)
+
+        return make_cache_key(
+            prefix,
+            f"{cls.__module__}.{cls.__qualname__}",
+            getattr(object, "pk", object),
+            user,
+            hash_filters(filters),
+        )
+
+    @classmethod
+    def get_cursor_key(
+        cls,
+        filters: Dict[str, Any],
+        request: Optional[HttpRequest],
+        start: int,
+        object: Optional[Any] = None,
+    ) -> str:
+        filters = {k: v for k, v in (filters or {}).items() if k not in PAGE_FILTERS}
+        return make_cache_key(
+            cls.get_table_key("keyset", request, filters, object), start
+        )
+
+    @classmethod
+    def get_total_count_key(
+        cls,
+        filters: Dict[str, Any],
+        request: Optional[HttpRequest],
+        object: Optional[Any] = None,
+    ) -> str:
+        filters = {
+            k: v
+            for k, v in (filters or {}).items()
+            if k not in PAGE_FILTERS and not k.startswith(TABLE_FILTER_PREFIXES)
+        }
+        return cls.get_table_key("count", request, filters, object)
+
+    @classmethod
+    def apply_keyset_paginator(
+        cls,
+        data: QuerySet,
+        start: int,
+        length: int,
+        filters: Dict[str, Any],
+        request: Optional[HttpRequest] = None,
+        count: Optional[int] = None,
+        object: Optional[Any] = None,
+    ) -> Tuple[List[Any], int]:
+        """
+        Paginate a queryset by seeking past the last row of the previous page
+        rather than using an offset, so deep pages cost the same as the first.
+
+        The position reached by each page is cached, so paging forward or back
+        seeks from the cursor, only jumping to a page not yet reached falls back
+        to an offset.
+        """
+        keyset = TableQuerysetProcessor.keyset(data)
+        if keyset is None:
+            page_obj, count = cls.apply_paginator(data, start, length, count)
+            return list(page_obj.object_list), count
+
+        qs, descending = keyset
+        if count is None:
+            # every page needs the count, whether seeking or falling back to an offset
+            count = data.count()
+
+        cache = get_cache()
+        cursor = (
+            cache.get(cls.get_cursor_key(filters, request, start, object))
+            if start
+            else None
+        )
+
+        object_list = []
+        if start == 0 or cursor is not None:
+            page_qs = qs
+            if cursor is not None:
+                page_qs = TableQuerysetProcessor.seek(qs, cursor, descending)
+
+            object_list = list(page_qs[:length])
+            end = start + len(object_list)
+
+        # no cursor for this page, or past the end of the data in which case
+        # get_page shows the last page
+        if not object_list:
+            page_obj, count = cls.apply_paginator(qs, start, length, count)
+            object_list = list(page_obj.object_list)
+            end = page_obj.start_index() - 1 + len(object_list)
+
+        if object_list:
+            cache.set(
+                cls.get_cursor_key(filters, request, end, object),
+                TableQuerysetProcessor.get_cursor(object_list[-1], len(descending)),
+            )
+
+        return object_list, count
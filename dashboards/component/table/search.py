@@ -0,0 +1,206 @@
+from typing import List, Optional, Type
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import AutoField, BigAutoField, IntegerField, Model, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+
+def quote_name(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def get_columns(model: Type[Model], fields: List[str]) -> List[str]:
+    return [quote_name(model._meta.get_field(field).column) for field in fields]
+
+
+class SearchBackend:
+    """
+    Searches a table's model field columns for the Datatables global search
+    using icontains, the default. No index can serve this so each search scans
+    the table, for large tables use a full text backend.
+    """
+
+    vendor: Optional[str] = None  # database the backend supports, any if None
+
+    def supports(self, qs: QuerySet) -> bool:
+        return self.vendor is None or connections[qs.db].vendor == self.vendor
+
+    def search(self, qs: QuerySet, fields: List[str], value: str) -> QuerySet:
+        """
+        Filters the queryset to rows matching value, backends should fall back to
+        icontains on a database they don't support.
+        """
+        return self.icontains(qs, fields, value)
+
+    def icontains(self, qs: QuerySet, fields: List[str], value: str) -> QuerySet:
+        q_list = Q()
+        for field in fields:
+            q_list |= Q(**{f"{field}__icontains": value})
+
+        return qs.filter(q_list)
+
+    def get_create_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        """
+        SQL creating and populating any index or column the backend searches,
+        and keeping it up to date, for use in a migration.
+        """
+        return []
+
+    def get_drop_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        return []
+
+
+class SQLiteFTSSearch(SearchBackend):
+    """
+    Searches a SQLite FTS5 table indexing the fields, which is kept up to date
+    by triggers on the model's table. Each word searched matches as a prefix,
+    or use tokenize="trigram" to match any part of a word.
+    """
+
+    vendor = "sqlite"
+
+    def __init__(self, table: Optional[str] = None, tokenize: str = "unicode61"):
+        self.table = table
+        self.tokenize = tokenize
+
+    def get_table(self, model: Type[Model]) -> str:
+        return self.table or f"{model._meta.db_table}_fts"
+
+    def get_match(self, value: str) -> str:
+        if self.tokenize == "trigram":
+            return quote_name(value)
+
+        return " ".join(f"{quote_name(word)}*" for word in value.split())
+
+    def search(self, qs: QuerySet, fields: List[str], value: str) -> QuerySet:
+        # trigrams need at least 3 characters to match anything
+        too_short = len(value.strip()) < (3 if self.tokenize == "trigram" else 1)
+        if not self.supports(qs) or too_short:
+            return self.icontains(qs, fields, value)
+
+        table = quote_name(self.get_table(qs.model))
+        return qs.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {table} WHERE {table} MATCH %s",
+                [self.get_match(value)],
+            )
+        )
+
+    def get_create_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        if not isinstance(model._meta.pk, (AutoField, BigAutoField, IntegerField)):
+            raise ImproperlyConfigured(
+                f"{model.__name__} must have an integer primary key to use FTS5."
+            )
+
+        table, fts = model._meta.db_table, self.get_table(model)
+        quoted_table, quoted_fts = quote_name(table), quote_name(fts)
+        pk = quote_name(model._meta.pk.column)
+        columns = get_columns(model, fields)
+        names = ", ".join(columns)
+        new = ", ".join(f"new.{c}" for c in columns)
+        old = ", ".join(f"old.{c}" for c in columns)
+
+        # external content tables are told of deletes with the old values
+        delete = (
+            f"INSERT INTO {quoted_fts}({quoted_fts}, rowid, {names}) "
+            f"VALUES ('delete', old.{pk}, {old});"
+        )
+        insert = f"INSERT INTO {quoted_fts}(rowid, {names}) VALUES (new.{pk}, {new});"
+
+        return [
+            f"CREATE VIRTUAL TABLE {quoted_fts} USING fts5({names}, "
+            f"content='{table}', content_rowid='{model._meta.pk.column}', "
+            f"tokenize='{self.tokenize}')",
+            f"CREATE TRIGGER {quote_name(fts + '_ai')} AFTER INSERT ON {quoted_table} "
+            f"BEGIN {insert} END",
+            f"CREATE TRIGGER {quote_name(fts + '_ad')} AFTER DELETE ON {quoted_table} "
+            f"BEGIN {delete} END",
+            f"CREATE TRIGGER {quote_name(fts + '_au')} AFTER UPDATE ON {quoted_table} "
+            f"BEGIN {delete} {insert} END",
+            f"INSERT INTO {quoted_fts}({quoted_fts}) VALUES ('rebuild')",
+        ]
+
+    def get_drop_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        fts = self.get_table(model)
+        return [
+            *[
+                f"DROP TRIGGER IF EXISTS {quote_name(fts + '_' + suffix)}"
+                for suffix in ["ai", "ad", "au"]
+            ],
+            f"DROP TABLE IF EXISTS {quote_name(fts)}",
+        ]
+
+
+class PostgresSearch(SearchBackend):
+    """
+    Searches using PostgreSQL full text search, against vector_field if set, a
+    SearchVectorField with a GIN index kept up to date by a trigger, otherwise
+    against a search vector of the fields built for each search.
+
+    With trigram=True the fields are searched with trigram word similarity, which
+    requires the pg_trgm extension and django.contrib.postgres installed.
+    """
+
+    vendor = "postgresql"
+
+    def __init__(
+        self,
+        vector_field: Optional[str] = None,
+        config: str = "english",
+        search_type: str = "websearch",
+        trigram: bool = False,
+    ):
+        self.vector_field = vector_field
+        self.config = config
+        self.search_type = search_type
+        self.trigram = trigram
+
+    def search(self, qs: QuerySet, fields: List[str], value: str) -> QuerySet:
+        if not self.supports(qs):
+            return self.icontains(qs, fields, value)
+
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        if self.trigram:
+            q_list = Q()
+            for field in fields:
+                q_list |= Q(**{f"{field}__trigram_word_similar": value})
+
+            return qs.filter(q_list)
+
+        query = SearchQuery(value, config=self.config, search_type=self.search_type)
+        if self.vector_field:
+            return qs.filter(**{self.vector_field: query})
+
+        return qs.annotate(
+            _search_vector=SearchVector(*fields, config=self.config)
+        ).filter(_search_vector=query)
+
+    def get_create_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        if not self.vector_field:
+            raise ImproperlyConfigured(
+                "PostgresSearch needs a vector_field to maintain with a trigger."
+            )
+
+        table = model._meta.db_table
+        column = model._meta.get_field(self.vector_field).column
+        columns = ", ".join(get_columns(model, fields))
+        trigger = quote_name(f"{table}_{column}_update")
+
+        return [
+            f"CREATE TRIGGER {trigger} BEFORE INSERT OR UPDATE ON {quote_name(table)} "
+            f"FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger("
+            f"{quote_name(column)}, 'pg_catalog.{self.config}', {columns})",
+            f"UPDATE {quote_name(table)} SET {quote_name(column)} = "
+            f"to_tsvector('pg_catalog.{self.config}', concat_ws(' ', {columns}))",
+        ]
+
+    def get_drop_sql(self, model: Type[Model], fields: List[str]) -> List[str]:
+        table = model._meta.db_table
+        column = model._meta.get_field(self.vector_field or "").column
+
+        return [
+            f"DROP TRIGGER IF EXISTS {quote_name(f'{table}_{column}_update')} "
+            f"ON {quote_name(table)}"
+        ]
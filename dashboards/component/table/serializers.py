@@ -1,29 +1,40 @@
-from dataclasses import dataclass
-from datetime import datetime
-from functools import reduce
-from typing import Any, Dict, List, Optional, Type
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Type, cast
 
-from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Model, QuerySet
 
 import asset_definitions
 
-from dashboards.log import logger
+from dashboards.cache import get_cache
 from dashboards.meta import ClassWithMeta
 
+from .counts import Count
+from .export import EXPORTERS, iter_chunks
+from .formatters import get_row_formatter
 from .mixins import TableDataProcessorMixin
+from .search import SearchBackend
 
 
 @dataclass
 class SerializedTable:
-    data: List[Dict[str, Any]]
+    data: List[Any]
     columns: Dict[str, Any]
     columns_datatables: List[Dict[str, Any]]
     order: List[Any]
     draw: Optional[int] = 0
     total: Optional[int] = 0
     filtered: Optional[int] = 0
+    compact: bool = False
+
+    def asdict(self) -> Dict[str, Any]:
+        """
+        The table as a dict for rendering, without dataclasses.asdict deep copying
+        every row, which are only ever built for this table.
+        """
+        value = {field.name: getattr(self, field.name) for field in fields(self)}
+        value["columns"] = dict(self.columns)
+        return value
 
 
 class BaseTableSerializer(
@@ -35,6 +46,13 @@ class BaseTableSerializer(
         title: Optional[str] = None
         first_as_absolute_url = False
         force_lower = True
+        keyset_pagination = False
+        optimize_queryset = True
+        count_strategy: Optional[Count] = None
+        count_cache_timeout: Optional[int] = None
+        search_backend: Optional[SearchBackend] = None
+        export_chunk_size = 2000
+        compact = False
 
     @classmethod
     def preprocess_meta(cls, current_class_meta):
@@ -64,7 +82,7 @@ class BaseTableSerializer(
         fields = list(columns)
 
         # how many results do we have before table filtering and paginating
-        initial_count = self.count(data)
+        initial_count = self.get_total_count(data, **serialize_kwargs)
 
         start = 0
         draw = 1
@@ -78,50 +96,46 @@ class BaseTableSerializer(
             draw = int(filters.get("draw", draw))
 
         # apply filtering, sorting and pagination (datatables)
+        data = self.optimize(data=data)
         data = self.filter(data=data, filters=filters)
         data = self.sort(data=data, filters=filters)
         processed_data = []
-        filtered_count = 0
-
-        # do we still have data after filtering, if so paginate and format
-        if self.count(data) > 0:
-            page_obj, filtered_count = self.apply_paginator(data, start, length)
-
-            for obj in page_obj.object_list:
-                values = {}
-                for field in fields:
-                    if not isinstance(obj, dict):
-                        # reduce is used to allow relations to be traversed.
-                        try:
-                            value = reduce(getattr, field.split("__"), obj)
-                        except AttributeError:
-                            logger.warn(f"{field} is not a attribute for this object.")
-                            value = None
-                    else:
-                        value = obj.get(field)
-
-                    if value and isinstance(value, datetime):
-                        value = naturaltime(value)
-
-                    elif isinstance(value, bool):
-                        value = "Yes" if value else "No"
-
-                    elif value is None:
-                        value = "-"
 
-                    if (
-                        field == fields[0]
-                        and self._meta.first_as_absolute_url
-                        and hasattr(obj, "get_absolute_url")
-                    ):
-                        value = f'<a href="{obj.get_absolute_url()}">{value}</a>'
-
-                    if hasattr(self, f"get_{field}_value"):
-                        value = getattr(self, f"get_{field}_value")(obj)
-
-                    values[field] = value
+        # without a search nothing is filtered out, so only count when searching
+        filtered_count = (
+            self.get_count(data) if self.is_filtered(filters) else initial_count
+        )
 
-                processed_data.append(values)
+        # do we still have data after filtering, if so paginate and format
+        if filtered_count > 0:
+            # a cached total may be behind the filtered count
+            length = length if length > 0 else filtered_count
+
+            if self._meta.keyset_pagination and isinstance(data, QuerySet):
+                object_list, filtered_count = self.apply_keyset_paginator(
+                    data,
+                    start,
+                    length,
+                    filters,
+                    serialize_kwargs.get("request"),
+                    count=filtered_count,
+                    object=serialize_kwargs.get("object"),
+                )
+            else:
+                page_obj, filtered_count = self.apply_paginator(
+                    data, start, length, count=filtered_count
+                )
+                object_list = page_obj.object_list
+
+            formatter = get_row_formatter(
+                cast(Hashable, cls), data.model if isinstance(data, QuerySet) else None
+            )
+            processed_data = formatter.format(
+                list(object_list),
+                self,
+                self._meta.first_as_absolute_url,
+                compact=self._meta.compact,
+            )
 
         order = [0, "asc"]
         if hasattr(self._meta, "order"):
@@ -133,14 +147,73 @@ class BaseTableSerializer(
                 for v in self._meta.order
             ]
 
+        # compact rows are lists, so datatables reads each column by its index
+        columns_datatables = [
+            {"data": i if self._meta.compact else d, "title": t}
+            for i, (d, t) in enumerate(columns.items())
+        ]
+
         return SerializedTable(
             data=processed_data,
             columns=columns,
-            columns_datatables=[{"data": d, "title": t} for d, t in columns.items()],
+            columns_datatables=columns_datatables,
             order=order,
             draw=draw,
             total=initial_count,
             filtered=filtered_count,
+            compact=self._meta.compact,
+        )
+
+    @classmethod
+    def export(cls, export_format: str = "csv", **serialize_kwargs) -> Iterator[str]:
+        """
+        Stream every row matching the table's search and sort filters as csv or
+        ndjson, fetching and formatting export_chunk_size rows at a time so memory
+        stays the same however many rows are exported.
+        """
+        if export_format not in EXPORTERS:
+            raise ValueError(f"{export_format} is not a supported export format.")
+
+        self = cls()
+        filters = serialize_kwargs.get("filters", {})
+        data = self.get_data(**serialize_kwargs)
+        data = self.optimize(data=data)
+        data = self.filter(data=data, filters=filters)
+        data = self.sort(data=data, filters=filters)
+
+        formatter = get_row_formatter(
+            cast(Hashable, cls), data.model if isinstance(data, QuerySet) else None
+        )
+        # links are html for the table, so aren't exported
+        chunks = (
+            formatter.format(chunk, self, False)
+            for chunk in iter_chunks(data, self._meta.export_chunk_size)
+        )
+
+        return EXPORTERS[export_format](self._meta.columns, chunks)
+
+    def get_count(self, data: Any) -> int:
+        if self._meta.count_strategy is not None:
+            return self._meta.count_strategy.count(data)
+
+        return self.count(data)
+
+    def get_total_count(self, data: Any, **serialize_kwargs) -> int:
+        """
+        Count the data before it is filtered, cached for count_cache_timeout seconds
+        if set.
+        """
+        if not self._meta.count_cache_timeout:
+            return self.get_count(data)
+
+        return get_cache().get_or_set(
+            self.get_total_count_key(
+                serialize_kwargs.get("filters", {}),
+                serialize_kwargs.get("request"),
+                serialize_kwargs.get("object"),
+            ),
+            lambda: self.get_count(data),
+            self._meta.count_cache_timeout,
         )
 
     def get_data(self, *args, **kwargs):
@@ -162,6 +235,13 @@ class TableSerializer(BaseTableSerializer):
         title: Optional[str] = None
         first_as_absolute_url = False
         force_lower = True
+        keyset_pagination = False
+        optimize_queryset = True
+        count_strategy: Optional[Count] = None
+        count_cache_timeout: Optional[int] = None
+        search_backend: Optional[SearchBackend] = None
+        export_chunk_size = 2000
+        compact = False
         model: Optional[Model] = None
 
     def __init_subclass__(cls, **kwargs):
@@ -1,9 +1,13 @@
+import copy
 from dataclasses import dataclass
-from typing import Callable, Optional, Type, Union
+from typing import Any, Callable, Dict, Iterator, Optional, Type, Union
+
+from django.http import HttpRequest
 
 from dashboards import config
 from dashboards.component import Component
 from dashboards.component.table import SerializedTable, TableSerializer
+from dashboards.utils import cached_reverse
 
 
 @dataclass
@@ -17,7 +21,9 @@ class BasicTable(Component):
     defer: Optional[Union[Callable[..., SerializedTable], Type[TableSerializer]]] = None
 
     def __post_init__(self):
-        default_css_classes = config.Config().DASHBOARDS_COMPONENT_CLASSES["Table"]
+        default_css_classes = copy.copy(
+            config.get_config().DASHBOARDS_COMPONENT_CLASSES["Table"]
+        )
         # make sure css_classes is a dict as this is what form template requires
         if self.css_classes and isinstance(self.css_classes, str):
             # if sting assume this is form class
@@ -29,6 +35,40 @@ class BasicTable(Component):
 
         self.css_classes = default_css_classes
 
+    def get_export_serializer(self) -> Optional[Any]:
+        value_or_defer = self.defer if self.is_deferred and self.defer else self.value
+        return value_or_defer if hasattr(value_or_defer, "export") else None
+
+    def export(
+        self,
+        export_format: str,
+        request: Optional[HttpRequest] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream the table's data as export_format, only tables with a serializer
+        can be exported.
+        """
+        serializer = self.get_export_serializer()
+        if serializer is None:
+            raise ValueError(f"{self.key} has no serializer to export.")
+
+        return serializer.export(
+            export_format, request=request, object=self.object, filters=filters or {}
+        )
+
+    def get_export_url(self, export_format: str = "csv") -> str:
+        if not self.dashboard:
+            raise Exception("Dashboard is not set on Component")
+
+        args = [self.dashboard._meta.app_label, self.dashboard_class, self.key]
+        if self.object:
+            args.insert(2, getattr(self.object, self.dashboard._meta.lookup_field))
+
+        return cached_reverse(
+            "dashboards:dashboard_component_export", args=[*args, export_format]
+        )
+
 
 @dataclass
 class DataTable(BasicTable):
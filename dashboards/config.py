@@ -1,8 +1,15 @@
-from typing import Dict, Optional
+import copy
+from functools import cached_property
+from importlib.util import find_spec
+from typing import Any, Dict, Optional
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 
+from dashboards.log import logger
+
 
 def merge_css_dictionaries(default_css_classes, css_classes):
     # apply overrides to default dict
@@ -18,7 +25,12 @@ def merge_css_dictionaries(default_css_classes, css_classes):
 
 
 class Config:
-    @property
+    """
+    Dashboards settings, resolved from django settings when read. Use get_config
+    for the shared snapshot, where each setting is resolved only once.
+    """
+
+    @cached_property
     def DASHBOARDS_DEFAULT_PERMISSION_CLASSES(cls) -> list[str]:
         return getattr(
             settings,
@@ -26,7 +38,7 @@ class Config:
             ["dashboards.permissions.AllowAny"],
         )
 
-    @property
+    @cached_property
     def DASHBOARDS_DEFAULT_GRID_CSS(cls) -> str:
         return getattr(
             settings,
@@ -34,7 +46,7 @@ class Config:
             "span-6",
         )
 
-    @property
+    @cached_property
     def DASHBOARDS_INCLUDE_DASHBOARD_VIEWS(cls) -> bool:
         return getattr(
             settings,
@@ -42,7 +54,58 @@ class Config:
             True,
         )
 
-    @property
+    @cached_property
+    def DASHBOARDS_CACHE(cls) -> str:
+        return getattr(
+            settings,
+            "DASHBOARDS_CACHE",
+            "default",
+        )
+
+    @cached_property
+    def DASHBOARDS_MAX_WORKERS(cls) -> Optional[int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_MAX_WORKERS",
+            None,
+        )
+
+    @cached_property
+    def DASHBOARDS_ASYNC_VIEWS(cls) -> bool:
+        return getattr(
+            settings,
+            "DASHBOARDS_ASYNC_VIEWS",
+            False,
+        )
+
+    @cached_property
+    def DASHBOARDS_INSTRUMENTATION(cls) -> bool:
+        return getattr(
+            settings,
+            "DASHBOARDS_INSTRUMENTATION",
+            False,
+        )
+
+    @cached_property
+    def DASHBOARDS_EVENT_BACKEND(cls) -> str:
+        return getattr(
+            settings,
+            "DASHBOARDS_EVENT_BACKEND",
+            "dashboards.events.CacheEventBackend",
+        )
+
+    @cached_property
+    def DASHBOARDS_JSON_ENCODER(cls) -> str:
+        # orjson when installed, it is much faster for large charts and tables
+        return getattr(
+            settings,
+            "DASHBOARDS_JSON_ENCODER",
+            "dashboards.encoders.ORJSONEncoder"
+            if find_spec("orjson")
+            else "dashboards.encoders.JSONEncoder",
+        )
+
+    @cached_property
     def DASHBOARDS_COMPONENT_CLASSES(cls) -> Dict[str, Optional[Dict[str, str]]]:
         # default css classes
         FORM_CLASSES = {
@@ -72,13 +135,57 @@ class Config:
         # merge
         return merge_css_dictionaries(default_css_classes, css_classes)
 
-    @property
+    @cached_property
     def DASHBOARDS_LAYOUT_COMPONENT_CLASSES(cls) -> Dict[str, Optional[Dict[str, str]]]:
-        # get the default dict
-        default_css_classes = import_string(
-            "dashboards.component.layout.DEFAULT_LAYOUT_COMPONENT_CLASSES"
+        # get the default dict, copied as it is updated with any overrides
+        default_css_classes = copy.deepcopy(
+            import_string(
+                "dashboards.component.layout.DEFAULT_LAYOUT_COMPONENT_CLASSES"
+            )
         )
         # get any overrides from settings
         css_classes = getattr(settings, "DASHBOARDS_LAYOUT_COMPONENT_CLASSES", None)
         # merge
         return merge_css_dictionaries(default_css_classes, css_classes)
+
+    @cached_property
+    def permission_classes(self) -> list:
+        """
+        DASHBOARDS_DEFAULT_PERMISSION_CLASSES imported.
+        """
+        permission_classes = []
+        for permission_class_path in self.DASHBOARDS_DEFAULT_PERMISSION_CLASSES:
+            try:
+                permission_classes.append(import_string(permission_class_path))
+            except ModuleNotFoundError:  # pragma: no cover
+                logger.warning(f"{permission_class_path} is invalid permissions path")
+
+        return permission_classes
+
+    @cached_property
+    def json_encoder(self) -> Any:
+        """
+        DASHBOARDS_JSON_ENCODER imported & instantiated.
+        """
+        return import_string(self.DASHBOARDS_JSON_ENCODER)()
+
+
+_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    """
+    Returns the shared Config, so settings are read, merged and imported once
+    rather than on every use. This is rebuilt when any setting is changed.
+    """
+    global _config
+    if _config is None:
+        _config = Config()
+
+    return _config
+
+
+@receiver(setting_changed)
+def reset_config(**kwargs):
+    global _config
+    _config = None
@@ -1,29 +1,79 @@
-from typing import Any, ClassVar, Dict, List, Optional
-
+import asyncio
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import Context as ContextVarsContext
+from contextvars import copy_context
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
+
+from django.db import connections
 from django.db.models import Model
 from django.http import HttpRequest
 from django.template import Context
 from django.template.loader import render_to_string
-from django.urls import reverse
-from django.utils.module_loading import import_string
+from django.utils import translation
+from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 
 import asset_definitions
 
 from dashboards.component import Component
+from dashboards.component.base import get_component_media
 from dashboards.component.layout import Card, ComponentLayout
-from dashboards.config import Config
+from dashboards.config import get_config
 from dashboards.log import logger
 from dashboards.meta import ClassWithAppConfigMeta
 from dashboards.permissions import BasePermission
 from dashboards.registry import Registrable
+from dashboards.utils import cached_reverse
+
+
+class ComponentExecutor(ThreadPoolExecutor):
+    """
+    Thread pool rendering components. Each worker thread opens its own db
+    connections, which are reused by every component the worker renders and
+    closed once the pool has shut down.
+    """
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers)
+        self.connections: Dict[int, Any] = {}
+        self.connections_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(self.run_in_worker, fn, *args, **kwargs)
+
+    def run_in_worker(self, fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self.connections_lock:
+                for connection in connections.all():
+                    if connection.connection is not None:
+                        self.connections[id(connection)] = connection
+
+    def shutdown(self, wait: bool = True, **kwargs):
+        super().shutdown(wait=wait, **kwargs)
+        if not wait:
+            return
+
+        # the workers have exited, so their connections are closed from here
+        while self.connections:
+            _, connection = self.connections.popitem()
+            connection.inc_thread_sharing()
+            try:
+                connection.close()
+            finally:
+                connection.dec_thread_sharing()
 
 
 class Dashboard(
     Registrable, ClassWithAppConfigMeta, asset_definitions.MediaDefiningClass
 ):
     components: Dict[str, Any]
+    component_hooks: Dict[str, List[Tuple[str, str]]]
 
     class Meta(ClassWithAppConfigMeta.Meta):
         abstract = True
@@ -32,6 +82,10 @@ class Dashboard(
         template_name: Optional[str] = None
         lookup_kwarg: str = "lookup"  # url parameter name
         lookup_field: str = "pk"  # model field
+        cache_timeout: Optional[int] = None  # seconds to cache component values
+        max_workers: Optional[int] = None  # threads to render components with
+        batch_deferred: bool = False  # fetch deferred components in one request
+        stream: bool = False  # stream components into the page as they render
 
     class Media:
         js = ("dashboards/js/dashboard.js",)
@@ -42,16 +96,24 @@ class Dashboard(
     def __init__(self, *args, **kwargs):
         logger.debug(f"Calling init for {self.class_name()}")
         self.object = None
+        self.rendered_components: Dict[str, str] = {}
+        self.component_values: Dict[str, Any] = {}
+        self.streaming = False
+        self.stream_keys: List[str] = []
+        self.stream_context: Optional[Context] = None
+        # bind the class level components to this dashboard, each a shallow copy so
+        # any per request state is not shared between requests.
+        self.components = {
+            key: self.bind_component(key, component)
+            for key, component in self.__class__.components.items()
+        }
         # set component value/defer to be method calls to get_FOO_value, get_FOO_refer if defined on dashboard
-        for key, component in self.components.items():
-            if hasattr(self, f"get_{key}_value"):
-                logger.debug(f"setting component value to 'get_{key}_value' for {key}")
-                component.value = getattr(self, f"get_{key}_value")
-
-            elif hasattr(self, f"get_{key}_defer"):
-                logger.debug(f"setting component defer to 'get_{key}_defer' for {key}")
-                component.defer = getattr(self, f"get_{key}_defer")
+        for key, hooks in self.component_hooks.items():
+            for attr, method_name in hooks:
+                logger.debug(f"setting component {attr} to '{method_name}' for {key}")
+                setattr(self.components[key], attr, getattr(self, method_name))
 
+        for key, component in self.components.items():
             if (
                 component.value is None
                 and component.defer is None
@@ -82,8 +144,54 @@ class Dashboard(
         ):
             cls.components[k] = v
 
+        # compile the components once, these are treated as specs which are
+        # bound to each dashboard instance rather than changed per request. The
+        # specs are shared with subclasses, so the dashboard is set when bound.
+        cls.component_hooks = {}
+        for key, component in cls.components.items():
+            if not component.key:
+                component.key = key
+            if not component.verbose_name:
+                component.verbose_name = key
+            if not component.render_type:
+                component.render_type = component.__class__.__name__
+
+            cls.component_hooks[key] = cls.get_component_hooks(key)
+
         return super().postprocess_meta(class_meta, resolved_meta_class)
 
+    @classmethod
+    def get_component_hooks(cls, key: str) -> List[Tuple[str, str]]:
+        """
+        Component attributes to be replaced by get_FOO_value, get_FOO_defer,
+        get_FOO_etag & get_FOO_last_modified methods if defined on the dashboard.
+        """
+        hooks = []
+        if hasattr(cls, f"get_{key}_value"):
+            hooks.append(("value", f"get_{key}_value"))
+        elif hasattr(cls, f"get_{key}_defer"):
+            hooks.append(("defer", f"get_{key}_defer"))
+
+        for attr in ["etag", "last_modified"]:
+            if hasattr(cls, f"get_{key}_{attr}"):
+                hooks.append((attr, f"get_{key}_{attr}"))
+
+        return hooks
+
+    @classmethod
+    def bind_component(cls, key: str, component: Component) -> Component:
+        """
+        Returns a copy of the class level component for a single dashboard
+        instance. This is a shallow copy, so is cheap, but anything set on it
+        is not shared with other requests.
+        """
+        bound = copy.copy(component)
+        if not bound.dashboard:
+            bound.dashboard = cls
+        bound.object = None
+        bound.dependent_components = None
+        return bound
+
     class Layout:
         components: Optional[ComponentLayout] = None
 
@@ -104,6 +212,7 @@ class Dashboard(
         awaiting_dependents = {}
         for key, component in self.components.items():
             component.object = self.object
+            # components added to the instance, i.e. in __init__, are not compiled
             if not component.dashboard:
                 component.dashboard = self.__class__
             if not component.key:
@@ -132,15 +241,8 @@ class Dashboard(
         if cls._meta.permission_classes:
             permission_classes = cls._meta.permission_classes
         else:
-            permission_classes = []
-            for permission_class_path in Config().DASHBOARDS_DEFAULT_PERMISSION_CLASSES:
-                try:
-                    permission_class = import_string(permission_class_path)
-                    permission_classes.append(permission_class)
-                except ModuleNotFoundError:  # pragma: no cover
-                    logger.warning(
-                        f"{permission_class_path} is invalid permissions path"
-                    )
+            # imported once from DASHBOARDS_DEFAULT_PERMISSION_CLASSES
+            permission_classes = get_config().permission_classes
 
         return [permission() for permission in permission_classes]
 
@@ -164,14 +266,17 @@ class Dashboard(
     def get_urls(cls):
         from django.urls import path
 
-        from .views import DashboardView
+        from .views import AsyncDashboardView, DashboardView
 
         name = cls.class_name()
+        view_class = (
+            AsyncDashboardView if get_config().DASHBOARDS_ASYNC_VIEWS else DashboardView
+        )
 
         return [
             path(
                 f"{cls._meta.app_label}/{name}/",
-                DashboardView.as_view(dashboard_class=cls),
+                view_class.as_view(dashboard_class=cls),
                 name=cls.get_slug(),
             ),
         ]
@@ -183,7 +288,76 @@ class Dashboard(
 
     @classmethod
     def get_absolute_url(cls):
-        return reverse(f"dashboards:{cls.get_slug()}")
+        return cached_reverse(f"dashboards:{cls.get_slug()}")
+
+    def get_components_url(self, keys: Optional[List[str]] = None) -> str:
+        """
+        Url to fetch multiple deferred components in one request.
+        """
+        # <str:app_label>/<str:dashboard>/
+        args = [self._meta.app_label, self.class_name()]
+
+        # if this is for an object then add lookup param to args
+        if self.object:
+            # <str:app_label>/<str:dashboard>/<str:lookup>/
+            args.append(getattr(self.object, self._meta.lookup_field))
+
+        url = cached_reverse("dashboards:dashboard_components", args=args)
+        if keys:
+            url += f"?{urlencode({'component': keys}, doseq=True)}"
+
+        return url
+
+    def get_events_url(self) -> str:
+        """
+        Url of the event stream updating the dashboard's live components.
+        """
+        # <str:app_label>/<str:dashboard>/
+        args = [self._meta.app_label, self.class_name()]
+
+        # if this is for an object then add lookup param to args
+        if self.object:
+            # <str:app_label>/<str:dashboard>/<str:lookup>/
+            args.append(getattr(self.object, self._meta.lookup_field))
+
+        return cached_reverse("dashboards:dashboard_events", args=args)
+
+    def get_events_channel(self) -> str:
+        """
+        Channel events for the dashboard are published to, per object.
+        """
+        channel = self.get_slug()
+        if self.object:
+            channel += f":{getattr(self.object, self._meta.lookup_field)}"
+
+        return channel
+
+    def render_events_trigger(self) -> str:
+        """
+        Opens a single event stream for the page when any components are live,
+        which all published component updates are sent down.
+        """
+        if not any(c.live for c in self.get_components()):
+            return ""
+
+        return render_to_string(
+            "dashboards/components/events.html",
+            {"events_url": self.get_events_url()},
+        )
+
+    def render_batch_trigger(self) -> str:
+        """
+        Element which fetches all batched deferred components once the dashboard
+        has loaded, each being swapped into place out of band.
+        """
+        keys = [str(c.key) for c in self.get_components() if c.is_batched]
+        if not keys:
+            return ""
+
+        return render_to_string(
+            "dashboards/components/batch_trigger.html",
+            {"components_url": self.get_components_url(keys)},
+        )
 
     def get_context(self, **kwargs) -> dict:
         return kwargs
@@ -191,11 +365,141 @@ class Dashboard(
     def get_media(self) -> asset_definitions.Media:
         # dashboard level media
         media = super().get_media()
-        # add any media defined in components
-        for key, component in self.components.items():
-            media += component.get_media()
+        # components may be added per instance, so cache on the media of each
+        return media + get_components_media(
+            tuple(component.get_media_key() for component in self.components.values())
+        )
+
+    async def aresolve_component_values(self, request: HttpRequest):
+        """
+        Await the values of all non deferred components together, so async value
+        callables run concurrently. These are then used when rendering rather
+        than fetching each value again.
+        """
+        components = [c for c in self.get_components() if not c.is_deferred]
+        values = await asyncio.gather(
+            *[
+                component.aget_value(
+                    request=request, filters=component.get_filters(request)
+                )
+                for component in components
+            ]
+        )
 
-        return media
+        self.component_values.update(
+            (str(component.key), value) for component, value in zip(components, values)
+        )
+
+    def get_max_workers(self) -> Optional[int]:
+        if self._meta.max_workers is not None:
+            return self._meta.max_workers
+
+        return get_config().DASHBOARDS_MAX_WORKERS
+
+    def render_components_parallel(self, keys: List[str], context: Context):
+        """
+        Render any non deferred components concurrently on a thread pool, so I/O
+        bound components cost the slowest rather than the sum of them all. The
+        layout then assembles the html from rendered_components in order.
+        """
+        max_workers = self.get_max_workers()
+        if not max_workers or max_workers < 2:
+            return
+
+        # set required attributes on each component
+        self.get_components()
+        keys = [
+            key
+            for key in dict.fromkeys(keys)
+            if key in self.components and not self.components[key].is_deferred
+        ]
+
+        if len(keys) < 2:
+            return
+
+        language = translation.get_language()
+        # each thread runs in a copy of the context vars, i.e. instrumentation
+        run_contexts = [copy_context() for _ in keys]
+
+        def render_component(run_context: ContextVarsContext, key: str) -> str:
+            return run_context.run(
+                self.render_component_in_thread, key, context, language
+            )
+
+        with ComponentExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            self.rendered_components.update(
+                zip(keys, executor.map(render_component, run_contexts, keys))
+            )
+
+    def render_component_in_thread(
+        self, key: str, context: Context, language: Optional[str]
+    ) -> str:
+        with translation.override(language):
+            return self.components[key].render(context=context)
+
+    def prepare_stream(self, keys: List[str], context: Context):
+        """
+        Render a placeholder for each non deferred component, the components
+        are then rendered by stream_components once the page has been sent.
+        """
+        # set required attributes on each component
+        self.get_components()
+        self.stream_keys = [
+            key
+            for key in dict.fromkeys(keys)
+            if key in self.components and not self.components[key].is_deferred
+        ]
+        self.stream_context = context
+
+        for key in self.stream_keys:
+            component = self.components[key]
+            self.rendered_components[key] = render_to_string(
+                "dashboards/components/stream_placeholder.html",
+                {
+                    "template_id": component.template_id,
+                    "defer_loading_template_name": component.defer_loading_template_name,
+                },
+            )
+
+    def stream_components(self) -> Iterator[str]:
+        """
+        Yields the html of each streamed component as soon as it has rendered,
+        which is swapped in place of its placeholder. When max_workers is set
+        these are rendered concurrently and yielded in the order they complete.
+        """
+        keys, context = self.stream_keys, self.stream_context
+        if not keys or context is None:
+            return
+
+        def render_streamed(key: str, html: str) -> str:
+            return render_to_string(
+                "dashboards/components/streamed.html",
+                {
+                    "template_id": self.components[key].template_id,
+                    "html": mark_safe(html),
+                },
+            )
+
+        max_workers = self.get_max_workers()
+        if not max_workers or max_workers < 2 or len(keys) < 2:
+            for key in keys:
+                yield render_streamed(key, self.components[key].render(context=context))
+            return
+
+        language = translation.get_language()
+        with ComponentExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            futures = {
+                executor.submit(
+                    copy_context().run,
+                    self.render_component_in_thread,
+                    key,
+                    context,
+                    language,
+                ): key
+                for key in keys
+            }
+            for future in as_completed(futures):
+                yield render_streamed(futures[future], future.result())
 
     def render(self, request: HttpRequest, template_name=None):
         """
@@ -205,7 +509,10 @@ class Dashboard(
         - else render a generic layout by wrapping all components.
         """
         context = self.get_context(
-            request=request, media=self.get_media(), call_deferred=False
+            request=request,
+            media=self.get_media(),
+            call_deferred=False,
+            component_values=self.component_values,
         )
 
         layout = self.Layout()
@@ -216,7 +523,11 @@ class Dashboard(
             self.get_components()
             # add dashboard to the context so it's available for the template
             context["dashboard"] = self
-            return mark_safe(render_to_string(template_name, context))
+            return mark_safe(
+                render_to_string(template_name, context)
+                + self.render_batch_trigger()
+                + self.render_events_trigger()
+            )
 
         # No layout, so create default one, copying any LayoutOptions elements from the component to the card
         # TODO Card as the default should be an option
@@ -233,12 +544,39 @@ class Dashboard(
                 *[Card(k, **_get_layout(c)) for k, c in self.components.items()]
             )
 
-        return layout.components.render(dashboard=self, context=Context(context))
+        context = Context(context)
+        if self.streaming:
+            self.prepare_stream(layout.components.get_component_keys(), context)
+        else:
+            self.render_components_parallel(
+                layout.components.get_component_keys(), context
+            )
+
+        return mark_safe(
+            layout.components.render(dashboard=self, context=context)
+            + self.render_batch_trigger()
+            + self.render_events_trigger()
+        )
 
     def __str__(self):
         return self._meta.name
 
 
+@lru_cache(maxsize=None)
+def get_components_media(
+    component_media_keys: Tuple[Tuple[type, Any], ...]
+) -> asset_definitions.Media:
+    """
+    Media for a dashboard's components, cached so this is only assembled once
+    for each dashboard class rather than every render.
+    """
+    media = asset_definitions.Media()
+    for component_media_key in component_media_keys:
+        media += get_component_media(*component_media_key)
+
+    return media
+
+
 class ModelDashboard(Dashboard):
     object: Model
 
@@ -259,9 +597,8 @@ class ModelDashboard(Dashboard):
         return self._meta.model.objects.all()
 
     def get_absolute_url(self):
-        return reverse(
-            f"dashboards:{self.get_slug()}_detail",
-            kwargs={self._meta.lookup_kwarg: self.object.pk},
+        return cached_reverse(
+            f"dashboards:{self.get_slug()}_detail", args=(self.object.pk,)
         )
 
     def get_object(self, **kwargs):
@@ -281,14 +618,17 @@ class ModelDashboard(Dashboard):
     def get_urls(cls):
         from django.urls import path
 
-        from .views import DashboardView
+        from .views import AsyncDashboardView, DashboardView
 
         name = cls.class_name()
+        view_class = (
+            AsyncDashboardView if get_config().DASHBOARDS_ASYNC_VIEWS else DashboardView
+        )
 
         return [
             path(
                 f"{cls._meta.app_label}/{name}/<str:{cls._meta.lookup_kwarg}>/",
-                DashboardView.as_view(dashboard_class=cls),
+                view_class.as_view(dashboard_class=cls),
                 name=f"{cls.get_slug()}_detail",
             ),
         ]
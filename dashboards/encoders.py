@@ -0,0 +1,104 @@
+import json
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+import numpy as np
+import pandas as pd
+
+from dashboards import config
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def encode_default(o: Any) -> Any:
+    """
+    Converts values json can't encode itself, dataclasses are converted one
+    level at a time as they are encoded, rather than copied up front by asdict.
+    """
+    if is_dataclass(o) and not isinstance(o, type):
+        return {f.name: getattr(o, f.name) for f in fields(o)}
+    elif isinstance(o, (pd.Series, pd.Index)):
+        return encode_default(o.to_numpy())
+    elif isinstance(o, np.ndarray):
+        if o.dtype.kind == "M":
+            # datetimes as iso strings rather than integers, with NaT as null
+            o = o.astype("datetime64[us]").astype(object)
+        elif o.dtype.kind in "fO":
+            missing = pd.isna(o)
+            if missing.any():
+                # NaN as null, which needs an object array to hold None
+                o = o.astype(object)
+                o[missing] = None
+        return o.tolist()
+    elif isinstance(o, pd.Timestamp):
+        return o.to_pydatetime()
+    elif isinstance(o, np.generic):
+        return o.item()
+    elif isinstance(o, Enum):
+        return o.value
+    elif isinstance(o, QuerySet):
+        return list(o)
+
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+class DashboardsJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return encode_default(o)
+        except TypeError:
+            return super().default(o)
+
+
+class JSONEncoder:
+    """
+    Encodes component values & charts with the standard library json.
+    """
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, cls=DashboardsJSONEncoder)
+
+    def dumpb(self, value: Any) -> bytes:
+        return self.dumps(value).encode()
+
+
+class ORJSONEncoder(JSONEncoder):
+    """
+    Encodes with orjson, which is much faster than the standard library for
+    large values. Datetimes and arrays are passed to the same default as
+    JSONEncoder, so the output is the same whichever is used.
+    """
+
+    option = (
+        (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    )
+
+    def dumps(self, value: Any) -> str:
+        return self.dumpb(value).decode()
+
+    def dumpb(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=self.default, option=self.option)
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        try:
+            return encode_default(o)
+        except TypeError:
+            # datetimes, decimals, lazy strings etc. as django encodes them
+            return DjangoJSONEncoder().default(o)
+
+
+def dumps(value: Any) -> str:
+    return config.get_config().json_encoder.dumps(value)
+
+
+def dumpb(value: Any) -> bytes:
+    return config.get_config().json_encoder.dumpb(value)
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, List, Optional, Type
+
+from django.http import HttpRequest
+from django.template import Context
+from django.utils.module_loading import import_string
+
+from dashboards import config, encoders
+from dashboards.cache import get_cache, make_cache_key
+
+
+if TYPE_CHECKING:
+    from dashboards.dashboard import Dashboard
+
+
+@dataclass
+class Event:
+    id: int
+    event: str
+    data: str
+
+    def encode(self) -> str:
+        """
+        Encodes the event in the text/event-stream format.
+        """
+        lines = [f"id: {self.id}", f"event: {self.event}"]
+        lines += [f"data: {line}" for line in self.data.splitlines() or [""]]
+        return "\n".join(lines) + "\n\n"
+
+
+class BaseEventBackend:
+    """
+    Stores events published to a dashboard's channel, which are read by the
+    EventsView and sent to every page displaying that dashboard.
+    """
+
+    poll_interval: float = 1  # seconds between checking for new events
+    stream_timeout: float = 60  # seconds before the client is asked to reconnect
+    keepalive: float = 15  # seconds between keepalive comments on an idle stream
+
+    def publish(self, channel: str, event: str, data: str) -> int:
+        raise NotImplementedError
+
+    def get_last_id(self, channel: str) -> int:
+        raise NotImplementedError
+
+    def get_events(self, channel: str, after: int) -> List[Event]:
+        raise NotImplementedError
+
+
+class CacheEventBackend(BaseEventBackend):
+    """
+    Keeps recent events in the dashboards cache, so events published from any
+    process are seen by every EventsView sharing the cache.
+    """
+
+    timeout: int = 60 * 5  # seconds each event is kept for
+    max_events: int = 100  # most events sent to a client catching up
+
+    def get_id_key(self, channel: str) -> str:
+        return make_cache_key("events", channel)
+
+    def get_event_key(self, channel: str, event_id: int) -> str:
+        return make_cache_key("events", channel, event_id)
+
+    def publish(self, channel: str, event: str, data: str) -> int:
+        cache = get_cache()
+        id_key = self.get_id_key(channel)
+        cache.add(id_key, 0, None)
+        event_id = cache.incr(id_key)
+        cache.set(self.get_event_key(channel, event_id), (event, data), self.timeout)
+
+        return event_id
+
+    def get_last_id(self, channel: str) -> int:
+        return get_cache().get(self.get_id_key(channel), 0)
+
+    def get_events(self, channel: str, after: int) -> List[Event]:
+        last_id = self.get_last_id(channel)
+        if last_id <= after:
+            return []
+
+        ids = range(max(after, last_id - self.max_events) + 1, last_id + 1)
+        found = get_cache().get_many(
+            [self.get_event_key(channel, event_id) for event_id in ids]
+        )
+
+        events = []
+        for event_id in ids:
+            key = self.get_event_key(channel, event_id)
+            if key in found:
+                event, data = found[key]
+                events.append(Event(id=event_id, event=event, data=data))
+
+        return events
+
+
+def get_event_backend() -> BaseEventBackend:
+    return import_string(config.get_config().DASHBOARDS_EVENT_BACKEND)()
+
+
+def publish_component(
+    dashboard_class: Type["Dashboard"],
+    key: str,
+    object: Optional[Any] = None,
+    request: Optional[HttpRequest] = None,
+) -> int:
+    """
+    Renders the component and pushes the html to every page displaying the
+    dashboard (for object if provided), replacing the component in place.
+    """
+    dashboard = dashboard_class(object=object)
+    component = {c.key: c for c in dashboard.get_components()}[key]
+    html = component.render(
+        context=Context({"request": request}), htmx=False, call_deferred=True
+    )
+
+    return get_event_backend().publish(
+        dashboard.get_events_channel(),
+        "component",
+        encoders.dumps(
+            {"target": f"component-{component.template_id}-inner", "html": html}
+        ),
+    )
+
+
+def publish_value(
+    dashboard_class: Type["Dashboard"],
+    key: str,
+    value: Any,
+    object: Optional[Any] = None,
+) -> int:
+    """
+    Pushes a json value to every page displaying the dashboard (for object if
+    provided), dispatched as a dashboards:value event on the component.
+    """
+    dashboard = dashboard_class(object=object)
+    component = {c.key: c for c in dashboard.get_components()}[key]
+
+    return get_event_backend().publish(
+        dashboard.get_events_channel(),
+        "component",
+        encoders.dumps(
+            {"target": f"component-{component.template_id}-inner", "value": value}
+        ),
+    )
@@ -0,0 +1,124 @@
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, ContextManager, Iterator, List, Optional
+
+from django.db import connections
+from django.dispatch import Signal
+from django.http import HttpRequest, HttpResponse
+
+from dashboards import config
+
+
+# sent with the request and the list of Timing recorded when instrumentation is enabled
+timings_recorded = Signal()
+
+# timings for the current request, None when not recording
+_timings: ContextVar[Optional[List["Timing"]]] = ContextVar(
+    "dashboards_timings", default=None
+)
+
+
+@dataclass
+class Timing:
+    name: str  # component key, or layout
+    stage: str  # value, serialize, render or layout
+    duration: float = 0  # ms
+    queries: int = 0
+    query_duration: float = 0  # ms
+    cache: Optional[str] = None  # hit or miss, when the value is cached
+
+    def get_server_timing(self) -> str:
+        description = f"queries={self.queries} query_dur={self.query_duration:.2f}"
+        if self.cache:
+            description += f" cache={self.cache}"
+
+        return f'{self.name}.{self.stage};dur={self.duration:.2f};desc="{description}"'
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries run and their time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += (time.perf_counter() - start) * 1000
+
+
+@contextmanager
+def record_timings() -> Iterator[Optional[List[Timing]]]:
+    """
+    Records the timings of anything instrumented within, yielding the list of
+    timings or None when DASHBOARDS_INSTRUMENTATION is disabled.
+    """
+    if not config.get_config().DASHBOARDS_INSTRUMENTATION:
+        yield None
+        return
+
+    timings: List[Timing] = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def instrument(name: Any, stage: str) -> ContextManager[Optional[Timing]]:
+    """
+    Times the block when recording, yielding the Timing so more detail can be
+    added, otherwise this is a no-op yielding None.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return nullcontext()
+
+    return _instrument(str(name), stage, timings)
+
+
+@contextmanager
+def _instrument(name: str, stage: str, timings: List[Timing]) -> Iterator[Timing]:
+    timing = Timing(name=name, stage=stage)
+    counter = QueryCounter()
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.duration = (time.perf_counter() - start) * 1000
+            timing.queries = counter.queries
+            timing.query_duration = counter.duration
+            timings.append(timing)
+
+
+def finish_timings(
+    sender: Any, request: HttpRequest, response: HttpResponse, timings: List[Timing]
+) -> HttpResponse:
+    """
+    Renders the response, so the dashboard/component rendering is included,
+    then adds the Server-Timing header and sends timings_recorded.
+    """
+    if callable(getattr(response, "render", None)) and not getattr(
+        response, "is_rendered", True
+    ):
+        response.render()  # type: ignore
+
+    if timings:
+        response["Server-Timing"] = ", ".join(t.get_server_timing() for t in timings)
+
+    timings_recorded.send(sender=sender, request=request, timings=timings)
+
+    return response
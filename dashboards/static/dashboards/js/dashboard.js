@@ -15,6 +15,95 @@ const setAppearance = (mode) => {
     console.log(document.cookie)
 }
 
+// polled components send the ETag of their last response, if unchanged the
+// server responds with a 304 which is not swapped in.
+document.addEventListener("htmx:configRequest", (event) => {
+    const etag = event.detail.elt.dataset.etag
+    if (etag) {
+        event.detail.headers["If-None-Match"] = etag
+    }
+})
+
+document.addEventListener("htmx:beforeSwap", (event) => {
+    const xhr = event.detail.xhr
+    if (xhr.status === 304) {
+        event.detail.shouldSwap = false
+        return
+    }
+
+    const etag = xhr.getResponseHeader("ETag")
+    if (etag && event.detail.elt.hasAttribute("data-conditional")) {
+        event.detail.elt.dataset.etag = etag
+    }
+})
+
+// streamed components arrive in a template after the page, replace the
+// placeholder with them, importing the nodes so any scripts are run.
+const swapStreamed = (id) => {
+    const template = document.getElementById(`${id}-streamed`)
+    const placeholder = document.getElementById(`${id}-inner`)
+    if (!template || !placeholder) {
+        return
+    }
+
+    swapFragment(placeholder, document.importNode(template.content, true))
+    template.remove()
+}
+
+const swapFragment = (element, fragment) => {
+    const elements = Array.from(fragment.children)
+    element.replaceWith(fragment)
+
+    if (window.htmx) {
+        elements.forEach((child) => htmx.process(child))
+    }
+}
+
+// a single event stream per page, published components are swapped into
+// place and published values are dispatched as a dashboards:value event.
+const eventSources = {}
+
+const connectEvents = (url) => {
+    if (eventSources[url]) {
+        return
+    }
+
+    const source = new EventSource(url)
+    source.addEventListener("component", (event) => {
+        const data = JSON.parse(event.data)
+        const element = document.getElementById(data.target)
+        if (!element) {
+            return
+        }
+
+        if (data.html !== undefined) {
+            // unlike innerHTML, scripts in a contextual fragment are run
+            swapFragment(element, document.createRange().createContextualFragment(data.html))
+        } else {
+            element.dispatchEvent(
+                new CustomEvent("dashboards:value", {detail: data.value, bubbles: true})
+            )
+        }
+    })
+    eventSources[url] = source
+}
+
+// charts are drawn from their figure object, published chart values redraw
+// the chart in place.
+const renderChart = (id, figure, config) => {
+    Plotly.newPlot(id, figure.data || [], figure.layout, config)
+}
+
+document.addEventListener("dashboards:value", (event) => {
+    const chart = event.target.querySelector(".js-plotly-plot")
+    if (chart && event.detail && event.detail.layout) {
+        Plotly.react(chart, event.detail.data || [], event.detail.layout)
+    }
+})
+
 const Dashboard = {
     setAppearance,
+    swapStreamed,
+    connectEvents,
+    renderChart,
 }
\ No newline at end of file
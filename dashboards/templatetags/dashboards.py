@@ -3,8 +3,10 @@ from typing import Dict, List, Type, Union, cast
 
 from django import template
 from django.template import RequestContext
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 
+from dashboards import encoders
 from dashboards.component import Component
 from dashboards.dashboard import Dashboard
 from dashboards.menus.menu import DashboardMenuItem, Menu, MenuItem
@@ -52,6 +54,23 @@ def lookup(value, arg):
     return value.get(arg)
 
 
+@register.filter()
+def json_value(value):
+    """
+    A value as json for a script, escaped the same as json_script. Strings are
+    taken to already be json.
+    """
+    if not isinstance(value, str):
+        value = (
+            encoders.dumps(value)
+            .replace("<", "\\u003C")
+            .replace(">", "\\u003E")
+            .replace("&", "\\u0026")
+        )
+
+    return mark_safe(value)
+
+
 @register.filter
 def cta_href(cta, obj):
     return cta.get_href(obj=obj)
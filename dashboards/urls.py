@@ -12,12 +12,33 @@ MODEL_DASHBOARD_PATTERN = DASHBOARD_PATTERN + "<str:lookup>/"
 COMPONENT_PATTERN = DASHBOARD_PATTERN + "@component/<slug:component>/"
 COMPONENT_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "@component/<slug:component>/"
 
+EXPORT_PATTERN = COMPONENT_PATTERN + "@export/<str:export_format>/"
+EXPORT_OBJECT_PATTERN = COMPONENT_OBJECT_PATTERN + "@export/<str:export_format>/"
+
+COMPONENTS_PATTERN = DASHBOARD_PATTERN + "@components/"
+COMPONENTS_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "@components/"
+
+EVENTS_PATTERN = DASHBOARD_PATTERN + "@events/"
+EVENTS_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "@events/"
+
 FORM_COMPONENT_PATTERN = DASHBOARD_PATTERN + "<slug:component>/@form/"
 FORM_COMPONENT_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "<slug:component>/@form/"
 
+component_view = (
+    views.AsyncComponentView
+    if config.get_config().DASHBOARDS_ASYNC_VIEWS
+    else views.ComponentView
+)
+
+events_view = (
+    views.AsyncEventsView
+    if config.get_config().DASHBOARDS_ASYNC_VIEWS
+    else views.EventsView
+)
+
 urlpatterns = []
 
-if config.Config().DASHBOARDS_INCLUDE_DASHBOARD_VIEWS:
+if config.get_config().DASHBOARDS_INCLUDE_DASHBOARD_VIEWS:
     urlpatterns += [
         path("", include(registry.urls)),
     ]
@@ -25,14 +46,44 @@ if config.Config().DASHBOARDS_INCLUDE_DASHBOARD_VIEWS:
 urlpatterns += [
     path(
         COMPONENT_PATTERN,
-        views.ComponentView.as_view(),
+        component_view.as_view(),
         name="dashboard_component",
     ),
     path(
         COMPONENT_OBJECT_PATTERN,
-        views.ComponentView.as_view(),
+        component_view.as_view(),
         name="dashboard_component",
     ),
+    path(
+        EXPORT_PATTERN,
+        views.ExportComponentView.as_view(),
+        name="dashboard_component_export",
+    ),
+    path(
+        EXPORT_OBJECT_PATTERN,
+        views.ExportComponentView.as_view(),
+        name="dashboard_component_export",
+    ),
+    path(
+        COMPONENTS_PATTERN,
+        views.ComponentsView.as_view(),
+        name="dashboard_components",
+    ),
+    path(
+        COMPONENTS_OBJECT_PATTERN,
+        views.ComponentsView.as_view(),
+        name="dashboard_components",
+    ),
+    path(
+        EVENTS_PATTERN,
+        events_view.as_view(),
+        name="dashboard_events",
+    ),
+    path(
+        EVENTS_OBJECT_PATTERN,
+        events_view.as_view(),
+        name="dashboard_events",
+    ),
     path(
         FORM_COMPONENT_PATTERN,
         views.FormComponentView.as_view(),
@@ -1,3 +1,13 @@
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils import translation
+from django.utils.module_loading import import_string
+from django.utils.text import slugify
+
 from dashboards.exceptions import DashboardNotFoundError
 from dashboards.registry import registry
 
@@ -11,3 +21,44 @@ def get_dashboard_class(app_label: str, dashboard_class: str):
         )
 
     return dashboard
+
+
+@lru_cache(maxsize=2048)
+def _reverse(
+    viewname: str,
+    args: tuple,
+    urlconf: Optional[str],
+    script_prefix: str,
+    language: Optional[str],
+) -> str:
+    return reverse(viewname, args=args, urlconf=urlconf)
+
+
+def cached_reverse(viewname: str, args: Optional[Sequence[Any]] = None) -> str:
+    """
+    reverse, memoised per url conf, script prefix and language (for i18n_patterns),
+    as component and dashboard urls are reversed many times for each render.
+    """
+    return _reverse(
+        viewname,
+        tuple(str(arg) for arg in args or ()),
+        get_urlconf(),
+        get_script_prefix(),
+        translation.get_language(),
+    )
+
+
+@lru_cache(maxsize=2048)
+def cached_slugify(value: str) -> str:
+    return slugify(value)
+
+
+@lru_cache(maxsize=256)
+def cached_import_string(dotted_path: str) -> Any:
+    return import_string(dotted_path)
+
+
+@receiver(setting_changed)
+def clear_url_caches(*, setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        _reverse.cache_clear()
@@ -1,16 +1,36 @@
-import json
-from typing import TYPE_CHECKING, Callable, Dict, Optional, Protocol, Type
+import asyncio
+import time
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Type,
+)
 
 from django.core.exceptions import PermissionDenied
-from django.core.serializers.json import DjangoJSONEncoder
-from django.http import Http404, HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.utils.http import http_date, quote_etag
 from django.views import View
 from django.views.generic import TemplateView
 
+from asgiref.sync import sync_to_async
 from typing_extensions import TypeAlias
 
+from dashboards import encoders
+from dashboards.cache import get_cache
+from dashboards.component import Component
+from dashboards.component.table import BasicTable
+from dashboards.component.table.export import EXPORT_CONTENT_TYPES
 from dashboards.dashboard import Dashboard
+from dashboards.events import BaseEventBackend, Event, get_event_backend
 from dashboards.exceptions import DashboardNotFoundError
+from dashboards.instrumentation import finish_timings, record_timings
 from dashboards.utils import get_dashboard_class
 
 
@@ -35,7 +55,13 @@ class DashboardObjectMixin(mixin_class):
     def is_htmx(self):
         return self.request.headers.get("hx-request") == "true"
 
-    def dispatch(self: TemplateView, request, *args, **kwargs):
+    def check_dashboard_permissions(
+        self: TemplateView, request
+    ) -> Optional[HttpResponse]:
+        """
+        Resolves the dashboard class & checks the request has permission to view it,
+        returning the response of a permission's handle_no_permission if not.
+        """
         if not self.dashboard_class:
             try:
                 self.dashboard_class = get_dashboard_class(
@@ -52,7 +78,18 @@ class DashboardObjectMixin(mixin_class):
         elif not has_perm:
             raise PermissionDenied()
 
-        return super().dispatch(request, *args, **kwargs)
+        return None
+
+    def dispatch(self: TemplateView, request, *args, **kwargs):
+        with record_timings() as timings:
+            response = self.check_dashboard_permissions(request)
+            if response is None:
+                response = super().dispatch(request, *args, **kwargs)
+
+            if timings is not None:
+                response = finish_timings(self.__class__, request, response, timings)
+
+        return response
 
     def get_dashboard_context(self, **context):
         """kwargs passed to dashboard class"""
@@ -75,6 +112,28 @@ class DashboardObjectMixin(mixin_class):
         return self.dashboard_class(**context)
 
 
+class AsyncDashboardObjectMixin(DashboardObjectMixin):
+    """
+    Runs the permission checks in a thread, as they may hit the database,
+    before dispatching to the async handlers. Requires Django 4.1+.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        with record_timings() as timings:
+            response = await sync_to_async(self.check_dashboard_permissions)(request)
+            if response is None:
+                response = await super(DashboardObjectMixin, self).dispatch(
+                    request, *args, **kwargs
+                )
+
+            if timings is not None:
+                response = await sync_to_async(finish_timings)(
+                    self.__class__, request, response, timings
+                )
+
+        return response
+
+
 class DashboardView(DashboardObjectMixin, TemplateView):
     """
     Dashboard view, allows a single Dashboard to be auto rendered.
@@ -86,8 +145,38 @@ class DashboardView(DashboardObjectMixin, TemplateView):
     def get(self, request, *args, **kwargs):
         dashboard = self.get_dashboard(request=request)
         context = self.get_context_data(**{"dashboard": dashboard})
+
+        if self.is_streaming(dashboard):
+            return self.render_to_streaming_response(dashboard, context)
+
         return self.render_to_response(context)
 
+    def is_streaming(self, dashboard: Dashboard) -> bool:
+        return dashboard._meta.stream and not self.is_htmx()
+
+    def render_to_streaming_response(
+        self, dashboard: Dashboard, context: Dict
+    ) -> StreamingHttpResponse:
+        """
+        Sends the page with placeholders for the non deferred components first,
+        then each component as it renders, before closing the page.
+        """
+        dashboard.streaming = True
+        response = self.render_to_response(context)
+        html = response.rendered_content
+        head, body_end, tail = html.rpartition("</body>")
+        if not body_end:
+            head, tail = html, ""
+
+        def stream():
+            yield head
+            yield from dashboard.stream_components()
+            yield body_end + tail
+
+        return StreamingHttpResponse(
+            stream(), content_type=response.headers["Content-Type"]
+        )
+
     def get_template_names(self):
         if self.is_htmx():  # a certain check
             return [self.partial_template_name]
@@ -103,21 +192,29 @@ class ComponentView(DashboardObjectMixin, TemplateView):
     template_name: str = "dashboards/components/partial.html"
 
     def get(self, request: HttpRequest, *args, **kwargs):
+        if not self.is_ajax():
+            html = self.get_cached_partial(request)
+            if html is not None:
+                return self.get_conditional_response(request, HttpResponse(html))
+
         dashboard = self.get_dashboard(request=request)
         component = self.get_partial_component(dashboard)
+        filters = component.get_filters(request)
 
-        if self.is_ajax() and component:
-            filters = (
-                request.GET.dict() if request.method == "GET" else request.POST.dict()
-            )
+        # explicit validators let unchanged components respond before fetching the value
+        etag = component.get_etag(request=request, filters=filters)
+        last_modified = component.get_last_modified(request=request, filters=filters)
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
 
+        if self.is_ajax() and component:
             # Return json, calling the deferred value.
-            return HttpResponse(
-                json.dumps(
+            response = HttpResponse(
+                encoders.dumpb(
                     component.get_value(
                         request=self.request, call_deferred=True, filters=filters
-                    ),
-                    cls=DjangoJSONEncoder,
+                    )
                 ),
                 content_type="application/json",
             )
@@ -125,8 +222,59 @@ class ComponentView(DashboardObjectMixin, TemplateView):
             context = self.get_context_data(
                 **{"component": component, "dashboard": dashboard}
             )
+            response = self.render_to_response(context)
+            self.set_cached_partial(request, component, response)
+
+        return self.get_conditional_response(
+            request, response, etag=etag, last_modified=last_modified
+        )
+
+    def get_not_modified_response(
+        self,
+        request: HttpRequest,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+    ) -> Optional[HttpResponse]:
+        if request.method not in ("GET", "HEAD") or not (etag or last_modified):
+            return None
+
+        return get_conditional_response(
+            request,
+            etag=quote_etag(etag) if etag else None,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
 
-            return self.render_to_response(context)
+    def get_conditional_response(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+    ) -> HttpResponse:
+        """
+        Set the ETag & Last-Modified headers, responding with a 304 if the
+        component is unchanged since the client last fetched it. Without an
+        explicit etag, a hash of the content is used.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return response
+
+        if etag:
+            response.headers["ETag"] = quote_etag(etag)
+        else:
+            if hasattr(response, "render"):
+                response.render()
+            set_response_etag(response)
+
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+        return get_conditional_response(
+            request,
+            etag=response.headers.get("ETag"),
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+            response=response,
+        )
 
     def post(self, *args, **kwargs):
         """
@@ -134,6 +282,53 @@ class ComponentView(DashboardObjectMixin, TemplateView):
         """
         return self.get(*args, **kwargs)
 
+    def get_partial_cache_key(self, request: HttpRequest, component) -> Optional[str]:
+        """
+        Key for the rendered partial, or None when the component has not opted
+        in to caching its rendered html.
+        """
+        if not self.dashboard_class:
+            raise Exception("Dashboard class not set on view")
+
+        if not component.cache_rendered or not component.get_cache_timeout():
+            return None
+
+        return component.get_render_cache_key(
+            request,
+            "partial",
+            lookup=self.kwargs.get(self.dashboard_class._meta.lookup_kwarg),
+        )
+
+    def get_cached_partial(self, request: HttpRequest) -> Optional[str]:
+        """
+        Serve the rendered partial from the cache without building the dashboard,
+        using the class level component bound to this view's dashboard class.
+        """
+        if not self.dashboard_class:
+            raise Exception("Dashboard class not set on view")
+
+        key = self.kwargs["component"]
+        spec = self.dashboard_class.components.get(key)
+        if not spec or not spec.key:
+            return None
+
+        component = self.dashboard_class.bind_component(key, spec)
+        cache_key = self.get_partial_cache_key(request, component)
+        if not cache_key:
+            return None
+
+        return get_cache().get(cache_key)
+
+    def set_cached_partial(self, request: HttpRequest, component, response):
+        cache_key = self.get_partial_cache_key(request, component)
+        if not cache_key:
+            return
+
+        response.render()
+        get_cache().set(
+            cache_key, response.content.decode(), component.get_cache_timeout()
+        )
+
     def get_partial_component(self, dashboard):
         if not self.dashboard_class:
             raise Exception("Dashboard class not set on view")
@@ -147,6 +342,216 @@ class ComponentView(DashboardObjectMixin, TemplateView):
         )
 
 
+class ExportComponentView(ComponentView):
+    """
+    Export view, streams all the rows of a table component matching the
+    request's search & sort filters as csv or ndjson.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        dashboard = self.get_dashboard(request=request)
+        component = self.get_partial_component(dashboard)
+        export_format = self.kwargs["export_format"]
+
+        if (
+            not isinstance(component, BasicTable)
+            or export_format not in EXPORT_CONTENT_TYPES
+            or component.get_export_serializer() is None
+        ):
+            raise Http404(
+                f"Component {component.key} can not be exported as {export_format}"
+            )
+
+        response = StreamingHttpResponse(
+            component.export(
+                export_format, request=request, filters=component.get_filters(request)
+            ),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{component.key}.{export_format}"'
+
+        return response
+
+
+class ComponentsView(DashboardObjectMixin, TemplateView):
+    """
+    Components view, rendering multiple deferred components in one request, each
+    swapped into place out of band by HTMX. Components can be limited by passing
+    their keys in the component param, otherwise all deferred components are
+    returned.
+    """
+
+    template_name: str = "dashboards/components/batch.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        dashboard = self.get_dashboard(request=request)
+        components = self.get_batch_components(dashboard)
+
+        if self.is_ajax():
+            # Return json keyed by component, calling the deferred values.
+            return HttpResponse(
+                encoders.dumpb(
+                    {
+                        component.key: component.get_value(
+                            request=request,
+                            call_deferred=True,
+                            filters=component.get_filters(request),
+                        )
+                        for component in components
+                    }
+                ),
+                content_type="application/json",
+            )
+
+        context = self.get_context_data(
+            **{"components": components, "dashboard": dashboard}
+        )
+
+        return self.render_to_response(context)
+
+    def post(self, *args, **kwargs):
+        return self.get(*args, **kwargs)
+
+    def get_batch_components(self, dashboard) -> List[Component]:
+        keys = self.request.GET.getlist("component")
+
+        if not keys:
+            return [
+                component
+                for component in dashboard.get_components()
+                if component.is_deferred and not component.defer_url
+            ]
+
+        components = {c.key: c for c in dashboard.get_components()}
+        missing = [key for key in keys if key not in components]
+        if missing:
+            raise Http404(
+                f"Components {', '.join(missing)} do not exist in dashboard {dashboard.class_name()}"
+            )
+
+        return [components[key] for key in keys]
+
+
+class EventsView(DashboardObjectMixin, View):
+    """
+    Events view, a server sent event stream per dashboard page which all
+    published live component updates are sent down.
+
+    Holding the stream open would keep a WSGI worker busy for as long as the
+    page is open, so each response sends the events waiting and closes, the
+    browser reconnecting after retry seconds with the Last-Event-ID. Use
+    AsyncEventsView under ASGI to hold the stream open instead, sending events
+    as soon as they're published.
+    """
+
+    retry: float = 5  # seconds the browser waits before checking for new events
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        dashboard = self.get_dashboard(request=request)
+        backend = get_event_backend()
+        channel = dashboard.get_events_channel()
+        last_id = self.get_last_event_id()
+
+        events: List[Event] = []
+        if last_id is None:
+            # a newly opened page, only events published from now on are sent
+            last_id = backend.get_last_id(channel)
+        else:
+            events = backend.get_events(channel, last_id)
+
+        response = HttpResponse(
+            self.encode_start(last_id, self.retry)
+            + "".join(event.encode() for event in events),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+
+        return response
+
+    def get_last_event_id(self) -> Optional[int]:
+        try:
+            return int(self.request.headers["Last-Event-ID"])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def encode_start(last_id: int, retry: float) -> str:
+        """
+        The reconnection delay, and the id the browser sends when reconnecting
+        so events published in between aren't missed.
+        """
+        return f"retry: {int(retry * 1000)}\nid: {last_id}\n\n"
+
+
+class AsyncDashboardView(AsyncDashboardObjectMixin, DashboardView):
+    """
+    Async Dashboard view, awaiting all non deferred component values together
+    before the dashboard is rendered.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        dashboard = await sync_to_async(self.get_dashboard)(request=request)
+        await dashboard.aresolve_component_values(request)
+        context = self.get_context_data(**{"dashboard": dashboard})
+        return self.render_to_response(context)
+
+
+class AsyncComponentView(AsyncDashboardObjectMixin, ComponentView):
+    """
+    Async Component view, awaiting async value/defer callables and serializers.
+    """
+
+    async def get(self, request: HttpRequest, *args, **kwargs):
+        if not self.is_ajax():
+            html = await sync_to_async(self.get_cached_partial)(request)
+            if html is not None:
+                return await sync_to_async(self.get_conditional_response)(
+                    request, HttpResponse(html)
+                )
+
+        dashboard = await sync_to_async(self.get_dashboard)(request=request)
+        component = self.get_partial_component(dashboard)
+        filters = component.get_filters(request)
+
+        etag = await sync_to_async(component.get_etag)(request=request, filters=filters)
+        last_modified = await sync_to_async(component.get_last_modified)(
+            request=request, filters=filters
+        )
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        value = await component.aget_value(
+            request=request, call_deferred=True, filters=filters
+        )
+
+        if self.is_ajax():
+            response = HttpResponse(
+                encoders.dumpb(value),
+                content_type="application/json",
+            )
+        else:
+            dashboard.component_values[component.key] = value
+            context = self.get_context_data(
+                **{
+                    "component": component,
+                    "dashboard": dashboard,
+                    "component_values": dashboard.component_values,
+                }
+            )
+            response = self.render_to_response(context)
+            await sync_to_async(self.set_cached_partial)(request, component, response)
+
+        return await sync_to_async(self.get_conditional_response)(
+            request, response, etag=etag, last_modified=last_modified
+        )
+
+    async def post(self, *args, **kwargs):
+        return await self.get(*args, **kwargs)
+
+
 class FormComponentView(ComponentView):
     """
     Form Component view, partial rendering of dependant components to support HTMX calls.
@@ -167,3 +572,50 @@ class FormComponentView(ComponentView):
             # return HttpResponseRedirect(component.get_absolute_url())
 
         return self.get(request, *args, **kwargs)
+
+
+class AsyncEventsView(AsyncDashboardObjectMixin, EventsView):
+    """
+    Async Events view, holding no thread while waiting for events.
+    """
+
+    async def get(self, request: HttpRequest, *args, **kwargs):
+        dashboard = await sync_to_async(self.get_dashboard)(request=request)
+        backend = get_event_backend()
+        response = StreamingHttpResponse(
+            self.astream_events(
+                backend, dashboard.get_events_channel(), self.get_last_event_id()
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+    async def astream_events(
+        self, backend: BaseEventBackend, channel: str, last_id: Optional[int]
+    ) -> AsyncIterator[str]:
+        # backend reads are independent of the request's connections, so they run
+        # in the thread pool rather than queuing behind other sync calls
+        get_last_id = sync_to_async(backend.get_last_id, thread_sensitive=False)
+        get_events = sync_to_async(backend.get_events, thread_sensitive=False)
+
+        if last_id is None:
+            last_id = await get_last_id(channel)
+
+        yield self.encode_start(last_id, backend.poll_interval)
+        started = idle = time.monotonic()
+        while time.monotonic() - started < backend.stream_timeout:
+            events = await get_events(channel, last_id)
+            for event in events:
+                last_id = event.id
+                yield event.encode()
+
+            if events:
+                idle = time.monotonic()
+            elif time.monotonic() - idle >= backend.keepalive:
+                idle = time.monotonic()
+                yield ": keepalive\n\n"
+
+            await asyncio.sleep(backend.poll_interval)
@@ -367,8 +367,11 @@ class CustomComponentDashboard(Dashboard):
         grid_css_classes=Grid.TWO.value,
     )
 
-    # Example in which third party is called via async.
+    # Example in which third party is called via an async defer, awaited by
+    # the AsyncComponentView.
     async_httpbin = Text(
+        defer=DashboardData.fetch_status_async,
+        mark_safe=True,
         defer_url=lambda reverse_args: reverse(
             "kitchensink:async-component", args=reverse_args
         ),
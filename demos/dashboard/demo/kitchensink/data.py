@@ -1,9 +1,11 @@
+import asyncio
 import json
 from datetime import timedelta
 
 from django.contrib.auth.models import User
 from django.db.models import Count
 
+import httpx
 from demo.kitchensink.models import FlatText
 
 from dashboards.component.stat import StatDateChangeSerializer
@@ -17,6 +19,18 @@ class DashboardData:
     def fetch_html(*args, **kwargs) -> str:
         return getattr(FlatText.objects.all().first(), "text", "Flat Text")
 
+    @staticmethod
+    async def fetch_status_async(*args, **kwargs) -> str:
+        async with httpx.AsyncClient() as client:
+            status = ["200", "302", "400", "404", "500"]
+            responses = await asyncio.gather(
+                *[client.get(f"https://postman-echo.com/status/{s}") for s in status]
+            )
+
+        return "Fetched an API Async<br/>" + "<hr/>".join(
+            [str(r.status_code) for r in responses]
+        )
+
     @staticmethod
     def fetch_scatter_map_data(*args, **kwargs) -> str:
         return json.dumps(
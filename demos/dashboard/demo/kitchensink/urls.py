@@ -2,7 +2,6 @@ from django.urls import path
 
 from demo.kitchensink import dashboards
 from demo.kitchensink.views import (
-    AsyncComponentView,
     CustomComponentView,
     NoTemplateComponentDeferView,
     StandardView,
@@ -11,7 +10,7 @@ from demo.kitchensink.views import (
 )
 
 from dashboards.urls import COMPONENT_PATTERN
-from dashboards.views import DashboardView
+from dashboards.views import AsyncComponentView, DashboardView
 
 
 urlpatterns = [
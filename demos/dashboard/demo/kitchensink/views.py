@@ -1,7 +1,4 @@
-import asyncio
-
 from django.http import HttpRequest, HttpResponse
-from django.utils.decorators import classonlymethod
 from django.views.generic import TemplateView
 
 import httpx
@@ -57,29 +54,3 @@ class SyncComponentView(ComponentView):
             "Fetched an API Sync<br/>"
             + "<hr/>".join([str(r.status_code) for r in responses])
         )
-
-
-class AsyncComponentView(ComponentView):
-    @classonlymethod
-    def as_view(cls, **initkwargs):
-        """
-        Needed prior to 4.1 for CBV
-        """
-        view = super().as_view(**initkwargs)
-        view._is_coroutine = asyncio.coroutines._is_coroutine  # type: ignore
-        return view
-
-    async def get(self, request: HttpRequest, *args, **kwargs):
-        async with httpx.AsyncClient() as client:
-            status = ["200", "302", "400", "404", "500"]
-            responses = await asyncio.gather(
-                *[client.get(f"https://postman-echo.com/status/{s}") for s in status]
-            )
-
-        return HttpResponse(
-            "Fetched an API Async<br/>"
-            + "<hr/>".join([str(r.status_code) for r in responses])
-        )
-
-    async def post(self, *args, **kwargs):
-        return self.get(*args, **kwargs)
@@ -0,0 +1,57 @@
+"""
+Runs the benchmarks against an in memory test database, for example:
+
+    python -m tests.benchmarks
+    python -m tests.benchmarks --filter table --max-size 100000 --output json
+"""
+import argparse
+import json
+import os
+import sys
+from fnmatch import fnmatch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument(
+        "--filter", default="*", help="glob matched against benchmark names"
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=100_000,
+        help="skip sizes above this, the 1M row/point cases need --max-size 1000000",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", choices=["table", "json"], default="table")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+    import django
+    from django.test.utils import setup_databases, setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+    setup_databases(verbosity=0, interactive=False)
+
+    from . import cases  # noqa: F401 registers the benchmarks
+    from .runner import benchmarks, format_header, format_result, run
+
+    selected = [b for b in benchmarks if fnmatch(b.name, f"*{args.filter}*")]
+
+    if args.output == "table":
+        print(format_header())
+        results = run(
+            selected,
+            repeat=args.repeat,
+            max_size=args.max_size,
+            report=lambda result: print(format_result(result), flush=True),
+        )
+    else:
+        results = run(selected, repeat=args.repeat, max_size=args.max_size)
+        json.dump([r.as_dict() for r in results], sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+from typing import Any, Dict, List, Type
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objs as go
+
+from dashboards import encoders
+from dashboards.component import Text
+from dashboards.component.chart import FigureSpec
+from dashboards.component.chart.serializers import PlotlyChartSerializer
+from dashboards.component.table import ColumnarTable, SerializedTable, TableSerializer
+from dashboards.dashboard import Dashboard
+
+from .runner import benchmark
+
+
+DASHBOARD_SIZES = [1, 10, 100]
+TABLE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+CHART_SIZES = [10_000, 100_000, 1_000_000]
+
+# a page of a datatable, sorted and searched as the client would
+TABLE_FILTERS = {
+    "start": "20",
+    "length": "10",
+    "draw": "2",
+    "order[0][column]": "1",
+    "order[0][dir]": "desc",
+    "search[value]": "1",
+}
+
+
+def make_dashboard(size: int) -> Type[Dashboard]:
+    attrs: Dict[str, Any] = {
+        f"text_{i}": Text(value=f"Component {i}") for i in range(size)
+    }
+    attrs["__module__"] = __name__
+    attrs["Meta"] = type("Meta", (), {"name": f"Benchmark{size}", "app_label": "app1"})
+
+    return type(f"Benchmark{size}Dashboard", (Dashboard,), attrs)
+
+
+@benchmark("dashboard.render", sizes=DASHBOARD_SIZES, setup=make_dashboard)
+def dashboard_render(dashboard_class: Type[Dashboard]):
+    request = RequestFactory().get("/")
+    return dashboard_class(request=request).render(request=request)
+
+
+@benchmark("dashboard.init", sizes=DASHBOARD_SIZES, setup=make_dashboard)
+def dashboard_init(dashboard_class: Type[Dashboard]):
+    return dashboard_class()
+
+
+@benchmark("dashboard.media", sizes=DASHBOARD_SIZES, setup=make_dashboard)
+def dashboard_media(dashboard_class: Type[Dashboard]):
+    return dashboard_class().media
+
+
+def make_users(size: int) -> Type[TableSerializer]:
+    User.objects.all().delete()
+    User.objects.bulk_create(
+        (
+            User(
+                username=f"user{i}",
+                first_name=f"First {i % 100}",
+                last_name=f"Last {i % 1000}",
+                email=f"user{i}@example.com",
+            )
+            for i in range(size)
+        ),
+        batch_size=10_000,
+    )
+
+    class UserTableSerializer(TableSerializer):
+        class Meta:
+            columns = {
+                "username": "Username",
+                "first_name": "First Name",
+                "last_name": "Last Name",
+                "email": "Email",
+                "is_active": "Active",
+                "date_joined": "Joined",
+            }
+            model = User
+
+    return UserTableSerializer
+
+
+@benchmark("table.queryset", sizes=TABLE_SIZES, setup=make_users)
+def table_queryset(serializer: Type[TableSerializer]) -> SerializedTable:
+    return serializer.serialize(filters=TABLE_FILTERS)
+
+
+def make_rows(size: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "username": f"user{i}",
+            "first_name": f"First {i % 100}",
+            "last_name": f"Last {i % 1000}",
+            "email": f"user{i}@example.com",
+            "is_active": bool(i % 2),
+        }
+        for i in range(size)
+    ]
+
+
+def make_list_serializer(data: Any) -> Type[TableSerializer]:
+    class ListTableSerializer(TableSerializer):
+        class Meta:
+            columns = {
+                "username": "Username",
+                "first_name": "First Name",
+                "last_name": "Last Name",
+                "email": "Email",
+                "is_active": "Active",
+            }
+
+        def get_data(self, *args, **kwargs):
+            return data
+
+    return ListTableSerializer
+
+
+@benchmark(
+    "table.list",
+    sizes=TABLE_SIZES,
+    setup=lambda size: make_list_serializer(make_rows(size)),
+)
+def table_list(serializer: Type[TableSerializer]) -> SerializedTable:
+    return serializer.serialize(filters=TABLE_FILTERS)
+
+
+# the same ColumnarTable is returned each time, so its search/sort keys are reused
+@benchmark(
+    "table.columnar",
+    sizes=TABLE_SIZES,
+    setup=lambda size: make_list_serializer(ColumnarTable.from_data(make_rows(size))),
+)
+def table_columnar(serializer: Type[TableSerializer]) -> SerializedTable:
+    return serializer.serialize(filters=TABLE_FILTERS)
+
+
+def make_points(size: int) -> Type[PlotlyChartSerializer]:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "x": pd.date_range("2020-01-01", periods=size, freq="min"),
+            "y": rng.standard_normal(size).cumsum(),
+        }
+    )
+
+    class LineChartSerializer(PlotlyChartSerializer):
+        class Meta:
+            title = "Points"
+
+        def get_data(self, *args, **kwargs) -> pd.DataFrame:
+            return df
+
+        def to_fig(self, data: pd.DataFrame) -> go.Figure:
+            return px.line(data, x="x", y="y")
+
+    return LineChartSerializer
+
+
+def make_points_spec(size: int) -> Type[PlotlyChartSerializer]:
+    serializer = make_points(size)
+
+    class LineChartSpecSerializer(serializer):  # type: ignore
+        def to_fig(self, data: pd.DataFrame) -> FigureSpec:
+            return FigureSpec().add_trace(
+                "scatter", x=data["x"], y=data["y"], mode="lines"
+            )
+
+    return LineChartSpecSerializer
+
+
+# charts are encoded, as they are in a component response
+@benchmark("chart.serialize", sizes=CHART_SIZES, setup=make_points)
+def chart_serialize(serializer: Type[PlotlyChartSerializer]) -> bytes:
+    return encoders.dumpb(serializer.serialize())
+
+
+@benchmark("chart.spec", sizes=CHART_SIZES, setup=make_points_spec)
+def chart_spec(serializer: Type[PlotlyChartSerializer]) -> bytes:
+    return encoders.dumpb(serializer.serialize())
@@ -0,0 +1,113 @@
+import gc
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    times: List[float]  # seconds
+    peak_memory: int  # bytes
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.times)
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "mean": self.mean, "min": self.min}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[..., Any]
+    sizes: List[int]
+    # called once per size outside the timings, its result is passed to func
+    setup: Optional[Callable[[int], Any]] = None
+    tags: List[str] = field(default_factory=list)
+
+
+benchmarks: List[Benchmark] = []
+
+
+def benchmark(
+    name: str,
+    sizes: List[int],
+    setup: Optional[Callable[[int], Any]] = None,
+    tags: Optional[List[str]] = None,
+):
+    """
+    Registers the decorated function as a benchmark, run once for each size.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        benchmarks.append(
+            Benchmark(name=name, func=func, sizes=sizes, setup=setup, tags=tags or [])
+        )
+        return func
+
+    return decorator
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Result:
+    """
+    Times func repeat times, then runs it once more under tracemalloc for the
+    peak memory, which is kept out of the timings as it slows allocation.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(name="", size=0, times=times, peak_memory=peak_memory)
+
+
+def run(
+    selected: List[Benchmark],
+    repeat: int,
+    max_size: Optional[int] = None,
+    report: Callable[[Result], None] = lambda result: None,
+) -> List[Result]:
+    results = []
+    for bench in selected:
+        for size in bench.sizes:
+            if max_size is not None and size > max_size:
+                continue
+
+            data = bench.setup(size) if bench.setup else size
+            result = measure(lambda: bench.func(data), repeat=repeat)
+            result.name, result.size = bench.name, size
+            results.append(result)
+            report(result)
+
+    return results
+
+
+def format_result(result: Result) -> str:
+    return (
+        f"{result.name:<40} {result.size:>9,} "
+        f"{result.mean * 1000:>12.2f}ms {result.min * 1000:>12.2f}ms "
+        f"{result.peak_memory / 1024 / 1024:>10.2f}MiB"
+    )
+
+
+def format_header() -> str:
+    return f"{'benchmark':<40} {'size':>9} {'mean':>14} {'min':>14} {'peak mem':>13}"
@@ -0,0 +1,50 @@
+from typing import Any, List
+
+import pytest
+
+from tests.benchmarks import cases
+from tests.benchmarks.runner import Benchmark, Result, format_result, measure, run
+
+
+def test_measure():
+    result = measure(lambda: [0] * 100_000, repeat=3)
+
+    assert len(result.times) == 3
+    assert result.min <= result.mean
+    assert result.peak_memory >= 100_000 * 8
+
+
+def test_run__skips_sizes_above_max():
+    bench = Benchmark(name="square", func=lambda n: n * n, sizes=[1, 10, 100])
+    reported: List[Result] = []
+
+    results = run([bench], repeat=1, max_size=10, report=reported.append)
+
+    assert [(r.name, r.size) for r in results] == [("square", 1), ("square", 10)]
+    assert reported == results
+    assert format_result(results[0]).startswith("square")
+
+
+def test_run__setup_passed_to_func():
+    called: List[Any] = []
+    bench = Benchmark(
+        name="setup", func=called.append, sizes=[5], setup=lambda n: {"size": n}
+    )
+
+    run([bench], repeat=1)
+
+    assert called == [{"size": 5}] * 2  # timed once, then once for memory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "func,setup",
+    [
+        (cases.dashboard_render, cases.make_dashboard),
+        (cases.table_queryset, cases.make_users),
+        (cases.table_list, lambda n: cases.make_list_serializer(cases.make_rows(n))),
+        (cases.chart_serialize, cases.make_points),
+    ],
+)
+def test_cases(func, setup):
+    assert func(setup(10))
@@ -1,3 +1,5 @@
+from django.core.cache import cache
+
 import pytest
 
 from dashboards.registry import registry
@@ -14,3 +16,10 @@ def auto_registry():
     registry.register(dashboards.TestDashboardWithLayout)
     registry.register(dashboards.TestModelDashboard)
     registry.register(dashboards.TestNoMetaDashboard)
+
+
+@pytest.fixture
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
@@ -1,11 +1,18 @@
 from dataclasses import dataclass
+from enum import Enum
+from typing import Any, List
+from unittest.mock import Mock, patch
 
+from django.contrib.auth.models import User
 from django.template import Context
 
+import asset_definitions
 import pytest
+from asgiref.sync import async_to_sync
 
 from dashboards.component import Chart, Component, Text
 from dashboards.component.text import Stat
+from tests.dashboards.fakes import fake_user
 from tests.utils import render_component_test
 
 
@@ -84,6 +91,33 @@ def test_get_value(component_kwargs, call_deferred, expected, rf):
     )
 
 
+class Colour(Enum):
+    RED = "red"
+
+
+@dataclass
+class TestNestedDataClassValue:
+    points: List[TestDataClassValue]
+    colour: Colour
+    users: Any
+
+
+@pytest.mark.django_db
+def test_get_value__nested_dataclass(rf):
+    fake_user(username="abc")
+    value = TestNestedDataClassValue(
+        points=[TestDataClassValue(x="x", y="y")],
+        colour=Colour.RED,
+        users=User.objects.values_list("username", flat=True),
+    )
+
+    assert TestComponent(value=value).get_value(request=rf.get("/"), filters={}) == {
+        "points": [{"x": "x", "y": "y"}],
+        "colour": "red",
+        "users": ["abc"],
+    }
+
+
 @pytest.mark.parametrize(
     "component_kwargs,expected",
     [
@@ -156,3 +190,222 @@ def test_render(component_class, dashboard, component_kwargs, htmx, rf, snapshot
     )
 
     snapshot.assert_match(render_component_test(context, htmx=htmx))
+
+
+@pytest.mark.parametrize(
+    "component_kwargs,expected",
+    [
+        ({}, None),
+        ({"cache_timeout": 0}, 0),
+        ({"cache_timeout": 60}, 60),
+    ],
+)
+def test_get_cache_timeout(component_kwargs, expected, dashboard):
+    component = TestComponent(**component_kwargs)
+    component.dashboard = dashboard
+
+    assert component.get_cache_timeout() == expected
+
+
+def test_get_cache_timeout__dashboard_meta_default(dashboard):
+    component = TestComponent()
+    component.dashboard = dashboard
+
+    with patch.object(dashboard._meta, "cache_timeout", 30):
+        assert component.get_cache_timeout() == 30
+        assert TestComponent(cache_timeout=10).get_cache_timeout() == 10
+
+
+def test_get_cache_key(dashboard):
+    component = TestComponent()
+    component.dashboard = dashboard
+    component.key = "test"
+
+    assert component.get_cache_key(filters={"a": 1, "b": 2}) == (
+        component.get_cache_key(filters={"b": 2, "a": 1})
+    )
+    assert component.get_cache_key(filters={"a": 1}) != (
+        component.get_cache_key(filters={"a": 2})
+    )
+    assert component.get_cache_key().startswith("dashboards:app1_testdashboard:test:")
+
+
+@pytest.mark.django_db
+def test_get_cache_key__object(dashboard, user):
+    component = TestComponent()
+    component.dashboard = dashboard
+    component.key = "test"
+    key = component.get_cache_key()
+
+    component.object = user
+
+    assert component.get_cache_key() != key
+    assert f":test:{user.pk}:" in component.get_cache_key()
+
+
+def test_get_cache_key__custom(dashboard, rf):
+    component = TestComponent(cache_key=lambda **kwargs: kwargs["request"].path)
+    component.dashboard = dashboard
+    component.key = "test"
+
+    assert component.get_cache_key(request=rf.get("/one/")).endswith(":/one/")
+    assert component.get_cache_key(request=rf.get("/two/")).endswith(":/two/")
+
+
+def test_get_value__cached(dashboard, rf, clear_cache):
+    value = Mock(spec=["__call__"], return_value="cached value")
+    component = TestComponent(value=value, cache_timeout=60)
+    component.dashboard = dashboard
+    component.key = "test"
+
+    for _ in range(3):
+        assert component.get_value(request=rf.get("/"), filters={}) == "cached value"
+
+    value.assert_called_once()
+    assert component.get_value(request=rf.get("/"), filters={"a": "b"})
+    assert value.call_count == 2
+
+
+def test_get_value__not_cached(dashboard, rf, clear_cache):
+    value = Mock(spec=["__call__"], return_value="value")
+    component = TestComponent(value=value)
+    component.dashboard = dashboard
+    component.key = "test"
+
+    component.get_value(request=rf.get("/"), filters={})
+    component.get_value(request=rf.get("/"), filters={})
+
+    assert value.call_count == 2
+
+
+def test_render__cached(dashboard, rf, clear_cache):
+    value = Mock(spec=["__call__"], return_value="value")
+    component = TestComponent(
+        template_name="dashboards/components/text/text.html",
+        value=value,
+        cache_timeout=60,
+        cache_rendered=True,
+    )
+    component.dashboard = dashboard
+    component.key = "test"
+    context = Context({"request": rf.get("/")})
+
+    assert component.render(context=context) == component.render(context=context)
+    value.assert_called_once()
+
+    component.render(context=Context({"request": rf.get("/", {"a": "b"})}))
+    assert value.call_count == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cache_shared,expected_calls", [(False, 2), (True, 1)])
+def test_render__cached__per_user(
+    cache_shared, expected_calls, dashboard, rf, clear_cache
+):
+    value = Mock(
+        spec=["__call__"], side_effect=lambda request, **kwargs: str(request.user)
+    )
+    component = TestComponent(
+        template_name="dashboards/components/text/text.html",
+        value=value,
+        cache_timeout=60,
+        cache_rendered=True,
+        cache_shared=cache_shared,
+    )
+    component.dashboard = dashboard
+    component.key = "test"
+    html = {}
+    for username in ["one", "two", "one"]:
+        request = rf.get("/")
+        request.user = User.objects.get_or_create(username=username)[0]
+        html[username] = component.render(context=Context({"request": request}))
+
+    assert value.call_count == expected_calls
+    assert ("two" in html["two"]) is not cache_shared
+
+
+async def async_value(**kwargs):
+    return "async value"
+
+
+class TestAsyncSerializer:
+    @classmethod
+    def serialize(cls, **kwargs):
+        return "sync serialized"
+
+    @classmethod
+    async def aserialize(cls, **kwargs):
+        return TestDataClassValue(x="x", y="y")
+
+
+@pytest.mark.parametrize(
+    "component_kwargs,call_deferred,expected",
+    [
+        ({"value": async_value}, False, "async value"),
+        ({"defer": async_value}, True, "async value"),
+        ({"value": lambda **k: "called value"}, False, "called value"),
+        ({"value": TestAsyncSerializer}, False, {"x": "x", "y": "y"}),
+    ],
+)
+def test_aget_value(component_kwargs, call_deferred, expected, rf):
+    component = TestComponent(**component_kwargs)
+
+    assert (
+        async_to_sync(component.aget_value)(
+            request=rf.get("/"), call_deferred=call_deferred, filters={}
+        )
+        == expected
+    )
+
+
+def test_get_value__async_callable(rf):
+    assert (
+        TestComponent(value=async_value).get_value(request=rf.get("/"), filters={})
+        == "async value"
+    )
+
+
+def test_get_value__serializer_not_replaced(rf):
+    component = TestComponent(defer=TestAsyncSerializer)
+    component.get_value(request=rf.get("/"), call_deferred=True, filters={})
+
+    assert component.defer is TestAsyncSerializer
+
+
+class TestMediaSerializer:
+    instances = 0
+
+    class Media:
+        js = ("serializer.js",)
+
+    def __init__(self):
+        TestMediaSerializer.instances += 1
+
+    def get_media(self):
+        return asset_definitions.Media(media=self.Media)
+
+
+def test_get_media__serializer__cached():
+    Chart(defer=TestMediaSerializer).get_media()
+    media = Chart(defer=TestMediaSerializer).get_media()
+
+    assert TestMediaSerializer.instances == 1
+    assert "serializer.js" in str(media)
+
+
+def test_get_media__component_class():
+    assert "plotly" in str(Chart().get_media())
+    assert str(Text(value="value").get_media()) == ""
+
+
+def test_render__component_values(dashboard, rf):
+    value = Mock(spec=["__call__"], return_value="value")
+    component = Text(value=value)
+    component.dashboard = dashboard
+    component.key = "test"
+    context = Context(
+        {"request": rf.get("/"), "component_values": {"test": "resolved value"}}
+    )
+
+    assert "resolved value" in component.render(context=context)
+    value.assert_not_called()
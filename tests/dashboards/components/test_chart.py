@@ -1,11 +1,30 @@
+import json
+
 from django.contrib.auth.models import User
+from django.template import Context
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objs as go
 import pytest
 
-from dashboards.component.chart.serializers import ChartSerializer
+from dashboards import encoders
+from dashboards.component import Chart
+from dashboards.component.chart import (
+    Downsample,
+    FigureSpec,
+    LTTBDownsample,
+    MeanDownsample,
+    MinMaxDownsample,
+)
+from dashboards.component.chart.downsample import lttb
+from dashboards.component.chart.figure import merge, split_key
+from dashboards.component.chart.serializers import (
+    ChartSerializer,
+    PlotlyChartSerializer,
+)
+from dashboards.templatetags.dashboards import json_value
 from tests.dashboards.fakes import fake_user
 
 
@@ -107,7 +126,7 @@ def test_serializer__serialize__queryset(test_user_serializer__qs, snapshot):
 
     data = test_user_serializer__qs.serialize()
 
-    snapshot.assert_match(data)
+    snapshot.assert_match(encoders.dumps(data))
 
 
 @pytest.mark.django_db
@@ -117,4 +136,178 @@ def test_serializer__serialize__model(test_user_serializer__model, snapshot):
 
     data = test_user_serializer__model.serialize()
 
-    snapshot.assert_match(data)
+    snapshot.assert_match(encoders.dumps(data))
+
+
+@pytest.mark.django_db
+def test_chart__render__encoded_once(test_user_serializer__model, dashboard, rf):
+    fake_user(id=10, username="<u10>")
+    component = Chart(value=test_user_serializer__model)
+    component.dashboard = dashboard
+    component.key = "chart"
+
+    html = component.render(Context({"request": rf.get("/")}))
+
+    assert "Dashboard.renderChart(" in html
+    # the figure is an object in the script, with html escaped as json_script does
+    assert '"x":["\\u003Cu10\\u003E"]' in html
+    assert "JSON.parse" not in html
+
+
+def test_json_value():
+    assert json_value({"text": "</script>&"}) == (
+        '{"text":"\\u003C/script\\u003E\\u0026"}'
+    )
+    # strings are already json
+    assert json_value('{"data": []}') == '{"data": []}'
+
+
+@pytest.mark.parametrize("dark", [False, True])
+@pytest.mark.parametrize("to_fig", ["dict", "spec"])
+def test_serializer__figure_spec__same_as_figure(to_fig, dark, rf):
+    data = {"x": np.array([1, 2, 3]), "y": np.array([1.5, np.nan, 3.5])}
+    layout = {"xaxis_title": "X", "yaxis": {"title": {"text": "Y"}}}
+
+    class FigureSerializer(PlotlyChartSerializer):
+        class Meta:
+            title = "Chart"
+            width = 500
+
+        def get_data(self, *args, **kwargs):
+            return data
+
+        def to_fig(self, data):
+            return go.Figure(
+                data=[go.Bar(x=data["x"], y=data["y"], marker_color="red")],
+                layout=layout,
+            )
+
+    class SpecSerializer(FigureSerializer):
+        def to_fig(self, data):
+            if to_fig == "dict":
+                return {
+                    "data": [{"type": "bar", "marker_color": "red", **data}],
+                    "layout": layout,
+                }
+
+            return FigureSpec(layout=layout).add_trace(
+                "bar", marker_color="red", **data
+            )
+
+    request = rf.get("/")
+    if dark:
+        request.COOKIES["appearanceMode"] = "dark"
+
+    expected = json.loads(encoders.dumps(FigureSerializer.serialize(request=request)))
+    serialized = json.loads(encoders.dumps(SpecSerializer.serialize(request=request)))
+
+    assert serialized == expected
+    assert serialized["layout"]["title"] == {"text": "Chart"}
+    assert serialized["data"][0]["y"] == [1.5, None, 3.5]
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("width", ["width"]),
+        ("plot_bgcolor", ["plot_bgcolor"]),
+        ("xaxis_title_font_size", ["xaxis", "title", "font", "size"]),
+        ("error_y_color", ["error_y", "color"]),
+    ],
+)
+def test_split_key(key, expected):
+    assert split_key(key) == expected
+
+
+def test_merge():
+    base = {"title": {"text": "a"}, "width": 10, "xaxis": {"range": [0, 1]}}
+
+    merged = merge(base, {"title": None, "width": None, "xaxis_title": "X"})
+
+    assert merged == {"title": {}, "xaxis": {"range": [0, 1], "title": {"text": "X"}}}
+    assert base == {"title": {"text": "a"}, "width": 10, "xaxis": {"range": [0, 1]}}
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    y = rng.standard_normal(1000)
+    y[500] = 100  # a spike which should survive downsampling
+    return pd.DataFrame(
+        {
+            "x": pd.date_range("2023-01-01", periods=1000, freq="min"),
+            "y": y,
+            "group": np.repeat(["a", "b"], 500),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "strategy", [Downsample, LTTBDownsample, MinMaxDownsample, MeanDownsample]
+)
+def test_downsample__small_data_unchanged(strategy, series):
+    assert strategy("x", "y", threshold=1000).downsample(series) is series
+
+
+@pytest.mark.parametrize("strategy", [LTTBDownsample, MinMaxDownsample])
+def test_downsample__keeps_extremes(strategy, series):
+    downsampled = strategy("x", "y", threshold=100).downsample(series)
+
+    assert len(downsampled) <= 102
+    assert downsampled.index[0] == 0
+    assert downsampled.index[-1] == 999
+    assert 500 in downsampled.index
+    assert downsampled["x"].is_monotonic_increasing
+
+
+def test_downsample__group_by(series):
+    downsampled = LTTBDownsample("x", "y", threshold=50, group_by="group").downsample(
+        series.sample(frac=1, random_state=0)
+    )
+
+    assert list(downsampled.groupby("group").size()) == [50, 50]
+    assert downsampled[downsampled["group"] == "b"]["x"].is_monotonic_increasing
+
+
+def test_downsample__mean(series):
+    series["y"] = np.arange(1000, dtype=float)
+
+    downsampled = MeanDownsample("x", "y", threshold=10, group_by="group").downsample(
+        series
+    )
+
+    assert list(downsampled["y"][:2]) == [24.5, 74.5]
+    assert list(downsampled["group"]) == ["a"] * 10 + ["b"] * 10
+    assert list(downsampled.index[:2]) == [0, 50]
+    assert downsampled["x"][0] == pd.Timestamp("2023-01-01 00:24:30")
+
+
+def test_lttb__nan():
+    y = np.arange(100, dtype=float)
+    y[10:20] = np.nan
+
+    selected = lttb(np.arange(100, dtype=float), y, 10)
+
+    assert len(selected) == 10
+    assert selected[0] == 0 and selected[-1] == 99
+
+
+def test_serializer__downsample(series):
+    figures = []
+
+    class TestChartSerializer(PlotlyChartSerializer):
+        class Meta:
+            downsample = MinMaxDownsample("x", "y", threshold=100)
+
+        def get_data(self, *args, **kwargs):
+            return series
+
+        def to_fig(self, data):
+            figures.append(data)
+            return FigureSpec().add_trace("scatter", x=data["x"], y=data["y"])
+
+    fig = json.loads(encoders.dumps(TestChartSerializer.serialize()))
+
+    assert len(figures[0]) <= 102
+    assert len(fig["data"][0]["y"]) == len(figures[0])
+    assert 100 in fig["data"][0]["y"]
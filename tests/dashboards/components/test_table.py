@@ -1,15 +1,34 @@
+import json
+from datetime import timedelta
 from unittest.mock import patch
 
-from django.contrib.auth.models import Permission, User
+from django.contrib.auth.models import Group, Permission, User
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F, QuerySet
 from django.forms import model_to_dict
 from django.template import Context
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from dashboards.component import BasicTable, Table
-from dashboards.component.table.mixins import TableDataProcessorMixin
+from dashboards.component.table.columnar import ColumnarTable
+from dashboards.component.table.counts import CappedCount, EstimatedCount
+from dashboards.component.table.formatters import get_row_formatter
+from dashboards.component.table.mixins import (
+    TableDataProcessorMixin,
+    TableQuerysetProcessor,
+)
+from dashboards.component.table.search import (
+    PostgresSearch,
+    SearchBackend,
+    SQLiteFTSSearch,
+)
 from dashboards.component.table.serializers import SerializedTable, TableSerializer
 from tests.dashboards.fakes import fake_user
 from tests.utils import render_component_test
@@ -315,6 +334,89 @@ def test_sort__table_list(
     assert list(result) == [users[i] for i in expected_order]
 
 
+ROWS = [
+    {"name": "b", "group": "Two", "value": 1},
+    {"name": "A", "group": "one", "value": None},
+    {"name": "c", "group": "two", "value": 3},
+    {"name": "d", "group": "One", "value": 1},
+]
+
+
+@pytest.mark.parametrize(
+    "data", [ROWS, pd.DataFrame(ROWS), ColumnarTable.from_data(ROWS)]
+)
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        # the first order takes precedence
+        (
+            {
+                "order[0][column]": "1",
+                "order[0][dir]": "asc",
+                "order[1][column]": "0",
+                "order[1][dir]": "desc",
+            },
+            ["d", "A", "c", "b"],
+        ),
+        (
+            {
+                "order[0][column]": "2",
+                "order[0][dir]": "desc",
+                "order[1][column]": "0",
+                "order[1][dir]": "asc",
+            },
+            ["c", "b", "d", "A"],
+        ),
+        ({"search[value]": "ONE"}, ["A", "d"]),
+        ({"columns[1][search][value]": "two"}, ["c"]),
+        ({"columns[0][search][value]": "b", "columns[2][search][value]": 1}, ["b"]),
+    ],
+)
+def test_list_processor(data, filters, expected):
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name", "group": "Group", "value": "Value"}
+
+    data = TestTableSerializer.filter(data, filters)
+    data = TestTableSerializer.sort(data, filters)
+
+    assert [r["name"] for r in data] == expected
+
+
+def test_serializer__dataframe():
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name", "value": "Value"}
+
+        def get_data(self, *args, **kwargs):
+            return pd.DataFrame(ROWS)
+
+    result = TestTableSerializer.serialize(
+        filters={"length": "2", "start": "2", "order[0][column]": "0"}
+    )
+
+    assert result.total == 4
+    assert result.filtered == 4
+    assert result.data == [{"name": "c", "value": 3}, {"name": "d", "value": 1}]
+
+    result = TestTableSerializer.serialize(filters={"order[0][column]": "0"})
+
+    assert result.data[0] == {"name": "A", "value": "-"}
+
+
+def test_columnar_table__views_share_lowered_columns():
+    table = ColumnarTable.from_data(ROWS)
+
+    searched = table.search("o")
+    sorted = searched.sort([("name", False)], force_lower=True)
+
+    assert sorted.cache is table.cache
+    assert set(table.cache) == {"search", "rank:name:True"}
+    assert list(sorted.positions) == [1, 0, 2, 3]
+    assert sorted[1] == ROWS[0]
+    assert isinstance(table.positions, np.ndarray)
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("length", [5, 10, -1])
 def test_serializer__queryset(length, test_user_serializer__qs):
@@ -428,6 +530,231 @@ def test_serializer__related_field():
     assert result.data[0]["content_type__name"] == "user"
 
 
+@pytest.mark.parametrize(
+    "model,fields,expected",
+    [
+        (User, ["username", "email"], (set(), set(), ["username", "email"])),
+        (
+            Permission,
+            ["name", "content_type__app_label"],
+            ({"content_type"}, set(), ["name", "content_type__app_label"]),
+        ),
+        # name is a property of ContentType
+        (Permission, ["content_type__name"], ({"content_type"}, set(), None)),
+        (Permission, ["content_type"], ({"content_type"}, set(), None)),
+        (User, ["username", "groups__name"], (set(), {"groups"}, ["username"])),
+        (User, ["get_full_name"], (set(), set(), None)),
+    ],
+)
+def test_queryset_processor__get_related(model, fields, expected):
+    assert TableQuerysetProcessor.get_related(model, fields) == expected
+
+
+@pytest.mark.django_db
+def test_serializer__related_fields_selected(django_assert_num_queries):
+    content_type = ContentType.objects.get_for_model(User)
+    Permission.objects.bulk_create(
+        Permission(name=f"Test {i}", codename=f"test_{i}", content_type=content_type)
+        for i in range(10)
+    )
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {
+                "name": "name",
+                "content_type__app_label": "App",
+                "content_type__model": "Model",
+            }
+
+        def get_data(self, *args, **kwargs):
+            return Permission.objects.filter(codename__startswith="test_")
+
+    # count, page
+    with django_assert_num_queries(2) as queries:
+        result = TestTableSerializer.serialize()
+
+    assert result.data[0] == {
+        "name": "Test 0",
+        "content_type__app_label": "auth",
+        "content_type__model": "user",
+    }
+    assert '"auth_permission"."codename",' not in queries.captured_queries[1]["sql"]
+
+    TestTableSerializer._meta.optimize_queryset = False
+    with django_assert_num_queries(12):
+        TestTableSerializer.serialize()
+
+
+@pytest.mark.django_db
+def test_serializer__value_hooks_load_all_fields():
+    fake_user(username="a", first_name="one", last_name="two")
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"username": "Username", "first_name": "First"}
+            model = User
+
+        @staticmethod
+        def get_first_name_value(obj):
+            return obj.get_full_name()
+
+    data = TestTableSerializer.optimize(User.objects.all())
+
+    assert data.query.deferred_loading == (frozenset(), True)  # type: ignore
+    assert TestTableSerializer.serialize().data[0]["first_name"] == "one two"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("keyset_pagination", [False, True])
+def test_serializer__values_list_rows(keyset_pagination, clear_cache):
+    fake_user(username="a", is_active=True, last_login=None)
+    fake_user(username="b", is_active=False, last_login=timezone.now())
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {
+                "username": "Username",
+                "is_active": "Active",
+                "last_login": "Last Login",
+            }
+            model = User
+
+    TestTableSerializer._meta.keyset_pagination = keyset_pagination
+
+    assert TestTableSerializer.optimize(User.objects.all())._fields == (  # type: ignore
+        "username",
+        "is_active",
+        "last_login",
+    )
+    for start in ["0", "1"]:
+        result = TestTableSerializer.serialize(filters={"start": start, "length": "1"})
+        assert result.filtered == 2
+
+    assert TestTableSerializer.serialize().data == [
+        {"username": "a", "is_active": "Yes", "last_login": "-"},
+        {"username": "b", "is_active": "No", "last_login": "now"},
+    ]
+    assert result.data == [{"username": "b", "is_active": "No", "last_login": "now"}]
+
+
+@pytest.mark.django_db
+def test_serializer__hooks_only_called_for_their_column(test_user_serializer__qs):
+    fake_user(username="a", first_name="one")
+
+    with patch.object(
+        test_user_serializer__qs, "get_first_name_value", return_value="ONE"
+    ) as hook:
+        result = test_user_serializer__qs.serialize()
+
+    assert result.data == [{"username": "a", "first_name": "ONE"}]
+    assert hook.call_count == 1
+
+
+def test_row_formatter__compiled_once(test_user_serializer__qs):
+    formatter = get_row_formatter(test_user_serializer__qs, User)
+
+    assert get_row_formatter(test_user_serializer__qs, User) is formatter
+    assert [(c.field, c.hook) for c in formatter.columns] == [
+        ("username", None),
+        ("first_name", "get_first_name_value"),
+    ]
+
+
+@pytest.fixture
+def user_fts():
+    backend = SQLiteFTSSearch()
+    fields = ["username", "first_name", "last_name"]
+    with connection.cursor() as cursor:
+        for sql in backend.get_create_sql(User, fields):
+            cursor.execute(sql)
+
+    yield backend
+
+    with connection.cursor() as cursor:
+        for sql in backend.get_drop_sql(User, fields):
+            cursor.execute(sql)
+
+
+@pytest.mark.django_db
+def test_sqlite_fts_search(test_user_serializer__qs, user_fts):
+    fake_user(username="alice", first_name="Alice", last_name="Smith")
+    fake_user(username="bob", first_name="Robert", last_name="Smithson")
+    carol = fake_user(username="carol", first_name="Carol", last_name="Jones")
+    test_user_serializer__qs._meta.search_backend = user_fts
+
+    def search(value):
+        result = test_user_serializer__qs.serialize(filters={"search[value]": value})
+        return [r["username"] for r in result.data]
+
+    assert search("smith") == ["alice", "bob"]
+    assert search("rob smiths") == ["bob"]
+    assert search("nobody") == []
+
+    # the index is kept up to date by triggers
+    carol.last_name = "Smith"
+    carol.save()
+    User.objects.filter(username="alice").delete()
+
+    assert search("smith") == ["bob", "carol"]
+
+
+@pytest.mark.django_db
+def test_sqlite_fts_search__trigram():
+    backend = SQLiteFTSSearch(tokenize="trigram")
+    fields = ["username"]
+    fake_user(username="alice")
+    fake_user(username="malcolm")
+
+    with connection.cursor() as cursor:
+        for sql in backend.get_create_sql(User, fields):
+            cursor.execute(sql)
+
+    assert list(
+        backend.search(User.objects.all(), fields, "lic").values_list(
+            "username", flat=True
+        )
+    ) == ["alice"]
+    # too short for trigrams, so icontains is used
+    assert backend.search(User.objects.all(), fields, "al").count() == 2
+
+    with connection.cursor() as cursor:
+        for sql in backend.get_drop_sql(User, fields):
+            cursor.execute(sql)
+
+
+@pytest.mark.parametrize(
+    "value,expected", [("smith", '"smith"*'), ('rob "x', '"rob"* """x"*')]
+)
+def test_sqlite_fts_search__match(value, expected):
+    assert SQLiteFTSSearch().get_match(value) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "backend", [SearchBackend(), PostgresSearch(), PostgresSearch(trigram=True)]
+)
+def test_search__falls_back_to_icontains(backend, test_user_serializer__qs):
+    fake_user(username="alice", first_name="Alice")
+    fake_user(username="bob", first_name="Robert")
+    test_user_serializer__qs._meta.search_backend = backend
+
+    result = test_user_serializer__qs.serialize(filters={"search[value]": "LIC"})
+
+    assert [r["username"] for r in result.data] == ["alice"]
+
+
+def test_postgres_search__create_sql():
+    sql = PostgresSearch(vector_field="username").get_create_sql(
+        User, ["first_name", "last_name"]
+    )
+
+    assert sql[0] == (
+        'CREATE TRIGGER "auth_user_username_update" BEFORE INSERT OR UPDATE ON '
+        '"auth_user" FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger('
+        '"username", \'pg_catalog.english\', "first_name", "last_name")'
+    )
+
+
 @pytest.mark.django_db
 def test_serializer__invalid_fields():
     class TestTableSerializer(TableSerializer):
@@ -466,6 +793,473 @@ def test_serializer__first_as_absolute_url(test_user_serializer__qs):
     ]
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("optimize_queryset", [False, True])
+def test_serializer__compact(optimize_queryset):
+    fake_user(username="abc", first_name="one")
+    fake_user(username="def", first_name="two")
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"username": "Username", "first_name": "First"}
+            model = User
+            compact = True
+
+    TestTableSerializer._meta.optimize_queryset = optimize_queryset
+
+    result = TestTableSerializer.serialize(filters={"order[0][column]": "0"})
+
+    assert result.compact
+    assert result.data == [["abc", "one"], ["def", "two"]]
+    assert result.columns_datatables == [
+        {"data": 0, "title": "Username"},
+        {"data": 1, "title": "First"},
+    ]
+
+
+def test_serializer__compact__first_as_absolute_url():
+    class Row(dict):
+        def get_absolute_url(self):
+            return f"/test/{self['name']}"
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name", "group": "Group"}
+            first_as_absolute_url = True
+            compact = True
+
+        def get_data(self, *args, **kwargs):
+            return [Row(name="b", group="Two"), Row(name="A", group="one")]
+
+    result = TestTableSerializer.serialize()
+
+    assert result.data == [
+        ['<a href="/test/b">b</a>', "Two"],
+        ['<a href="/test/A">A</a>', "one"],
+    ]
+
+
+def test_serialized_table__asdict__rows_not_copied():
+    serialized = SerializedTable(
+        data=[["a", 1]],
+        columns={"name": "Name"},
+        columns_datatables=[{"data": 0, "title": "Name"}],
+        order=[],
+        compact=True,
+    )
+    table = Table(value=lambda **kwargs: serialized)
+    table.key = "table"
+
+    value = table.get_value()
+
+    assert value["data"] is serialized.data
+    assert value["columns"] == serialized.columns
+    assert value["columns"] is not serialized.columns
+    assert value["compact"] is True
+
+
+def test_render__basic_table__compact(dashboard, rf):
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name", "group": "Group"}
+            compact = True
+
+        def get_data(self, *args, **kwargs):
+            return ROWS[:1]
+
+    component = BasicTable(value=TestTableSerializer)
+    component.dashboard = dashboard
+    component.key = "test"
+    context = Context({"component": component, "request": rf.get("/")})
+
+    html = render_component_test(context, htmx=False)
+
+    assert "<td>b</td>" in html
+    assert "<td>Two</td>" in html
+
+
+@pytest.fixture
+def keyset_users():
+    # duplicate first names and null last logins, so ties and nulls are paged
+    User.objects.bulk_create(
+        User(
+            username=f"user{u:02}",
+            first_name=["Ann", "bob", "Cat"][u % 3],
+            last_login=timezone.now() - timedelta(days=u) if u % 4 else None,
+        )
+        for u in range(0, 23)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "filters,ordering",
+    [
+        ({}, []),
+        ({"order[0][column]": "1", "order[0][dir]": "desc"}, []),
+        (
+            {
+                "order[0][column]": "1",
+                "order[0][dir]": "asc",
+                "order[1][column]": "0",
+                "order[1][dir]": "desc",
+            },
+            [],
+        ),
+        ({"search[value]": "user1"}, []),
+        ({}, [F("last_login").asc(nulls_last=True)]),
+        ({}, [F("last_login").desc(nulls_last=True), "first_name"]),
+    ],
+)
+def test_serializer__keyset_pagination__matches_offset(
+    filters, ordering, test_user_serializer__qs, keyset_users, clear_cache
+):
+    test_user_serializer__qs.get_queryset = lambda *a, **k: User.objects.order_by(
+        *ordering
+    )
+
+    def get_pages():
+        pages = []
+        for start in range(0, 25, 5):
+            result = test_user_serializer__qs.serialize(
+                filters={**filters, "start": start, "length": 5}
+            )
+            pages.append((result.data, result.filtered))
+
+        return pages
+
+    expected = get_pages()
+    test_user_serializer__qs._meta.keyset_pagination = True
+
+    # first pass seeks forward, second pass reuses the cached cursors
+    assert get_pages() == expected
+    assert get_pages() == expected
+
+
+@pytest.mark.django_db
+def test_serializer__keyset_pagination__seeks_from_cursor(
+    test_user_serializer__qs, keyset_users, clear_cache
+):
+    test_user_serializer__qs._meta.keyset_pagination = True
+    filters = {"order[0][column]": "1", "order[0][dir]": "desc", "length": "5"}
+
+    with CaptureQueriesContext(connection) as first:
+        test_user_serializer__qs.serialize(filters={**filters, "start": "0"})
+
+    with CaptureQueriesContext(connection) as next:
+        result = test_user_serializer__qs.serialize(filters={**filters, "start": "5"})
+
+    assert all(
+        "OFFSET" not in q["sql"] for q in first.captured_queries + next.captured_queries
+    )
+    assert [r["username"] for r in result.data] == [
+        "user17",
+        "user20",
+        "user01",
+        "user04",
+        "user07",
+    ]
+
+
+@pytest.mark.django_db
+def test_serializer__keyset_pagination__jump_falls_back_to_offset(
+    test_user_serializer__qs, keyset_users, clear_cache
+):
+    test_user_serializer__qs._meta.keyset_pagination = True
+    filters = {"length": "5"}
+
+    with CaptureQueriesContext(connection) as jump:
+        jumped = test_user_serializer__qs.serialize(filters={**filters, "start": "15"})
+
+    with CaptureQueriesContext(connection) as next:
+        result = test_user_serializer__qs.serialize(filters={**filters, "start": "20"})
+
+    assert any("OFFSET" in q["sql"] for q in jump.captured_queries)
+    assert all("OFFSET" not in q["sql"] for q in next.captured_queries)
+    assert [r["username"] for r in jumped.data][0] == "user15"
+    assert [r["username"] for r in result.data] == ["user20", "user21", "user22"]
+
+
+@pytest.fixture
+def group_users():
+    g1, g2 = Group.objects.create(name="g1"), Group.objects.create(name="g2")
+    for username in ["a", "b", "c"]:
+        User.objects.create(username=username).groups.add(g1)
+
+    User.objects.create(username="0").groups.add(g2)
+
+    return g1, g2
+
+
+@pytest.mark.django_db
+def test_serializer__keyset_pagination__cursor_per_object(
+    test_user_serializer__qs, group_users, clear_cache
+):
+    g1, g2 = group_users
+    test_user_serializer__qs._meta.keyset_pagination = True
+    test_user_serializer__qs.get_queryset = lambda self, object, **kwargs: (
+        User.objects.filter(groups=object)
+    )
+    filters = {"order[0][column]": "0", "order[0][dir]": "asc", "length": "1"}
+
+    test_user_serializer__qs.serialize(object=g1, filters={**filters, "start": "0"})
+    test_user_serializer__qs.serialize(object=g2, filters={**filters, "start": "0"})
+    result = test_user_serializer__qs.serialize(
+        object=g1, filters={**filters, "start": "1"}
+    )
+
+    assert [r["username"] for r in result.data] == ["b"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "filters,expected_queries",
+    [
+        ({"length": "5"}, 2),  # count, page
+        ({"length": "5", "search[value]": "user1"}, 3),  # count, filtered count, page
+        ({"length": "5", "columns[0][search][value]": "user1"}, 3),
+    ],
+)
+def test_serializer__counts_once(
+    filters,
+    expected_queries,
+    test_user_serializer__qs,
+    keyset_users,
+    django_assert_num_queries,
+):
+    with django_assert_num_queries(expected_queries):
+        result = test_user_serializer__qs.serialize(filters=filters)
+
+    assert result.total == 23
+    assert result.filtered == (23 if expected_queries == 2 else 10)
+    assert len(result.data) == 5
+
+
+@pytest.mark.django_db
+def test_serializer__count_cache_timeout(
+    test_user_serializer__qs, keyset_users, clear_cache, django_assert_num_queries
+):
+    test_user_serializer__qs._meta.count_cache_timeout = 60
+    test_user_serializer__qs.serialize(filters={"length": "5"})
+    User.objects.filter(username="user00").delete()
+
+    # the total is cached regardless of paging, searching or sorting
+    with django_assert_num_queries(1):
+        result = test_user_serializer__qs.serialize(
+            filters={
+                "start": "5",
+                "length": "5",
+                "order[0][column]": "1",
+                "order[0][dir]": "desc",
+            }
+        )
+
+    assert result.total == 23
+    assert result.filtered == 23
+
+    # but not other filters, which may change the data
+    result = test_user_serializer__qs.serialize(filters={"length": "5", "key": "1"})
+
+    assert result.total == 22
+
+
+@pytest.mark.django_db
+def test_serializer__count_cache_timeout__per_object(
+    test_user_serializer__qs, group_users, clear_cache
+):
+    g1, g2 = group_users
+    test_user_serializer__qs._meta.count_cache_timeout = 60
+    test_user_serializer__qs.get_queryset = lambda self, object, **kwargs: (
+        User.objects.filter(groups=object)
+    )
+
+    test_user_serializer__qs.serialize(object=g1, filters={"length": "5"})
+    result = test_user_serializer__qs.serialize(object=g2, filters={"length": "5"})
+
+    assert result.total == 1
+    assert result.filtered == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("serializer", ["qs", "list"])
+def test_serializer__capped_count(
+    serializer, test_user_serializer__qs, test_user_serializer__list, keyset_users
+):
+    serializer_class = {
+        "qs": test_user_serializer__qs,
+        "list": test_user_serializer__list,
+    }[serializer]
+    serializer_class._meta.count_strategy = CappedCount(limit=15)
+
+    result = serializer_class.serialize(filters={"length": "5"})
+
+    assert result.total == 15
+    assert result.filtered == 15
+
+    result = serializer_class.serialize(
+        filters={"length": "5", "search[value]": "user1"}
+    )
+
+    assert result.total == 15
+    assert result.filtered == 10
+
+
+@pytest.mark.django_db
+def test_estimated_count(keyset_users):
+    count = EstimatedCount(threshold=10)
+
+    # sqlite has no estimate, so is counted exactly
+    assert count.count(User.objects.all()) == 23
+
+    with patch.object(EstimatedCount, "estimate", return_value=1000):
+        assert count.count(User.objects.all()) == 1000
+
+    with patch.object(EstimatedCount, "estimate", return_value=5):
+        assert count.count(User.objects.all()) == 23
+
+
+@pytest.mark.django_db
+def test_estimated_count__only_unfiltered_querysets():
+    count = EstimatedCount()
+
+    assert count.estimate(User.objects.filter(username="a")) is None
+    assert count.estimate(User.objects.distinct()) is None
+    assert count.estimate(list(User.objects.all())) is None
+
+
+@pytest.mark.parametrize(
+    "data", [ROWS, pd.DataFrame(ROWS), ColumnarTable.from_data(ROWS)]
+)
+def test_serializer__export__csv(data):
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name", "group": "Group"}
+            export_chunk_size = 1
+
+        def get_data(self, *args, **kwargs):
+            return data
+
+    exported = TestTableSerializer.export(
+        "csv", filters={"search[value]": "t", "order[0][column]": "0"}
+    )
+
+    assert list(exported) == [
+        "Name,Group\r\n",
+        "b,Two\r\n",
+        "c,two\r\n",
+    ]
+
+
+@pytest.mark.django_db
+def test_serializer__export__ndjson_queryset(test_user_serializer__qs):
+    for username in ["c", "a", "b", "ab"]:
+        fake_user(username=username, first_name=username)
+
+    exported = "".join(
+        test_user_serializer__qs.export(
+            "ndjson",
+            filters={
+                "search[value]": "a",
+                "order[0][column]": "0",
+                "order[0][dir]": "desc",
+                "length": "1",
+            },
+        )
+    )
+
+    assert exported.endswith("\n")
+    assert [json.loads(line) for line in exported.splitlines()] == [
+        {"username": "ab", "first_name": "AB"},
+        {"username": "a", "first_name": "A"},
+    ]
+
+
+@pytest.mark.django_db
+def test_serializer__export__queryset_iterated_in_chunks():
+    for username in range(5):
+        fake_user(username=str(username))
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"username": "Username"}
+            model = User
+            export_chunk_size = 2
+
+    exported = TestTableSerializer.export("csv", filters={"order[0][column]": "0"})
+
+    with patch.object(
+        QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator
+    ) as iterator:
+        assert next(exported) == "Username\r\n"
+        assert next(exported) == "0\r\n1\r\n"
+
+    assert iterator.call_args.kwargs == {"chunk_size": 2}
+
+
+@pytest.mark.django_db
+def test_serializer__export__queryset_prefetched_in_slices():
+    for username in range(5):
+        fake_user(username=str(username))
+
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"username": "Username"}
+            export_chunk_size = 2
+
+        def get_queryset(self, *args, **kwargs):
+            return User.objects.prefetch_related("groups")
+
+    with patch("dashboards.component.table.export.ITERATOR_PREFETCHES", False):
+        with patch.object(QuerySet, "iterator", autospec=True) as iterator:
+            exported = list(
+                TestTableSerializer.export("csv", filters={"order[0][column]": "0"})
+            )
+
+    iterator.assert_not_called()
+    assert exported == ["Username\r\n", "0\r\n1\r\n", "2\r\n3\r\n", "4\r\n"]
+
+
+def test_serializer__export__csv_formulas_escaped():
+    class TestTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"name": "Name"}
+
+        def get_data(self, *args, **kwargs):
+            return [
+                {"name": '=HYPERLINK("http://example.com")'},
+                {"name": "+1+1"},
+                {"name": "@SUM(A1)"},
+                {"name": "-1.5"},
+                {"name": "a=b"},
+            ]
+
+    assert "".join(TestTableSerializer.export("csv")) == (
+        "Name\r\n"
+        '"\'=HYPERLINK(""http://example.com"")"\r\n'
+        "'+1+1\r\n"
+        "'@SUM(A1)\r\n"
+        "-1.5\r\n"
+        "a=b\r\n"
+    )
+
+
+def test_serializer__export__invalid_format(test_user_serializer__list):
+    with pytest.raises(ValueError):
+        test_user_serializer__list.export("xlsx")
+
+
+def test_table__get_export_url(dashboard, test_user_serializer__list):
+    table = Table(value=test_user_serializer__list)
+    table.dashboard = dashboard
+    table.key = "table"
+
+    assert (
+        table.get_export_url()
+        == "/dash/app1/testdashboard/@component/table/@export/csv/"
+    )
+    assert table.get_export_url("ndjson").endswith("/@export/ndjson/")
+
+
 @pytest.mark.django_db
 def test_no_columns():
     with pytest.raises(ImproperlyConfigured):
@@ -1,6 +1,13 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.db import connections
+
+import asset_definitions
 import pytest
 
-from dashboards.component import Text
+from dashboards.component import Chart, Text
 from dashboards.dashboard import Dashboard
 from tests.dashboards.app1.dashboards import TestDashboard, TestModelDashboard
 
@@ -20,24 +27,20 @@ def test__get_attributes_order__with_parent(complex_dashboard, snapshot):
 
 def test__get_components__no_layout(dashboard, rf):
     request = rf.get("/")
+    keys = ["component_1", "component_2", "component_3"]
+
     assert dashboard(request=request).get_components() == [
-        dashboard.components["component_1"],
-        dashboard.components["component_2"],
-        dashboard.components["component_3"],
+        dashboard.bind_component(key, dashboard.components[key]) for key in keys
     ]
 
 
 def test__get_components__with_parent__no_layout(complex_dashboard, rf):
     request = rf.get("/")
+    keys = [f"component_{i}" for i in range(1, 8)]
 
     assert complex_dashboard(request=request).get_components() == [
-        complex_dashboard.components["component_1"],
-        complex_dashboard.components["component_2"],
-        complex_dashboard.components["component_3"],
-        complex_dashboard.components["component_4"],
-        complex_dashboard.components["component_5"],
-        complex_dashboard.components["component_6"],
-        complex_dashboard.components["component_7"],
+        complex_dashboard.bind_component(key, complex_dashboard.components[key])
+        for key in keys
     ]
 
 
@@ -80,6 +83,140 @@ def test_dashboard__with_get_FOO_methods(dashboard, rf):
     )
 
 
+def test_dashboard__get_FOO_methods__not_set_on_class_components(rf):
+    class TestDashboardHooks(Dashboard):
+        component_value = Text()
+
+        class Meta:
+            app_label = "dashboardtest"
+
+        def get_component_value_value(self, **kwargs):
+            return "Foo"
+
+    dashboard = TestDashboardHooks(request=rf.get("/"))
+
+    assert TestDashboardHooks.component_hooks == {
+        "component_value": [("value", "get_component_value_value")]
+    }
+    assert dashboard.components["component_value"].value == (
+        dashboard.get_component_value_value
+    )
+    assert TestDashboardHooks.components["component_value"].value is None
+
+
+def test_dashboard__components_compiled(dashboard):
+    component = dashboard.components["component_1"]
+
+    assert component.key == "component_1"
+    assert component.verbose_name == "component_1"
+    assert component.render_type == "Text"
+    # the spec is shared with subclasses, so is bound to a dashboard per instance
+    assert component.dashboard is None
+    assert dashboard.bind_component("component_1", component).dashboard == dashboard
+
+
+@pytest.mark.django_db
+def test_dashboard__components_bound_per_instance(rf, model_dashboard, user):
+    request = rf.get("/")
+    dashboard = model_dashboard(request=request, lookup=user.pk)
+    other = model_dashboard(request=request, lookup=user.pk)
+    dashboard.get_components()
+
+    assert dashboard.components["component_1"] is not (
+        model_dashboard.components["component_1"]
+    )
+    assert dashboard.components["component_1"].object == user
+    assert other.components["component_1"].object is None
+    assert model_dashboard.components["component_1"].object is None
+
+
+@pytest.mark.parametrize("is_abstract", [True, False])
+def test_dashboard__inherited_components_bound_to_subclass(is_abstract, rf):
+    class TestParentDashboard(Dashboard):
+        component = Text(value="value")
+
+        class Meta:
+            app_label = "dashboardtest"
+            abstract = is_abstract
+
+    class TestChildDashboard(TestParentDashboard):
+        class Meta:
+            app_label = "dashboardtest"
+
+    child = TestChildDashboard(request=rf.get("/")).get_components()[0]
+    parent = TestParentDashboard(request=rf.get("/")).get_components()[0]
+
+    assert child.dashboard is TestChildDashboard
+    assert parent.dashboard is TestParentDashboard
+    assert child.get_cache_key() != parent.get_cache_key()
+    assert "testchilddashboard" in child.get_cache_key()
+    assert TestParentDashboard.components["component"].dashboard is None
+
+
+def test_dashboard__init_components_not_shared(rf):
+    class TestDashboardInit(Dashboard):
+        component = Text(value="value")
+
+        class Meta:
+            app_label = "dashboardtest"
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.components["added"] = Text(value="added")
+            self.components["component"].css_classes = "changed"
+
+    dashboard = TestDashboardInit(request=rf.get("/"))
+
+    assert [c.key for c in dashboard.get_components()] == ["component", "added"]
+    assert list(TestDashboardInit.components) == ["component"]
+    assert TestDashboardInit.components["component"].css_classes is None
+
+
+def test_dashboard__get_media(rf):
+    class TestMediaDashboard(Dashboard):
+        chart = Chart()
+
+        class Meta:
+            app_label = "dashboardtest"
+
+    media = TestMediaDashboard(request=rf.get("/")).get_media()
+
+    assert "dashboards/js/dashboard.js" in str(media)
+    assert "plotly" in str(media)
+    assert str(TestMediaDashboard(request=rf.get("/")).get_media()) == str(media)
+
+
+def test_dashboard__get_media__definition_overridden(rf):
+    class TestMediaDashboard(Dashboard):
+        chart = Chart()
+
+        class Meta:
+            app_label = "dashboardtest"
+
+        def _get_media_from_definition(self):
+            return asset_definitions.Media(js=["custom.js"])
+
+    media = str(TestMediaDashboard(request=rf.get("/")).get_media())
+
+    assert "custom.js" in media
+    assert "dashboards/js/dashboard.js" not in media
+    assert "plotly" in media
+
+
+def test_dashboard__get_media__instance_components(rf):
+    class TestMediaInitDashboard(Dashboard):
+        text = Text(value="value")
+
+        class Meta:
+            app_label = "dashboardtest"
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.components["chart"] = Chart()
+
+    assert "plotly" in str(TestMediaInitDashboard(request=rf.get("/")).get_media())
+
+
 @pytest.mark.parametrize(
     "dashboard_class",
     [
@@ -133,3 +270,175 @@ def test_dashboard_has_verbose_name_and_name___verbose_name_is_provided_verbose_
     verbose_named_meta_dashboard,
 ):
     assert verbose_named_meta_dashboard._meta.verbose_name == "Meta Verbose Name"
+
+
+def test_dashboard__render__parallel(rf, settings):
+    thread_names = set()
+
+    def get_value(**kwargs):
+        thread_names.add(threading.current_thread().name)
+        # hold the thread so each component is rendered on its own worker
+        time.sleep(0.05)
+        return "value"
+
+    class TestParallelDashboard(Dashboard):
+        component_1 = Text(value=get_value)
+        component_2 = Text(value=get_value)
+        component_3 = Text(value=get_value)
+        component_4 = Text(defer=get_value)
+
+        class Meta:
+            app_label = "dashboardtest"
+
+    request = rf.get("/")
+    html = TestParallelDashboard(request=request).render(request=request)
+
+    settings.DASHBOARDS_MAX_WORKERS = 3
+    dashboard = TestParallelDashboard(request=request)
+
+    assert dashboard.render(request=request) == html
+    assert list(dashboard.rendered_components) == [
+        "component_1",
+        "component_2",
+        "component_3",
+    ]
+    assert len(thread_names) == 4
+
+
+@pytest.mark.parametrize(
+    "meta_max_workers,setting_max_workers,expected",
+    [
+        (None, None, None),
+        (None, 4, 4),
+        (2, 4, 2),
+        (1, 4, 1),
+    ],
+)
+def test_dashboard__get_max_workers(
+    meta_max_workers, setting_max_workers, expected, rf, settings
+):
+    settings.DASHBOARDS_MAX_WORKERS = setting_max_workers
+
+    class TestWorkersDashboard(Dashboard):
+        class Meta:
+            app_label = "dashboardtest"
+            max_workers = meta_max_workers
+
+    assert TestWorkersDashboard(request=rf.get("/")).get_max_workers() == expected
+
+
+def test_dashboard__render__batch_deferred(rf):
+    class TestBatchDashboard(Dashboard):
+        component_1 = Text(value="value")
+        component_2 = Text(defer=lambda **kwargs: "value")
+        component_3 = Text(defer=lambda **kwargs: "value")
+        component_4 = Text(defer=lambda **kwargs: "value", poll_rate=10)
+
+        class Meta:
+            app_label = "app1"
+            batch_deferred = True
+
+    request = rf.get("/")
+    html = TestBatchDashboard(request=request).render(request=request)
+
+    assert html.count("hx-get") == 2
+    assert (
+        'hx-get="/dash/app1/testbatchdashboard/@components/'
+        '?component=component_2&amp;component=component_3"' in html
+    )
+    assert 'id="component-dashapp1testbatchdashboardcomponentcomponent_2-inner"' in (
+        html
+    )
+
+
+def test_dashboard__render__not_batched(rf, complex_dashboard):
+    request = rf.get("/")
+    html = complex_dashboard(request=request).render(request=request)
+
+    assert "@components" not in html
+
+
+class TestStreamDashboard(Dashboard):
+    component_1 = Text(value="value 1")
+    component_2 = Text(value="value 2")
+    component_3 = Text(defer=lambda **kwargs: "value 3")
+
+    class Meta:
+        app_label = "app1"
+        stream = True
+
+
+def test_dashboard__render__streaming(rf):
+    request = rf.get("/")
+    dashboard = TestStreamDashboard(request=request)
+    dashboard.streaming = True
+    html = dashboard.render(request=request)
+
+    assert dashboard.stream_keys == ["component_1", "component_2"]
+    assert "value 1" not in html
+    assert 'id="component-dashapp1teststreamdashboardcomponentcomponent_1-inner"' in (
+        html
+    )
+
+    chunks = list(dashboard.stream_components())
+
+    assert len(chunks) == 2
+    assert "value 1" in chunks[0]
+    assert "Dashboard.swapStreamed" in chunks[0]
+    assert "value 2" in chunks[1]
+
+
+def test_dashboard__stream_components__parallel(rf, settings):
+    settings.DASHBOARDS_MAX_WORKERS = 2
+    request = rf.get("/")
+    dashboard = TestStreamDashboard(request=request)
+    dashboard.streaming = True
+    dashboard.render(request=request)
+    chunks = "".join(dashboard.stream_components())
+
+    assert "value 1" in chunks
+    assert "value 2" in chunks
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dashboard__render_components_parallel__connection_per_worker(rf, settings):
+    settings.DASHBOARDS_MAX_WORKERS = 2
+    opened = []
+
+    def value(**kwargs):
+        connection = connections["default"]
+        if connection.connection is None:
+            opened.append(connection)
+            connection.ensure_connection()
+
+        return "value"
+
+    class TestConnectionsDashboard(Dashboard):
+        component_1 = Text(value=value)
+        component_2 = Text(value=value)
+        component_3 = Text(value=value)
+        component_4 = Text(value=value)
+
+        class Meta:
+            app_label = "app1"
+
+    request = rf.get("/")
+    with patch.object(
+        type(connections["default"]), "close", autospec=True
+    ) as close_mock:
+        TestConnectionsDashboard(request=request).render(request=request)
+
+    # each worker reuses its connection, closing it once all are rendered
+    assert 1 <= len(opened) <= 2
+    closed = [call.args[0] for call in close_mock.call_args_list]
+    assert len(closed) == len(opened)
+    assert {id(c) for c in closed} == {id(c) for c in opened}
+
+
+def test_dashboard__stream_components__not_streaming(rf):
+    request = rf.get("/")
+    dashboard = TestStreamDashboard(request=request)
+    html = dashboard.render(request=request)
+
+    assert "value 1" in html
+    assert list(dashboard.stream_components()) == []
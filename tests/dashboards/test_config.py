@@ -0,0 +1,60 @@
+from dashboards.component import Text
+from dashboards.component.layout import DEFAULT_LAYOUT_COMPONENT_CLASSES
+from dashboards.component.text import Stat
+from dashboards.config import Config, get_config
+from dashboards.dashboard import Dashboard
+from dashboards.permissions import AllowAny, IsAdminUser
+
+
+def test_get_config__cached():
+    assert get_config() is get_config()
+
+
+def test_get_config__reset_on_setting_changed(settings):
+    config = get_config()
+    settings.DASHBOARDS_DEFAULT_GRID_CSS = "span-12"
+
+    assert get_config() is not config
+    assert get_config().DASHBOARDS_DEFAULT_GRID_CSS == "span-12"
+
+
+def test_permission_classes(settings):
+    assert get_config().permission_classes == [AllowAny]
+
+    settings.DASHBOARDS_DEFAULT_PERMISSION_CLASSES = [
+        "dashboards.permissions.IsAdminUser"
+    ]
+
+    assert get_config().permission_classes == [IsAdminUser]
+
+
+def test_get_dashboard_permissions__default(settings):
+    class TestPermissionDashboard(Dashboard):
+        component = Text(value="value")
+
+        class Meta:
+            app_label = "app1"
+
+    settings.DASHBOARDS_DEFAULT_PERMISSION_CLASSES = [
+        "dashboards.permissions.IsAdminUser"
+    ]
+    (permission,) = TestPermissionDashboard.get_dashboard_permissions()
+
+    assert isinstance(permission, IsAdminUser)
+
+
+def test_layout_component_classes__defaults_not_changed(settings):
+    settings.DASHBOARDS_LAYOUT_COMPONENT_CLASSES = {"Card": {"card": "custom"}}
+
+    assert Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["Card"] == {
+        **DEFAULT_LAYOUT_COMPONENT_CLASSES["Card"],
+        "card": "custom",
+    }
+    assert DEFAULT_LAYOUT_COMPONENT_CLASSES["Card"]["card"] == "card"
+
+
+def test_component_classes__not_shared():
+    stat = Stat(css_classes={"stat": "custom"})
+
+    assert stat.css_classes == {**Stat().css_classes, "stat": "custom"}  # type: ignore
+    assert Stat().css_classes == get_config().DASHBOARDS_COMPONENT_CLASSES["Stat"]
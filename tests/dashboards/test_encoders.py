@@ -0,0 +1,183 @@
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import pytest
+
+from dashboards import encoders
+from dashboards.component.chart import ChartSerializer
+from dashboards.config import Config, get_config
+from dashboards.encoders import DashboardsJSONEncoder, JSONEncoder, ORJSONEncoder
+from tests.dashboards.fakes import fake_user
+
+
+class Colour(Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: Any
+    y: Any
+
+
+@dataclass
+class Series:
+    name: str
+    points: List[Point]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "encoder",
+    [
+        JSONEncoder(),
+        pytest.param(
+            ORJSONEncoder(),
+            marks=pytest.mark.skipif(encoders.orjson is None, reason="needs orjson"),
+        ),
+    ],
+)
+def test_encoder__values(encoder):
+    fake_user(username="abc")
+
+    value = {
+        "datetime": datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "decimal": Decimal("1.50"),
+        "uuid": uuid.UUID("12345678123456781234567812345678"),
+        "array": np.array([1, 2, 3]),
+        "scalar": np.float64(1.5),
+        "series": Series(name="a", points=[Point(x=1, y=np.int64(2))]),
+        "enum": Colour.RED,
+        "queryset": User.objects.values_list("username", flat=True),
+    }
+
+    encoded = json.loads(encoder.dumps(value))
+
+    assert encoded["datetime"].startswith("2023-01-02T03:04:05")
+    assert encoded["decimal"] == "1.50"
+    assert encoded["uuid"] == "12345678-1234-5678-1234-567812345678"
+    assert encoded["array"] == [1, 2, 3]
+    assert encoded["scalar"] == 1.5
+    assert encoded["series"] == {"name": "a", "points": [{"x": 1, "y": 2}]}
+    assert encoded["enum"] == "red"
+    assert encoded["queryset"] == ["abc"]
+    assert json.loads(encoder.dumpb(value)) == encoded
+
+
+@pytest.mark.parametrize(
+    "encoder",
+    [
+        JSONEncoder(),
+        pytest.param(
+            ORJSONEncoder(),
+            marks=pytest.mark.skipif(encoders.orjson is None, reason="needs orjson"),
+        ),
+    ],
+)
+def test_encoder__pandas(encoder):
+    value = {
+        "dates": pd.Series(
+            pd.to_datetime(["2023-01-01 00:00", "2023-01-02 10:30", None])
+        ),
+        "floats": np.array([1.5, np.nan]),
+        "index": pd.Index([1, 2]),
+        "timestamp": pd.Timestamp("2023-01-01 10:30"),
+    }
+
+    assert json.loads(encoder.dumps(value)) == {
+        "dates": ["2023-01-01T00:00:00", "2023-01-02T10:30:00", None],
+        "floats": [1.5, None],
+        "index": [1, 2],
+        "timestamp": "2023-01-01T10:30:00",
+    }
+
+
+@pytest.mark.parametrize(
+    "encoder",
+    [
+        JSONEncoder(),
+        pytest.param(
+            ORJSONEncoder(),
+            marks=pytest.mark.skipif(encoders.orjson is None, reason="needs orjson"),
+        ),
+    ],
+)
+def test_encoder__unsupported(encoder):
+    with pytest.raises(TypeError):
+        encoder.dumps({"value": object()})
+
+
+@pytest.mark.skipif(encoders.orjson is None, reason="needs orjson")
+def test_orjson_encoder__same_as_json_encoder():
+    value = {
+        "aware": datetime(2023, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "naive": datetime(2023, 1, 2, 3, 4, 5, 123456),
+        "date": date(2023, 1, 2),
+        "time": time(3, 4, 5, 123456),
+        "timestamp": pd.Timestamp("2023-01-02 03:04:05.123456", tz="UTC"),
+        "dates": np.array(["2023-01-02T03:04:05.123456"], dtype="datetime64[us]"),
+        "floats": np.array([1.5, np.nan]),
+        "duration": timedelta(days=1, seconds=5),
+        "decimal": Decimal("1.50"),
+        1: "non str key",
+    }
+
+    # orjson has no whitespace between items
+    compact = json.dumps(value, cls=DashboardsJSONEncoder, separators=(",", ":"))
+
+    assert ORJSONEncoder().dumps(value) == compact
+    assert json.loads(compact)["aware"] == "2023-01-02T03:04:05.123Z"
+
+
+@pytest.mark.skipif(encoders.orjson is None, reason="needs orjson")
+def test_json_encoder__default():
+    assert type(get_config().json_encoder) is ORJSONEncoder
+    assert encoders.dumps({"a": 1}) == '{"a":1}'
+
+
+def test_json_encoder__default__without_orjson():
+    with patch("dashboards.config.find_spec", return_value=None):
+        assert type(Config().json_encoder) is JSONEncoder
+
+
+def test_json_encoder__setting(settings):
+    settings.DASHBOARDS_JSON_ENCODER = "dashboards.encoders.JSONEncoder"
+
+    assert type(get_config().json_encoder) is JSONEncoder
+    assert encoders.dumps({"a": 1}) == '{"a": 1}'
+
+
+@pytest.mark.parametrize(
+    "encoder",
+    [
+        "dashboards.encoders.JSONEncoder",
+        pytest.param(
+            "dashboards.encoders.ORJSONEncoder",
+            marks=pytest.mark.skipif(encoders.orjson is None, reason="needs orjson"),
+        ),
+    ],
+)
+def test_chart_serializer__encoder(encoder, settings):
+    settings.DASHBOARDS_JSON_ENCODER = encoder
+
+    class TestChartSerializer(ChartSerializer):
+        def get_data(self, *args, **kwargs):
+            return {"x": np.arange(3), "y": np.array([1.5, 2.5, 3.5])}
+
+        def to_fig(self, data):
+            return px.line(data, x="x", y="y")
+
+    fig = json.loads(encoders.dumps(TestChartSerializer.serialize()))
+
+    assert fig["data"][0]["y"] == [1.5, 2.5, 3.5]
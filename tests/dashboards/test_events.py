@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from dashboards.component import Text
+from dashboards.dashboard import Dashboard
+from dashboards.events import (
+    CacheEventBackend,
+    Event,
+    get_event_backend,
+    publish_component,
+    publish_value,
+)
+
+
+class LiveDashboard(Dashboard):
+    live_component = Text(value="live value", live=True, poll_rate=10)
+    component = Text(value="value")
+
+    class Meta:
+        app_label = "app1"
+
+
+pytestmark = pytest.mark.usefixtures("clear_cache")
+
+
+def test_event__encode():
+    event = Event(id=3, event="component", data="line 1\nline 2")
+
+    assert event.encode() == ("id: 3\nevent: component\ndata: line 1\ndata: line 2\n\n")
+
+
+def test_get_event_backend__default():
+    assert isinstance(get_event_backend(), CacheEventBackend)
+
+
+def test_cache_event_backend__get_events():
+    backend = CacheEventBackend()
+
+    assert backend.get_last_id("channel") == 0
+    assert backend.publish("channel", "component", "1") == 1
+    assert backend.publish("channel", "component", "2") == 2
+    assert backend.publish("other", "component", "3") == 1
+
+    assert backend.get_events("channel", 0) == [
+        Event(id=1, event="component", data="1"),
+        Event(id=2, event="component", data="2"),
+    ]
+    assert backend.get_events("channel", 1) == [
+        Event(id=2, event="component", data="2")
+    ]
+    assert backend.get_events("channel", 2) == []
+
+
+def test_cache_event_backend__get_events__max_events():
+    backend = CacheEventBackend()
+    backend.max_events = 2
+    for i in range(5):
+        backend.publish("channel", "component", str(i))
+
+    assert [e.id for e in backend.get_events("channel", 0)] == [4, 5]
+
+
+def test_publish_component():
+    event_id = publish_component(LiveDashboard, "live_component")
+    (event,) = get_event_backend().get_events(LiveDashboard.get_slug(), 0)
+    data = json.loads(event.data)
+
+    assert event.id == event_id
+    assert event.event == "component"
+    assert data["target"] == (
+        "component-dashapp1livedashboardcomponentlive_component-inner"
+    )
+    assert "live value" in data["html"]
+
+
+def test_publish_value():
+    publish_value(LiveDashboard, "live_component", {"text": "100%"})
+    (event,) = get_event_backend().get_events(LiveDashboard.get_slug(), 0)
+
+    assert json.loads(event.data) == {
+        "target": "component-dashapp1livedashboardcomponentlive_component-inner",
+        "value": {"text": "100%"},
+    }
+
+
+def test_dashboard__render__live(rf):
+    request = rf.get("/")
+    html = LiveDashboard(request=request).render(request=request)
+
+    assert 'Dashboard.connectEvents("/dash/app1/livedashboard/@events/")' in html
+    assert "every 10s" not in html
+
+
+def test_dashboard__render__not_live(rf, dashboard):
+    request = rf.get("/")
+    html = dashboard(request=request).render(request=request)
+
+    assert "connectEvents" not in html
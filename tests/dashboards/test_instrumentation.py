@@ -0,0 +1,160 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from dashboards.component import Text
+from dashboards.dashboard import Dashboard
+from dashboards.instrumentation import (
+    Timing,
+    instrument,
+    record_timings,
+    timings_recorded,
+)
+from dashboards.views import AsyncComponentView, ComponentView, DashboardView
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+class InstrumentedDashboard(Dashboard):
+    users = Text(value=lambda **kwargs: str(User.objects.count()))
+    cached = Text(defer=lambda **kwargs: "cached", cache_timeout=60)
+
+    class Meta:
+        app_label = "app1"
+
+
+@pytest.fixture
+def instrumentation(settings):
+    cache.clear()
+    settings.DASHBOARDS_INSTRUMENTATION = True
+    yield
+    cache.clear()
+
+
+def test_instrument__not_recording():
+    with instrument("component", "value") as timing:
+        pass
+
+    assert timing is None
+
+
+def test_record_timings__disabled():
+    with record_timings() as timings:
+        with instrument("component", "value") as timing:
+            pass
+
+    assert timings is None
+    assert timing is None
+
+
+@pytest.mark.django_db
+def test_record_timings(instrumentation):
+    with record_timings() as timings:
+        with instrument("component", "value"):
+            User.objects.count()
+
+    assert timings is not None
+    (timing,) = timings
+    assert timing.name == "component"
+    assert timing.stage == "value"
+    assert timing.queries == 1
+    assert timing.duration >= timing.query_duration
+
+
+def test_timing__get_server_timing():
+    timing = Timing(
+        name="component",
+        stage="value",
+        duration=1.234,
+        queries=2,
+        query_duration=0.5,
+        cache="hit",
+    )
+
+    assert timing.get_server_timing() == (
+        'component.value;dur=1.23;desc="queries=2 query_dur=0.50 cache=hit"'
+    )
+
+
+@pytest.mark.django_db
+def test_dashboard_view__server_timing(rf, instrumentation):
+    received = []
+
+    def receiver(sender, request, timings, **kwargs):
+        received.append(timings)
+
+    timings_recorded.connect(receiver)
+    try:
+        request = rf.get("/")
+        view = DashboardView.as_view(dashboard_class=InstrumentedDashboard)
+        response = view(request)
+    finally:
+        timings_recorded.disconnect(receiver)
+
+    assert response.is_rendered
+    server_timing = response.headers["Server-Timing"]
+    assert "users.value;" in server_timing
+    assert 'desc="queries=1' in server_timing
+    assert "users.render;" in server_timing
+    assert "layout.render;" in server_timing
+    assert "cached.value" not in server_timing
+    assert len(received) == 1
+    assert {(t.name, t.stage) for t in received[0]} >= {
+        ("users", "value"),
+        ("layout", "render"),
+    }
+
+
+def test_dashboard_view__disabled(rf):
+    request = rf.get("/")
+    response = DashboardView.as_view(dashboard_class=InstrumentedDashboard)(request)
+
+    assert "Server-Timing" not in response.headers
+
+
+def test_component_view__server_timing__cache(rf, instrumentation):
+    view = ComponentView.as_view(dashboard_class=InstrumentedDashboard)
+    response = view(rf.get("/"), component="cached")
+
+    assert "cached.value;" in response.headers["Server-Timing"]
+    assert "cache=miss" in response.headers["Server-Timing"]
+
+    response = view(rf.get("/"), component="cached")
+
+    assert "cache=hit" in response.headers["Server-Timing"]
+
+
+def test_async_component_view__server_timing(rf, instrumentation):
+    view = AsyncComponentView.as_view(dashboard_class=InstrumentedDashboard)
+    response = async_to_sync(view)(rf.get("/"), component="cached")
+
+    assert "cached.value;" in response.headers["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_dashboard__render_parallel__recorded(rf, settings, instrumentation):
+    class ParallelInstrumentedDashboard(Dashboard):
+        one = Text(value="one")
+        two = Text(value="two")
+
+        class Meta:
+            app_label = "app1"
+            max_workers = 2
+
+    request = rf.get("/")
+    with record_timings() as timings:
+        ParallelInstrumentedDashboard(request=request).render(request=request)
+
+    assert timings is not None
+    assert {(t.name, t.stage) for t in timings} == {
+        ("one", "render"),
+        ("two", "render"),
+        ("one", "value"),
+        ("two", "value"),
+        ("layout", "render"),
+    }
@@ -55,6 +55,8 @@ def test_include_dashboard_views__true():
             "app1_testnometadashboard",  # app1_ even with no meta
             "form_component",
             "dashboard_component",
+            "dashboard_components",
+            "dashboard_events",
         ]
     )
 
@@ -165,3 +167,58 @@ def test_at_is_not_valid_in_form_and_component_names():
                 "component": "@component",
             },
         )
+
+
+def test_dashboard_component_export___does_not_clash_with_the_component_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_component_export",
+        app_label="app1",
+        dashboard="testdashboard",
+        component="component_1",
+        export_format="csv",
+    )
+
+
+def test_model_dashboard_component_export___does_not_clash_with_the_component_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_component_export",
+        app_label="app1",
+        dashboard="testmodeldashboard",
+        lookup="1",
+        component="component_1",
+        export_format="csv",
+    )
+
+
+def test_dashboard_components___does_not_clash_with_the_dashboard_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_components",
+        app_label="app1",
+        dashboard="testdashboard",
+    )
+
+
+def test_model_dashboard_components___does_not_clash_with_the_dashboard_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_components",
+        app_label="app1",
+        dashboard="testmodeldashboard",
+        lookup="1",
+    )
+
+
+def test_dashboard_events___does_not_clash_with_the_dashboard_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_events",
+        app_label="app1",
+        dashboard="testdashboard",
+    )
+
+
+def test_model_dashboard_events___does_not_clash_with_the_dashboard_urls():
+    assert_url_roundtrip(
+        "dashboards:dashboard_events",
+        app_label="app1",
+        dashboard="testmodeldashboard",
+        lookup="1",
+    )
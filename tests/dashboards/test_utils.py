@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.utils import translation
+
+import pytest
+
+from dashboards.component import CTA
+from dashboards.utils import cached_reverse
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+def test_cached_reverse():
+    with patch("dashboards.utils.reverse", side_effect=reverse) as reverse_mock:
+        url = cached_reverse("dashboards:dashboard_components", args=["app1", "a"])
+        cached_url = cached_reverse(
+            "dashboards:dashboard_components", args=["app1", "a"]
+        )
+
+    assert url == cached_url == "/dash/app1/a/@components/"
+    reverse_mock.assert_called_once()
+
+
+def test_cached_reverse__url_conf_changed(settings):
+    cached_reverse("dashboards:dashboard_components", args=["app1", "b"])
+    settings.ROOT_URLCONF = "tests.urls"
+
+    with patch("dashboards.utils.reverse", side_effect=reverse) as reverse_mock:
+        cached_reverse("dashboards:dashboard_components", args=["app1", "b"])
+
+    reverse_mock.assert_called_once()
+
+
+def test_cached_reverse__language_changed():
+    with patch("dashboards.utils.reverse", side_effect=reverse) as reverse_mock:
+        with translation.override("en"):
+            cached_reverse("dashboards:dashboard_components", args=["app1", "c"])
+
+        with translation.override("fr"):
+            cached_reverse("dashboards:dashboard_components", args=["app1", "c"])
+
+    assert reverse_mock.call_count == 2
+
+
+def test_cta__get_href__dashboard(dashboard):
+    cta = CTA(dashboard="tests.dashboards.app1.dashboards.TestDashboard")
+
+    assert cta.get_href(obj=None) == "/dash/app1/testdashboard/"
+
+
+@pytest.mark.django_db
+def test_cta__get_href__model_dashboard(model_dashboard, user):
+    cta = CTA(dashboard="tests.dashboards.app1.dashboards.TestModelDashboard")
+
+    assert cta.get_href(obj=user) == f"/dash/app1/testmodeldashboard/{user.pk}/"
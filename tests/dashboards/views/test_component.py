@@ -1,9 +1,24 @@
+import json
+from unittest.mock import patch
+
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 
 import pytest
-
-from dashboards.views import ComponentView
+from asgiref.sync import async_to_sync
+
+from dashboards import encoders
+from dashboards.component import Text
+from dashboards.dashboard import Dashboard
+from dashboards.events import CacheEventBackend, get_event_backend
+from dashboards.views import (
+    AsyncComponentView,
+    AsyncEventsView,
+    ComponentsView,
+    ComponentView,
+    EventsView,
+    ExportComponentView,
+)
 
 
 pytest_plugins = [
@@ -146,3 +161,325 @@ def test_admin_only_dashboard__with_permission(
     view.setup(request, component="component_1")
 
     assert view.dispatch(request).status_code == 200
+
+
+class CachedDashboard(Dashboard):
+    cached = Text(defer=lambda **kwargs: "value", cache_timeout=60, cache_rendered=True)
+
+    class Meta:
+        app_label = "app1"
+
+
+@pytest.fixture
+def cached_dashboard(clear_cache):
+    return CachedDashboard
+
+
+def test_get__cached_partial(rf, cached_dashboard):
+    request = rf.get("/", {"filter": "a"})
+    view = ComponentView(dashboard_class=cached_dashboard)
+    view.setup(request, component="cached")
+    response = view.get(request)
+
+    with patch.object(ComponentView, "get_dashboard") as get_dashboard:
+        cached_response = view.get(request)
+
+    get_dashboard.assert_not_called()
+    assert cached_response.content == response.content
+    assert "value" in cached_response.content.decode()
+
+
+@pytest.mark.parametrize(
+    "request_kwargs",
+    [
+        {"data": {"filter": "b"}},
+        {"HTTP_COOKIE": "appearanceMode=dark"},
+    ],
+)
+def test_get__cached_partial__varies(rf, cached_dashboard, request_kwargs):
+    request = rf.get("/", {"filter": "a"})
+    view = ComponentView(dashboard_class=cached_dashboard)
+    view.setup(request, component="cached")
+    view.get(request)
+
+    request = rf.get("/", **request_kwargs)
+    view.setup(request, component="cached")
+
+    assert view.get_cached_partial(request) is None
+
+
+class CachedChildDashboard(CachedDashboard):
+    class Meta:
+        app_label = "app1"
+
+
+def test_get__cached_partial__subclass(rf, cached_dashboard):
+    request = rf.get("/")
+    view = ComponentView(dashboard_class=cached_dashboard)
+    view.setup(request, component="cached")
+    view.get(request)
+
+    child_view = ComponentView(dashboard_class=CachedChildDashboard)
+    child_view.setup(request, component="cached")
+
+    # the subclass's components are its own, not cached under the parent
+    assert child_view.get_cached_partial(request) is None
+    child_view.get(request)
+    assert child_view.get_cached_partial(request) is not None
+
+
+def test_get__cached_partial__not_opted_in(rf, dashboard):
+    request = rf.get("/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    view.get(request)
+
+    assert view.get_cached_partial(request) is None
+
+
+def test_get__etag(rf, dashboard):
+    request = rf.get("/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    response = view.get(request)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+
+    request = rf.get("/", HTTP_IF_NONE_MATCH=response.headers["ETag"])
+    view.setup(request, component="component_2")
+    response = view.get(request)
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_post__not_conditional(rf, dashboard):
+    request = rf.post("/", HTTP_IF_NONE_MATCH="*")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    response = view.post(request)
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+class EtagDashboard(Dashboard):
+    component = Text(defer=lambda **kwargs: "value", etag=lambda **kwargs: "v1")
+
+    class Meta:
+        app_label = "app1"
+
+
+def test_get__etag_hook__skips_value(rf):
+    request = rf.get("/", HTTP_IF_NONE_MATCH='"v1"')
+    view = ComponentView(dashboard_class=EtagDashboard)
+    view.setup(request, component="component")
+
+    with patch.object(Text, "get_value") as get_value:
+        response = view.get(request)
+
+    get_value.assert_not_called()
+    assert response.status_code == 304
+
+
+def test_get__etag_hook__modified(rf):
+    request = rf.get("/", HTTP_IF_NONE_MATCH='"v0"')
+    view = ComponentView(dashboard_class=EtagDashboard)
+    view.setup(request, component="component")
+    response = view.get(request)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"v1"'
+
+
+async def async_value(**kwargs):
+    return "async value"
+
+
+class AsyncDashboard(Dashboard):
+    async_component = Text(defer=async_value)
+
+    class Meta:
+        app_label = "app1"
+
+
+def test_async_get(rf):
+    request = rf.get("/")
+    view = AsyncComponentView(dashboard_class=AsyncDashboard)
+    view.setup(request=request, component="async_component")
+    response = async_to_sync(view.get)(request)
+
+    assert response.status_code == 200
+    assert response.context_data["component_values"] == {
+        "async_component": "async value"
+    }
+    assert "async value" in response.rendered_content
+
+
+def test_async_get__json(rf):
+    request = rf.get("/", HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+    view = AsyncComponentView(dashboard_class=AsyncDashboard)
+    view.setup(request=request, component="async_component")
+    response = async_to_sync(view.post)(request)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.content == b'"async value"'
+
+
+@pytest.mark.parametrize(
+    "export_format,content_type,expected",
+    [
+        ("csv", "text/csv", b"A,B\r\nValue,Value b\r\n"),
+        (
+            "ndjson",
+            "application/x-ndjson",
+            encoders.dumpb({"a": "Value", "b": "Value b"}) + b"\n",
+        ),
+    ],
+)
+def test_export__get(rf, complex_dashboard, export_format, content_type, expected):
+    request = rf.get("/", {"search[value]": "value"})
+    view = ExportComponentView(dashboard_class=complex_dashboard)
+    view.setup(request=request, component="component_6", export_format=export_format)
+    response = view.get(request)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response.headers["Content-Type"] == content_type
+    assert response.headers["Content-Disposition"] == (
+        f'attachment; filename="component_6.{export_format}"'
+    )
+    assert b"".join(response.streaming_content) == expected
+
+
+@pytest.mark.parametrize(
+    "component,export_format", [("component_1", "csv"), ("component_6", "xlsx")]
+)
+def test_export__get__not_exportable(rf, complex_dashboard, component, export_format):
+    request = rf.get("/")
+    view = ExportComponentView(dashboard_class=complex_dashboard)
+    view.setup(request=request, component=component, export_format=export_format)
+
+    with pytest.raises(Http404):
+        view.get(request)
+
+
+def test_components__get(rf, complex_dashboard):
+    request = rf.get("/")
+    view = ComponentsView(dashboard_class=complex_dashboard)
+    view.setup(request=request)
+    response = view.get(request)
+    content = response.rendered_content
+
+    assert response.status_code == 200
+    assert [c.key for c in response.context_data["components"]] == [
+        "component_2",
+        "component_3",
+        "component_4",
+    ]
+    assert content.count("hx-swap-oob") == 3
+    assert "component_2-inner" in content
+
+
+def test_components__get__subset(rf, complex_dashboard):
+    request = rf.get("/", {"component": ["component_4", "component_2"]})
+    view = ComponentsView(dashboard_class=complex_dashboard)
+    view.setup(request=request)
+    response = view.get(request)
+
+    assert [c.key for c in response.context_data["components"]] == [
+        "component_4",
+        "component_2",
+    ]
+
+
+def test_components__get__not_found(rf, complex_dashboard):
+    request = rf.get("/", {"component": ["component_2", "component_10"]})
+    view = ComponentsView(dashboard_class=complex_dashboard)
+    view.setup(request=request)
+
+    with pytest.raises(Http404):
+        view.get(request)
+
+
+def test_components__post__json(rf, complex_dashboard):
+    request = rf.post("/", HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+    view = ComponentsView(dashboard_class=complex_dashboard)
+    view.setup(request=request)
+    response = view.post(request)
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/json"
+    assert json.loads(response.content) == {
+        "component_2": "value",
+        "component_3": "value",
+        "component_4": "value",
+    }
+
+
+def test_async_get__etag_hook__skips_value(rf):
+    request = rf.get("/", HTTP_IF_NONE_MATCH='"v1"')
+    view = AsyncComponentView(dashboard_class=EtagDashboard)
+    view.setup(request=request, component="component")
+
+    with patch.object(Text, "aget_value") as aget_value:
+        response = async_to_sync(view.get)(request)
+
+    aget_value.assert_not_called()
+    assert response.status_code == 304
+
+
+class FastEventBackend(CacheEventBackend):
+    poll_interval = 0
+    stream_timeout = 0.05
+
+
+@pytest.fixture
+def event_backend(settings, clear_cache):
+    settings.DASHBOARDS_EVENT_BACKEND = (
+        "tests.dashboards.views.test_component.FastEventBackend"
+    )
+    return get_event_backend()
+
+
+def test_events__get(rf, dashboard, event_backend):
+    event_backend.publish(dashboard.get_slug(), "component", "old")
+    request = rf.get("/")
+    view = EventsView(dashboard_class=dashboard)
+    view.setup(request=request)
+    response = view.get(request)
+
+    assert response.headers["Content-Type"] == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    # a new page only gets events published after it opened
+    assert response.content == b"retry: 5000\nid: 1\n\n"
+
+
+def test_events__get__last_event_id(rf, dashboard, event_backend):
+    event_backend.publish(dashboard.get_slug(), "component", "1")
+    event_backend.publish(dashboard.get_slug(), "component", "2")
+    request = rf.get("/", HTTP_LAST_EVENT_ID="1")
+    view = EventsView(dashboard_class=dashboard)
+    view.setup(request=request)
+
+    assert view.get(request).content == (
+        b"retry: 5000\nid: 1\n\nid: 2\nevent: component\ndata: 2\n\n"
+    )
+
+
+def test_async_events__get(rf, dashboard, event_backend):
+    event_backend.publish(dashboard.get_slug(), "component", "1")
+    request = rf.get("/", HTTP_LAST_EVENT_ID="0")
+    view = AsyncEventsView(dashboard_class=dashboard)
+    view.setup(request=request)
+    response = async_to_sync(view.get)(request)
+
+    async def read():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    content = async_to_sync(read)()
+
+    assert content.startswith(b"retry: 0\nid: 0\n\n")
+    assert b"id: 1\nevent: component\ndata: 1" in content
@@ -1,9 +1,14 @@
+import asyncio
+
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 
 import pytest
+from asgiref.sync import async_to_sync
 
-from dashboards.views import DashboardView
+from dashboards.component import Text
+from dashboards.dashboard import Dashboard
+from dashboards.views import AsyncDashboardView, DashboardView
 
 
 pytest_plugins = [
@@ -22,6 +27,38 @@ def test_get(rf, dashboard):
     assert isinstance(response.context_data["dashboard"], dashboard)
 
 
+class StreamDashboard(Dashboard):
+    component_1 = Text(value="value 1")
+
+    class Meta:
+        app_label = "app1"
+        stream = True
+
+
+def test_get__streaming(rf):
+    request = rf.get("/")
+    view = DashboardView(dashboard_class=StreamDashboard)
+    view.setup(request=request)
+    response = view.get(request)
+
+    assert response.status_code == 200
+    assert response.streaming
+    chunks = [chunk.decode() for chunk in response.streaming_content]
+
+    assert "value 1" not in chunks[0]
+    assert "value 1" in chunks[1]
+    assert chunks[-1].startswith("</body>")
+
+
+def test_get__streaming__htmx(rf):
+    request = rf.get("/", HTTP_HX_REQUEST="true")
+    view = DashboardView(dashboard_class=StreamDashboard)
+    view.setup(request=request)
+    response = view.get(request)
+
+    assert not response.streaming
+
+
 def test_get_template_names__default(rf, dashboard):
     view = DashboardView(dashboard_class=dashboard)
     view.setup(rf.get("/"))
@@ -93,3 +130,59 @@ def test_admin_only_dashboard__with_permission(rf, admin_dashboard, staff):
     view.setup(request)
 
     assert view.dispatch(request).status_code == 200
+
+
+def test_async_get(rf):
+    running = []
+    concurrent = []
+
+    async def value(**kwargs):
+        running.append(True)
+        await asyncio.sleep(0)
+        concurrent.append(len(running))
+        return "async value"
+
+    class TestAsyncDashboard(Dashboard):
+        component_1 = Text(value=value)
+        component_2 = Text(value=value)
+        component_3 = Text(value="value")
+
+        class Meta:
+            app_label = "app1"
+
+    request = rf.get("/")
+    view = AsyncDashboardView(dashboard_class=TestAsyncDashboard)
+    view.setup(request=request)
+    response = async_to_sync(view.get)(request)
+    dashboard = response.context_data["dashboard"]
+
+    assert response.status_code == 200
+    assert dashboard.component_values == {
+        "component_1": "async value",
+        "component_2": "async value",
+        "component_3": "value",
+    }
+    # both values were awaited together
+    assert concurrent == [2, 2]
+    assert response.rendered_content.count("async value") == 2
+
+
+@pytest.mark.django_db
+def test_async_dispatch__no_permission(rf, admin_dashboard, user):
+    request = rf.get("/")
+    request.user = user
+    view = AsyncDashboardView(dashboard_class=admin_dashboard)
+    view.setup(request=request)
+
+    with pytest.raises(PermissionDenied):
+        async_to_sync(view.dispatch)(request)
+
+
+@pytest.mark.django_db
+def test_async_dispatch__with_permission(rf, admin_dashboard, staff):
+    request = rf.get("/")
+    request.user = staff
+    view = AsyncDashboardView(dashboard_class=admin_dashboard)
+    view.setup(request=request)
+
+    assert async_to_sync(view.dispatch)(request).status_code == 200